@@ -1,1767 +1,2332 @@
-"""
-YouTube Shorts Generator - Streamlit Frontend
-"""
-
-import os
-import time
-import json
-import random
-import string
-import logging
-import streamlit as st
-import pandas as pd
-import plotly.express as px
-from pathlib import Path
-from datetime import datetime
-from dotenv import load_dotenv
-import math
-from moviepy.editor import VideoFileClip
-from moviepy.editor import vfx
-import platform
-
-# Configure logging
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
-logger = logging.getLogger('ytauto-app')
-
-# Import backend functionality
-from src.content_generator import generate_content, CONTENT_STYLES
-from src.text_to_speech import convert_text_to_speech
-from src.video_generator import create_video, list_available_templates
-from src.captions_generator import create_captions
-from src.video_editor import create_final_video, VISUAL_THEMES
-from src.performance_config import get_performance_config, init_performance_settings
-
-# Load environment variables
-load_dotenv()
-
-# Initialize performance settings
-init_performance_settings()
-perf_config = get_performance_config()
-
-# Constants
-APP_VERSION = "1.1.0"
-ANALYTICS_FILE = "resources/analytics.json"
-LANGUAGES = {
-    "en": "English",
-    "es": "Spanish",
-    "fr": "French",
-    "de": "German",
-    "it": "Italian",
-    "pt": "Portuguese",
-    "ru": "Russian",
-    "ja": "Japanese",
-    "zh-CN": "Chinese (Simplified)",
-    "ar": "Arabic",
-    "hi": "Hindi",
-    "ko": "Korean"
-}
-
-
-# Page configuration
-st.set_page_config(
-    page_title="YouTube Shorts Generator",
-    page_icon="🎬",
-    layout="wide",
-    initial_sidebar_state="expanded"
-)
-
-# Custom CSS with improved design
-st.markdown("""
-<style>
-    .main-header {
-        font-size: 2.8rem;
-        color: #FF0000;
-        text-align: center;
-        margin-bottom: 0.5rem;
-        text-shadow: 2px 2px 4px rgba(0,0,0,0.2);
-    }
-    .sub-header {
-        font-size: 1.8rem;
-        margin-bottom: 1.2rem;
-        color: #333;
-        border-bottom: 2px solid #FF0000;
-        padding-bottom: 0.5rem;
-    }
-    .output-video {
-        width: 100%;
-        max-width: 405px;
-        margin: 0 auto;
-        display: block;
-        border-radius: 10px;
-        box-shadow: 0 4px 8px rgba(0,0,0,0.2);
-    }
-    .stProgress > div > div > div > div {
-        background-color: #FF0000;
-    }
-    .stats-card {
-        background-color: #f8f9fa;
-        border-radius: 10px;
-        padding: 1rem;
-        box-shadow: 0 2px 4px rgba(0,0,0,0.1);
-        text-align: center;
-    }
-    .stats-number {
-        font-size: 2rem;
-        font-weight: bold;
-        color: #FF0000;
-    }
-    .stButton button {
-        background-color: #FF0000;
-        color: white;
-        border-radius: 5px;
-    }
-    .stButton button:hover {
-        background-color: #CC0000;
-    }
-    .footer {
-        text-align: center;
-        margin-top: 2rem;
-        padding-top: 1rem;
-        border-top: 1px solid #ddd;
-        color: #666;
-        font-size: 0.8rem;
-    }
-    /* Responsive improvements */
-    @media (max-width: 768px) {
-        .main-header {
-            font-size: 2rem;
-        }
-        .sub-header {
-            font-size: 1.5rem;
-        }
-    }
-</style>
-""", unsafe_allow_html=True)
-
-
-def initialize_session_state():
-    """Initialize session state variables"""
-    if 'generation_history' not in st.session_state:
-        st.session_state.generation_history = []
-    if 'theme_preview' not in st.session_state:
-        st.session_state.theme_preview = {}
-    if 'analytics_data' not in st.session_state:
-        st.session_state.analytics_data = load_analytics_data()
-    if 'page' not in st.session_state:
-        st.session_state.page = "generate"
-
-
-def load_analytics_data():
-    """Load analytics data from file or initialize new data"""
-    if os.path.exists(ANALYTICS_FILE):
-        try:
-            with open(ANALYTICS_FILE, 'r') as f:
-                return json.load(f)
-        except Exception:
-            pass
-    
-    # Initial analytics structure
-    return {
-        "total_videos": 0,
-        "total_duration": 0,
-        "by_theme": {},
-        "by_style": {},
-        "by_language": {},
-        "history": []
-    }
-
-
-def update_analytics(video_data):
-    """Update analytics with new video generation data"""
-    analytics = st.session_state.analytics_data
-    
-    # Update counters
-    analytics["total_videos"] += 1
-    analytics["total_duration"] += video_data.get("duration", 0)
-    
-    # Update theme stats
-    theme = video_data.get("theme", "default")
-    analytics["by_theme"][theme] = analytics["by_theme"].get(theme, 0) + 1
-    
-    # Update style stats
-    style = video_data.get("style", "educational")
-    analytics["by_style"][style] = analytics["by_style"].get(style, 0) + 1
-    
-    # Update language stats
-    language = video_data.get("language", "en")
-    analytics["by_language"][language] = analytics["by_language"].get(language, 0) + 1
-    
-    # Add to history
-    video_data["timestamp"] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    analytics["history"].append(video_data)
-    
-    # Save updated analytics
-    os.makedirs(os.path.dirname(ANALYTICS_FILE), exist_ok=True)
-    with open(ANALYTICS_FILE, 'w') as f:
-        json.dump(analytics, f, indent=2)
-    
-    # Update session state
-    st.session_state.analytics_data = analytics
-
-
-# App Header
-def render_header():
-    """Render the app header"""
-    col1, col2, col3 = st.columns([1, 3, 1])
-    with col2:
-        st.markdown("<h1 class='main-header'>YouTube Shorts Generator</h1>", unsafe_allow_html=True)
-        st.markdown("<p style='text-align: center; font-size: 1.2rem;'>Create engaging YouTube shorts in minutes from a simple idea</p>", unsafe_allow_html=True)
-
-
-# Sidebar configuration
-def render_sidebar():
-    """Render the sidebar with configuration options"""
-    with st.sidebar:
-        st.image("https://upload.wikimedia.org/wikipedia/commons/thumb/e/e1/YouTube_play_button_icon_%282013-2017%29.svg/1280px-YouTube_play_button_icon_%282013-2017%29.svg.png", width=60)
-        st.header("Configuration")
-        
-        # Navigation
-        st.subheader("Navigation")
-        if st.button("🛠️ Generator", use_container_width=True):
-            st.session_state.page = "generate"
-        if st.button("🎬 My Videos", use_container_width=True):
-            st.session_state.page = "videos"
-        if st.button("📊 Analytics", use_container_width=True):
-            st.session_state.page = "analytics"
-        if st.button("🎨 Template Editor", use_container_width=True):
-            st.session_state.page = "template_editor"
-        if st.button("❓ Help", use_container_width=True):
-            st.session_state.page = "help"
-            
-        st.markdown("---")
-        
-        # API Key Configuration
-        api_key = st.text_input("OpenAI API Key", 
-                               value=os.getenv("OPENAI_API_KEY", ""),
-                               type="password",
-                               help="Enter your OpenAI API key for content generation")
-        
-        if api_key:
-            os.environ["OPENAI_API_KEY"] = api_key
-            st.success("API Key set!")
-        else:
-            st.warning("Please enter your OpenAI API key")
-        
-        st.markdown("---")
-        st.markdown("### About")
-        st.markdown(f"""
-        This app automatically generates YouTube Shorts based on your idea.
-        
-        Version: {APP_VERSION}
-        
-        Features:
-        - AI-powered script generation
-        - Multiple content styles
-        - Visual themes & effects
-        - Background music support
-        - Multiple language support
-        - Analytics & history tracking
-        """)
-        
-        # Footer
-        st.markdown("---")
-        st.markdown("<div class='footer'>© 2025 YouTube Shorts Generator</div>", unsafe_allow_html=True)
-
-
-# Generator page
-def render_generator_page():
-    """Render the main generator page"""
-    # Add global perf_config reference
-    global perf_config
-    
-    st.markdown("<h2 class='sub-header'>Generate New Video</h2>", unsafe_allow_html=True)
-    
-    # Add tabs for single video creation and batch processing
-    tab1, tab2 = st.tabs(["Single Video", "Batch Processing"])
-    
-    with tab1:
-        # Create two columns for main settings and preview
-        col1, col2 = st.columns([3, 2])
-        
-        with col1:
-            # Input for video idea
-            idea = st.text_area("Enter your video idea", 
-                               placeholder="Example: Amazing facts about space exploration",
-                               help="Describe the topic or concept for your YouTube Short")
-            
-            # Content style selection
-            style_options = list(CONTENT_STYLES.keys())
-            content_style = st.selectbox(
-                "Content Style",
-                options=style_options,
-                index=0,
-                format_func=lambda x: x.replace('_', ' ').title(),
-                help="Select the style of content for your video"
-            )
-            
-            # Two columns for basic settings
-            basic_col1, basic_col2 = st.columns(2)
-            
-            with basic_col1:
-                # Video duration
-                duration = st.slider("Video Duration (seconds)", 
-                                   min_value=10, 
-                                   max_value=60, 
-                                   value=30,
-                                   step=5,
-                                   help="YouTube Shorts can be up to 60 seconds")
-                
-                # TTS language
-                tts_language = st.selectbox(
-                    "Voice Language", 
-                    options=list(LANGUAGES.keys()),
-                    index=0,
-                    format_func=lambda x: LANGUAGES[x],
-                    help="Select language for the voice narration"
-                )
-            
-            with basic_col2:
-                # Visual theme
-                visual_theme = st.selectbox(
-                    "Visual Theme",
-                    options=list(VISUAL_THEMES.keys()),
-                    index=0,
-                    format_func=lambda x: x.replace('_', ' ').title(),
-                    help="Select the visual style for your video"
-                )
-                
-                # Background template selection
-                template_options = list_available_templates()
-                template_name = st.selectbox(
-                    "Background Template",
-                    options=template_options,
-                    index=0,
-                    format_func=lambda x: x.replace('_', ' ').title(),
-                    help="Select a video template from the templates directory"
-                )
-            
-            # Add max_words parameter back
-            max_words = st.slider("Max Script Words", 
-                                min_value=50, 
-                                max_value=250, 
-                                value=150,
-                                help="Maximum number of words in the generated script")
-            
-            # Advanced options expander
-            with st.expander("Advanced Options"):
-                adv_col1, adv_col2 = st.columns(2)
-                
-                with adv_col1:
-                    add_intro = st.checkbox("Add Intro Animation", 
-                                         value=True,
-                                         help="Add a short intro animation to your video")
-                    
-                    add_music = st.checkbox("Add Background Music", 
-                                         value=True,
-                                         help="Add background music to your video (requires music files in resources/music)")
-                    
-                    # GPU acceleration option
-                    use_gpu = st.checkbox("Use GPU Acceleration", 
-                                        value=True,
-                                        help="Enable GPU acceleration for faster video processing (requires NVIDIA or AMD GPU)")
-                    
-                    # Display GPU info if available
-                    if perf_config.gpu_info['available']:
-                        st.caption(f"Detected GPU: {perf_config.gpu_info['model'] or perf_config.gpu_info['vendor'].upper()}")
-                    else:
-                        st.caption("No compatible GPU detected")
-                
-                with adv_col2:
-                    # Add option for batch processing
-                    use_batch_processing = st.checkbox("Enable Batch Processing", 
-                                                    value=False,
-                                                    help="Process multiple videos in parallel for faster results")
-                    
-                    if use_batch_processing:
-                        batch_size = st.slider("Max Concurrent Jobs",
-                                             min_value=2,
-                                             max_value=8,
-                                             value=4,
-                                             help="Maximum number of videos to process simultaneously")
-                    
-                    # Show performance info option
-                    show_perf_info = st.checkbox("Show Performance Info", 
-                                              value=False,
-                                              help="Display hardware utilization information during processing")
-                
-                # Store GPU acceleration and batch processing settings in session state
-                if 'use_gpu' not in st.session_state:
-                    st.session_state.use_gpu = use_gpu
-                else:
-                    st.session_state.use_gpu = use_gpu
-                
-                if 'use_batch_processing' not in st.session_state:
-                    st.session_state.use_batch_processing = use_batch_processing
-                else:
-                    st.session_state.use_batch_processing = use_batch_processing
-                
-                if use_batch_processing and 'batch_size' not in st.session_state:
-                    st.session_state.batch_size = batch_size
-                elif use_batch_processing:
-                    st.session_state.batch_size = batch_size
-                
-                if 'show_perf_info' not in st.session_state:
-                    st.session_state.show_perf_info = show_perf_info
-                else:
-                    st.session_state.show_perf_info = show_perf_info
-                
-                # Display current hardware info if showing performance info
-                if show_perf_info:
-                    st.divider()
-                    hardware_col1, hardware_col2 = st.columns(2)
-                    
-                    # Import performance config here to avoid circular imports
-                    try:
-                        from src.performance_config import get_performance_config
-                        perf_config = get_performance_config()
-                        
-                        with hardware_col1:
-                            st.write("**Hardware Configuration:**")
-                            st.write(f"CPU Cores: {perf_config.num_cpu_cores}")
-                            st.write(f"Optimal Threads: {perf_config.optimal_threads}")
-                            
-                        with hardware_col2:
-                            st.write("**GPU Information:**")
-                            if perf_config.gpu_info['available']:
-                                st.write(f"GPU: {perf_config.gpu_info['model'] or perf_config.gpu_info['vendor'].upper()}")
-                                st.write(f"Video Codec: {perf_config.codec}")
-                                st.write(f"CUDA Available: {perf_config.has_cuda}")
-                            else:
-                                st.write("No compatible GPU detected")
-                                st.write("Using CPU for video processing")
-                    except ImportError:
-                        st.write("Unable to load performance information")
-        
-        with col2:
-            # Theme preview
-            st.markdown("<h3 style='text-align:center; margin-bottom:1rem;'>Theme Preview</h3>", unsafe_allow_html=True)
-            
-            # Show sample based on selected theme
-            theme_image_placeholder = st.empty()
-            theme_desc_placeholder = st.empty()
-            
-            # Show theme preview (simulated)
-            theme_descriptions = {
-                "default": "Clean and simple design with white text on semi-transparent black background.",
-                "modern": "Sleek blue accents with smooth fade-in animations.",
-                "minimalist": "Pure text without backgrounds for a clean, distraction-free look.",
-                "dramatic": "Bold Impact font with golden text on dark background and subtle zoom effect.",
-                "retro": "Vintage style with sepia tones and old-school typewriter font."
-            }
-            
-            theme_image_placeholder.image(f"https://via.placeholder.com/400x600?text={visual_theme.title()}+Theme", 
-                             use_column_width=True,
-                             caption="Sample visual style")
-            
-            theme_desc_placeholder.info(theme_descriptions.get(visual_theme, "Select a theme to see its description"))
-        
-    # Generate button
-    generate_button = st.button("💫 Generate YouTube Short", type="primary", use_container_width=True)
-    
-    if generate_button and idea:
-        if not os.getenv("OPENAI_API_KEY"):
-            st.error("⚠️ Please enter your OpenAI API key in the sidebar.")
-        else:
-            # Create progress bar
-            progress_bar = st.progress(0)
-            status_text = st.empty()
-            
-            try:
-                # Create directories if they don't exist
-                os.makedirs("output", exist_ok=True)
-                os.makedirs("resources", exist_ok=True)
-                os.makedirs("resources/temp", exist_ok=True)
-                os.makedirs("resources/music", exist_ok=True)
-                
-                # Generate unique timestamp for this run
-                timestamp = time.strftime("%Y%m%d_%H%M%S")
-                output_base = f"output/short_{timestamp}"
-                
-                # Step 1: Generate content
-                status_text.text("Generating script and title...")
-                progress_text = st.empty()
-                progress_text.text("Generating content...")
-                script, title, hook = generate_content(
-                    idea, 
-                    max_words=max_words,
-                    style=content_style
-                )
-                progress_bar.progress(20)
-                
-                # Show generated content
-                st.subheader("Generated Content")
-                st.markdown(f"**Title:** {title}")
-                if hook:
-                    st.markdown(f"**Hook:** {hook}")
-                st.markdown(f"**Script:**\n{script}")
-                
-                # Step 2: Convert text to speech
-                status_text.text("Converting text to speech...")
-                audio_file = convert_text_to_speech(script, f"{output_base}_audio.mp3", language=tts_language)
-                progress_bar.progress(40)
-                
-                # Display audio
-                st.audio(audio_file)
-                
-                # Step 3: Generate background video
-                status_text.text("Creating background video...")
-                
-                if enable_custom_bg and 'bg_file' in locals() and bg_file:
-                    # Save uploaded background video
-                    temp_bg_path = f"resources/temp/uploaded_bg_{timestamp}.mp4"
-                    with open(temp_bg_path, "wb") as f:
-                        f.write(bg_file.getbuffer())
-                    
-                    # Process the uploaded background
-                    background_video = temp_bg_path
-                    output_bg = f"{output_base}_background.mp4"
-                    from src.video_generator import process_background_video
-                    process_background_video(background_video, output_bg, duration)
-                    background_video = output_bg
-                else:
-                    # Generate background video
-                    background_video = create_video(
-                        f"{output_base}_background.mp4",
-                        duration=int(duration),
-                        template_name=template_name
-                    )
-                
-                progress_bar.progress(60)
-                
-                # Step 4: Generate captions
-                status_text.text("Creating captions...")
-                captions_file = create_captions(script, audio_file)
-                progress_bar.progress(80)
-                
-                # Step 5: Create final video
-                status_text.text("Finalizing video...")
-                
-                # Set environment variables for GPU based on user selection
-                if 'use_gpu' in st.session_state:
-                    if st.session_state.use_gpu:
-                        os.environ['CUDA_VISIBLE_DEVICES'] = '0'
-                        os.environ['CPU_ONLY'] = '0'
-                    else:
-                        os.environ['CUDA_VISIBLE_DEVICES'] = '-1'
-                        os.environ['CPU_ONLY'] = '1'
-                
-                # Show performance monitoring if requested
-                if 'show_perf_info' in st.session_state and st.session_state.show_perf_info:
-                    try:
-                        perf_col1, perf_col2 = st.columns(2)
-                        with perf_col1:
-                            st.markdown("**Processing with:**")
-                            from src.performance_config import get_performance_config
-                            perf_config = get_performance_config()
-                            if perf_config.gpu_info['available'] and st.session_state.use_gpu:
-                                st.markdown(f"🚀 **GPU**: {perf_config.gpu_info['model'] or perf_config.gpu_info['vendor'].upper()}")
-                                st.markdown(f"🎬 **Codec**: {perf_config.codec}")
-                                st.markdown(f"⚙️ **Threads**: {perf_config.optimal_threads}")
-                            else:
-                                st.markdown("💻 **CPU processing**")
-                                st.markdown(f"⚙️ **Threads**: {perf_config.optimal_threads}")
-                        
-                        # Add placeholder for timing information
-                        with perf_col2:
-                            st.markdown("**Performance Metrics:**")
-                            time_placeholder = st.empty()
-                            fps_placeholder = st.empty()
-                            
-                            # Start timing
-                            perf_start_time = time.time()
-                    except Exception as e:
-                        st.warning(f"Could not initialize performance monitoring: {str(e)}")
-                
-                # Use batch processing if selected
-                if 'use_batch_processing' in st.session_state and st.session_state.use_batch_processing:
-                    try:
-                        # Import batch processor
-                        from src.batch_processor import BatchProcessor, create_job
-                        
-                        # Create batch processor with user-defined batch size
-                        batch_size = st.session_state.batch_size if 'batch_size' in st.session_state else 4
-                        processor = BatchProcessor(max_workers=batch_size)
-                        
-                        # Create a single job
-                        job = create_job(
-                            background_video,
-                            audio_file,
-                            captions_file,
-                            f"{output_base}_final.mp4",
-                            job_id=timestamp,
-                            theme=visual_theme,
-                            add_music=add_music,
-                            add_intro=add_intro,
-                            add_outro=add_outro
-                        )
-                        
-                        # Process the job (single job in batch mode for consistent API)
-                        results = processor.process_batch([job], show_progress=False)
-                        
-                        # Get the result
-                        if results and results[0]['status'] == 'success':
-                            final_video = results[0]['result_file']
-                            processing_time = results[0]['elapsed_time']
-                            status_text.text(f"✅ Video generated in {processing_time:.2f} seconds using batch processing!")
-                        else:
-                            st.error(f"Error in batch processing: {results[0]['error'] if results else 'Unknown error'}")
-                            raise Exception("Batch processing failed")
-                    
-                    except ImportError:
-                        st.warning("Batch processing module not available. Falling back to standard processing.")
-                        final_video = create_final_video(
-                            background_video,
-                            audio_file,
-                            captions_file,
-                            f"{output_base}_final.mp4",
-                            theme=visual_theme,
-                            add_music=add_music,
-                            add_intro=add_intro,
-                            add_outro=add_outro
-                        )
-                    except Exception as e:
-                        st.error(f"Batch processing error: {str(e)}")
-                        # Fallback to standard processing
-                        final_video = create_final_video(
-                            background_video,
-                            audio_file,
-                            captions_file,
-                            f"{output_base}_final.mp4",
-                            theme=visual_theme,
-                            add_music=add_music,
-                            add_intro=add_intro,
-                            add_outro=add_outro
-                        )
-                else:
-                    # Standard processing
-                    final_video = create_final_video(
-                        background_video,
-                        audio_file,
-                        captions_file,
-                        f"{output_base}_final.mp4",
-                        theme=visual_theme,
-                        add_music=add_music,
-                        add_intro=add_intro,
-                        add_outro=add_outro
-                    )
-                
-                progress_bar.progress(100)
-                
-                # Display success message and final video
-                status_text.text("✅ YouTube Short successfully generated!")
-                
-                # Update performance metrics if enabled
-                if 'show_perf_info' in st.session_state and st.session_state.show_perf_info and 'perf_start_time' in locals():
-                    try:
-                        # Calculate performance metrics
-                        perf_end_time = time.time()
-                        processing_time = perf_end_time - perf_start_time
-                        
-                        # Get video duration
-                        video_clip = VideoFileClip(final_video)
-                        video_duration = video_clip.duration
-                        video_clip.close()
-                        
-                        # Calculate FPS and speedup factor
-                        fps = video_duration / processing_time
-                        
-                        # Update the placeholders
-                        time_placeholder.markdown(f"⏱️ **Processing time**: {processing_time:.2f} seconds")
-                        fps_placeholder.markdown(f"⚡ **Processing speed**: {fps:.2f}x real-time")
-                        
-                        # Add additional metrics
-                        st.markdown(f"Video duration: {video_duration:.2f} seconds")
-                        st.markdown(f"Processing ratio: {processing_time/video_duration:.2f}x")
-                    except Exception as e:
-                        st.warning(f"Error calculating performance metrics: {str(e)}")
-                
-                # Show final video
-                st.video(final_video)
-                
-                # Success message with download button
-                st.success(f"Your YouTube Short '{title}' has been generated successfully!")
-                
-                with open(final_video, "rb") as file:
-                    st.download_button(
-                        label="⬇️ Download Video",
-                        data=file,
-                        file_name=f"youtube_short_{timestamp}.mp4",
-                        mime="video/mp4"
-                    )
-                
-                # Add to history
-                video_data = {
-                    "id": timestamp,
-                    "title": title,
-                    "idea": idea,
-                    "style": content_style,
-                    "theme": visual_theme,
-                    "language": tts_language,
-                    "duration": duration,
-                    "file_path": final_video
-                }
-                
-                st.session_state.generation_history.append(video_data)
-                
-                # Update analytics
-                update_analytics(video_data)
-                
-            except Exception as e:
-                st.error(f"Error generating video: {str(e)}")
-                status_text.text("❌ Error occurred during generation")
-    
-    elif generate_button and not idea:
-        st.warning("Please enter a video idea first.")
-
-    with tab2:
-        st.markdown("### Generate Videos in Batch from CSV")
-        
-        # Add help expander with instructions
-        with st.expander("How to use batch processing"):
-            st.markdown("""
-            ## CSV Batch Processing Instructions
-            
-            1. **Download the template CSV** using the button below
-            2. **Fill the CSV** with your video ideas following the format:
-               - **topic**: Main idea for the video
-               - **content_style**: Style of content (educational, listicle, etc.)
-               - **duration**: Length in seconds (10-60)
-               - **language**: Voice language code (en, es, fr, etc.)
-               - **visual_theme**: Visual style (modern, minimal, vibrant, etc.)
-               - **template_name**: Name of the template to use (without extension)
-            3. **Upload your completed CSV** using the uploader below
-            4. **Click "Generate Videos in Batch"** to process all videos
-            
-            The generated videos will be saved in the output directory and shown below after processing.
-            """)
-        
-        # CSV upload
-        st.markdown("#### Upload a CSV file with video ideas")
-        csv_file = st.file_uploader("Upload CSV", type=["csv"], help="Upload a CSV file with video ideas")
-        
-        # Show template download link
-        template_path = "templates/video_ideas_template.csv"
-        if os.path.exists(template_path):
-            with open(template_path, "rb") as file:
-                st.download_button(
-                    label="Download CSV Template",
-                    data=file,
-                    file_name="video_ideas_template.csv",
-                    mime="text/csv",
-                    help="Download a template CSV file to fill with your video ideas"
-                )
-        else:
-            st.warning("CSV template file not found. Please run setup first.")
-        
-        # Process CSV if uploaded
-        if csv_file is not None:
-            try:
-                # Read CSV
-                df = pd.read_csv(csv_file)
-                
-                # Display CSV contents
-                st.markdown("#### CSV Preview")
-                st.dataframe(df)
-                
-                # Validate CSV format
-                required_columns = ["topic", "content_style", "duration", "language", "visual_theme", "template_name"]
-                missing_columns = [col for col in required_columns if col not in df.columns]
-                
-                if missing_columns:
-                    st.error(f"Missing required columns: {', '.join(missing_columns)}")
-                else:
-                    # Process videos
-                    st.markdown("#### Generate Videos")
-                    
-                    # Settings for batch processing
-                    st.markdown("Batch Processing Settings:")
-                    output_dir = st.text_input("Output Directory", 
-                                             value="output/batch",
-                                             help="Directory where generated videos will be saved")
-                    
-                    # Create output directory if it doesn't exist
-                    os.makedirs(output_dir, exist_ok=True)
-                    
-                    # Add button to start batch processing
-                    if st.button("Generate Videos in Batch"):
-                        # Record start time
-                        start_time = time.time()
-                        
-                        # Set environment variables for GPU based on user selection
-                        if 'use_gpu' in st.session_state:
-                            if st.session_state.use_gpu:
-                                os.environ['CUDA_VISIBLE_DEVICES'] = '0'
-                                os.environ['CPU_ONLY'] = '0'
-                            else:
-                                os.environ['CUDA_VISIBLE_DEVICES'] = '-1'
-                                os.environ['CPU_ONLY'] = '1'
-                        
-                        # Use true parallel batch processing if selected
-                        if 'use_batch_processing' in st.session_state and st.session_state.use_batch_processing:
-                            try:
-                                # Import batch processor
-                                from src.batch_processor import BatchProcessor, create_job
-                                
-                                # Create batch processor with user-defined batch size
-                                batch_size = st.session_state.batch_size if 'batch_size' in st.session_state else 4
-                                processor = BatchProcessor(max_workers=batch_size)
-                                
-                                st.info(f"Using parallel batch processing with {batch_size} concurrent jobs")
-                                
-                                # Create jobs for all rows in the CSV
-                                jobs = []
-                                for i, row in df.iterrows():
-                                    # Create a unique name for the output file
-                                    timestamp = datetime.now().strftime("%Y%m%d%H%M%S")
-                                    video_id = f"{i+1}_{timestamp}"
-                                    output_base = f"{output_dir}/video_{video_id}"
-                                    
-                                    # Generate content (needs to be done sequentially for each video)
-                                    with st.spinner(f"Preparing content for video {i+1}/{len(df)}: {row['topic']}"):
-                                        # Generate script and title
-                                        script, title, hook = generate_content(
-                                            row['topic'], 
-                                            max_words=150,  # Use a fixed value for batch processing
-                                            style=row['content_style']
-                                        )
-                                        
-                                        # Generate audio
-                                        audio_path = f"{output_base}_audio.mp3"
-                                        convert_text_to_speech(script, audio_path, language=row['language'])
-                                        
-                                        # Generate background video
-                                        background_path = f"{output_base}_background.mp4"
-                                        create_video(
-                                            background_path,
-                                            duration=int(row['duration']),
-                                            template_name=row['template_name']
-                                        )
-                                        
-                                        # Generate captions
-                                        captions_path = f"{output_base}_captions.json"
-                                        create_captions(script, audio_path, captions_path)
-                                        
-                                        # Create job for final video
-                                        job = create_job(
-                                            background_path,
-                                            audio_path,
-                                            captions_path,
-                                            f"{output_base}_final.mp4",
-                                            job_id=f"video_{i+1}",
-                                            theme=row['visual_theme'],
-                                            add_music=True,
-                                            add_intro=True,
-                                            add_outro=True
-                                        )
-                                        jobs.append(job)
-                                
-                                # Process all jobs in parallel
-                                progress_text = st.empty()
-                                progress_text.text(f"Processing {len(jobs)} videos in parallel...")
-                                
-                                # Create a progress bar
-                                batch_progress = st.progress(0)
-                                
-                                # Process the jobs
-                                results = processor.process_batch(jobs, show_progress=False)
-                                
-                                # Update the progress bar to complete
-                                batch_progress.progress(100)
-                                
-                                # Process results
-                                successful_jobs = sum(1 for r in results if r['status'] == 'success')
-                                failed_jobs = sum(1 for r in results if r['status'] == 'error')
-                                
-                                # Update analytics for successful jobs
-                                for i, result in enumerate(results):
-                                    if result['status'] == 'success':
-                                        row = df.iloc[i]
-                                        video_data = {
-                                            "id": result['job_id'],
-                                            "topic": row['topic'],
-                                            "style": row['content_style'],
-                                            "language": row['language'],
-                                            "duration": int(row['duration']),
-                                            "theme": row['visual_theme'],
-                                            "timestamp": datetime.now().isoformat(),
-                                            "path": result['result_file'],
-                                            "processing_time": result['elapsed_time']
-                                        }
-                                        update_analytics(video_data)
-                                
-                                # Display completion message
-                                end_time = time.time()
-                                elapsed_time = end_time - start_time
-                                st.success(f"Batch processing completed in {elapsed_time:.2f} seconds! {successful_jobs} videos succeeded, {failed_jobs} failed.")
-                                
-                                # Display video links for successful jobs
-                                st.markdown("### Generated Videos")
-                                st.markdown("The following videos have been generated:")
-                                
-                                for result in results:
-                                    if result['status'] == 'success':
-                                        st.video(result['result_file'])
-                                
-                            except ImportError as e:
-                                st.warning(f"Parallel batch processing not available: {str(e)}. Falling back to sequential processing.")
-                                # Fall back to traditional sequential processing
-                                process_csv_sequentially(df, output_dir)
-                            except Exception as e:
-                                st.error(f"Error in parallel batch processing: {str(e)}")
-                                # Fall back to traditional sequential processing
-                                process_csv_sequentially(df, output_dir)
-                        else:
-                            # Traditional sequential processing
-                            process_csv_sequentially(df, output_dir)
-            
-            except Exception as e:
-                st.error(f"Error processing CSV: {str(e)}")
-
-
-# Videos page (My Videos)
-def render_videos_page():
-    """Render the videos management page"""
-    # Add global perf_config reference
-    global perf_config
-    
-    st.markdown("<h2 class='sub-header'>Videos Management</h2>", unsafe_allow_html=True)
-    
-    # Check for video files
-    output_dir = Path("output")
-    if output_dir.exists():
-        video_files = list(output_dir.glob("*_final.mp4"))
-        
-        if video_files:
-            # Show statistics
-            total_videos = len(video_files)
-            total_size_mb = sum(f.stat().st_size for f in video_files) / (1024 * 1024)
-            
-            stat1, stat2, stat3 = st.columns(3)
-            with stat1:
-                st.markdown(f"""
-                <div class='stats-card'>
-                    <div class='stats-number'>{total_videos}</div>
-                    <div>Videos Generated</div>
-                </div>
-                """, unsafe_allow_html=True)
-            
-            with stat2:
-                st.markdown(f"""
-                <div class='stats-card'>
-                    <div class='stats-number'>{total_size_mb:.1f} MB</div>
-                    <div>Total Size</div>
-                </div>
-                """, unsafe_allow_html=True)
-            
-            with stat3:
-                latest_date = max(f.stat().st_mtime for f in video_files)
-                latest_date_str = datetime.fromtimestamp(latest_date).strftime("%Y-%m-%d")
-                st.markdown(f"""
-                <div class='stats-card'>
-                    <div class='stats-number'>{latest_date_str}</div>
-                    <div>Latest Video</div>
-                </div>
-                """, unsafe_allow_html=True)
-            
-            st.markdown("---")
-            
-            # Search and filter
-            search = st.text_input("Search videos by timestamp or ID", 
-                                 placeholder="e.g., 20250301")
-            
-            # Filter videos
-            filtered_videos = [v for v in video_files if search.lower() in v.stem.lower()] if search else video_files
-            
-            if filtered_videos:
-                st.write(f"Showing {len(filtered_videos)} videos")
-                
-                # Create columns to display videos
-                num_cols = 3
-                videos_per_row = (len(filtered_videos) + num_cols - 1) // num_cols
-                
-                for row in range(videos_per_row):
-                    cols = st.columns(num_cols)
-                    for col_idx in range(num_cols):
-                        video_idx = row * num_cols + col_idx
-                        if video_idx < len(filtered_videos):
-                            with cols[col_idx]:
-                                video_file = filtered_videos[video_idx]
-                                
-                                # Get timestamp from filename
-                                timestamp = video_file.stem.split("_")[1]
-                                formatted_time = time.strftime(
-                                    "%Y-%m-%d %H:%M:%S", 
-                                    time.strptime(timestamp, "%Y%m%d_%H%M%S") if "_" in timestamp else time.localtime()
-                                )
-                                
-                                # Display video with timestamp
-                                st.video(str(video_file))
-                                st.caption(f"Generated on {formatted_time}")
-                                
-                                # Download button
-                                with open(str(video_file), "rb") as file:
-                                    st.download_button(
-                                        label="Download",
-                                        data=file,
-                                        file_name=f"youtube_short_{timestamp}.mp4",
-                                        mime="video/mp4",
-                                        key=f"download_{video_idx}"
-                                    )
-                                
-                                # Delete button
-                                if st.button("Delete", key=f"delete_{video_idx}"):
-                                    try:
-                                        video_file.unlink()
-                                        st.success("Video deleted successfully!")
-                                        st.experimental_rerun()
-                                    except Exception as e:
-                                        st.error(f"Error deleting video: {str(e)}")
-            else:
-                st.info("No videos match your search criteria")
-        else:
-            st.info("No generated videos found. Generate a video first!")
-    else:
-        st.info("Output directory doesn't exist yet. Generate a video first!")
-
-
-# Analytics page
-def render_analytics_page():
-    """Render the analytics page"""
-    # Add global perf_config reference
-    global perf_config
-    
-    st.markdown("<h2 class='sub-header'>Analytics Dashboard</h2>", unsafe_allow_html=True)
-    
-    analytics = st.session_state.analytics_data
-    
-    if analytics["total_videos"] > 0:
-        # Overview statistics
-        stat1, stat2, stat3, stat4 = st.columns(4)
-        
-        with stat1:
-            st.markdown(f"""
-            <div class='stats-card'>
-                <div class='stats-number'>{analytics["total_videos"]}</div>
-                <div>Total Videos</div>
-            </div>
-            """, unsafe_allow_html=True)
-        
-        with stat2:
-            avg_duration = analytics["total_duration"] / analytics["total_videos"] if analytics["total_videos"] > 0 else 0
-            st.markdown(f"""
-            <div class='stats-card'>
-                <div class='stats-number'>{avg_duration:.1f}s</div>
-                <div>Avg Duration</div>
-            </div>
-            """, unsafe_allow_html=True)
-        
-        with stat3:
-            # Most used theme
-            if analytics["by_theme"]:
-                most_used_theme = max(analytics["by_theme"].items(), key=lambda x: x[1])[0]
-                st.markdown(f"""
-                <div class='stats-card'>
-                    <div class='stats-number'>{most_used_theme.title()}</div>
-                    <div>Top Theme</div>
-                </div>
-                """, unsafe_allow_html=True)
-            else:
-                st.markdown("""
-                <div class='stats-card'>
-                    <div class='stats-number'>-</div>
-                    <div>Top Theme</div>
-                </div>
-                """, unsafe_allow_html=True)
-        
-        with stat4:
-            # Most used style
-            if analytics["by_style"]:
-                most_used_style = max(analytics["by_style"].items(), key=lambda x: x[1])[0]
-                st.markdown(f"""
-                <div class='stats-card'>
-                    <div class='stats-number'>{most_used_style.title()}</div>
-                    <div>Top Style</div>
-                </div>
-                """, unsafe_allow_html=True)
-            else:
-                st.markdown("""
-                <div class='stats-card'>
-                    <div class='stats-number'>-</div>
-                    <div>Top Style</div>
-                </div>
-                """, unsafe_allow_html=True)
-        
-        st.markdown("---")
-        
-        # Charts
-        chart_col1, chart_col2 = st.columns(2)
-        
-        with chart_col1:
-            # Theme chart
-            if analytics["by_theme"]:
-                st.subheader("Videos by Theme")
-                theme_df = pd.DataFrame({
-                    'Theme': [k.title() for k in analytics["by_theme"].keys()],
-                    'Count': list(analytics["by_theme"].values())
-                })
-                theme_chart = px.pie(theme_df, values='Count', names='Theme', hole=0.4)
-                theme_chart.update_layout(height=400)
-                st.plotly_chart(theme_chart, use_container_width=True)
-        
-        with chart_col2:
-            # Style chart
-            if analytics["by_style"]:
-                st.subheader("Videos by Content Style")
-                style_df = pd.DataFrame({
-                    'Style': [k.title() for k in analytics["by_style"].keys()],
-                    'Count': list(analytics["by_style"].values())
-                })
-                style_chart = px.bar(style_df, x='Style', y='Count', color='Style')
-                style_chart.update_layout(height=400)
-                st.plotly_chart(style_chart, use_container_width=True)
-        
-        # History table
-        st.subheader("Generation History")
-        if analytics["history"]:
-            history_df = pd.DataFrame(analytics["history"])
-            if not history_df.empty:
-                # Clean up columns for display
-                display_cols = ["timestamp", "title", "idea", "style", "theme", "language", "duration"]
-                display_cols = [col for col in display_cols if col in history_df.columns]
-                
-                st.dataframe(
-                    history_df[display_cols],
-                    use_container_width=True,
-                    column_config={
-                        "timestamp": "Generated On",
-                        "title": "Title",
-                        "idea": "Idea",
-                        "style": "Content Style",
-                        "theme": "Visual Theme",
-                        "language": "Language",
-                        "duration": "Duration (s)"
-                    }
-                )
-    else:
-        st.info("No analytics data available yet. Generate some videos to see statistics!")
-
-
-# Help page
-def render_help_page():
-    """Render the help page"""
-    # Add global perf_config reference
-    global perf_config
-    
-    st.markdown("<h2 class='sub-header'>Help & Documentation</h2>", unsafe_allow_html=True)
-    
-    # Create tabs for different help sections
-    help_tab1, help_tab2, help_tab3, help_tab4 = st.tabs([
-        "Getting Started", "Content Styles", "Visual Themes", "FAQ"
-    ])
-    
-    with help_tab1:
-        st.markdown("""
-        ### Getting Started
-        
-        #### Step 1: Configure API
-        1. Enter your OpenAI API key in the sidebar
-        2. You need this for generating video content
-        
-        #### Step 2: Create Your First Short
-        1. Navigate to the Generator page
-        2. Enter your video idea in the text field
-        3. Select your preferred content style and visual theme
-        4. Click "Generate YouTube Short"
-        5. Wait for processing - this may take a few minutes
-        6. Preview your video and download it when ready
-        
-        #### Step 3: Customize Your Videos
-        - Try different content styles, visual themes, and languages
-        - Check the "Advanced Options" section for more customization
-        - Upload custom background videos for unique shorts
-        
-        #### Step 4: Track and Analyze
-        - View all your generated videos in the "My Videos" page
-        - Check analytics and statistics in the "Analytics" page
-        - Refine your approach based on what works best
-        """)
-    
-    with help_tab2:
-        st.markdown("""
-        ### Content Styles
-        
-        Each style creates a different type of script:
-        
-        **Educational**
-        - Informative and factual
-        - Focuses on explaining concepts clearly
-        - Includes interesting facts and details
-        
-        **Entertaining**
-        - Fun, engaging, and sometimes humorous
-        - Designed to capture attention and entertain
-        - More casual tone
-        
-        **Storytelling**
-        - Narrative format with beginning, middle, and end
-        - Emotionally engaging content
-        - Character or scenario focused
-        
-        **Tutorial**
-        - Step-by-step instructions
-        - Process or skill focused
-        - Clear, actionable information
-        
-        **Fact List**
-        - Collection of interesting facts
-        - Bite-sized information
-        - Focuses on surprising or lesser-known details
-        
-        **Motivational**
-        - Inspirational tone
-        - Encourages and uplifts the viewer
-        - Often includes quotes or actionable advice
-        """)
-    
-    with help_tab3:
-        st.markdown("""
-        ### Visual Themes
-        
-        The visual theme affects how your video looks:
-        
-        **Default**
-        - Clean, simple design
-        - White text on semi-transparent black background
-        - Balanced and professional
-        
-        **Modern**
-        - Sleek with blue accents
-        - Smooth fade-in animations
-        - Contemporary and clean
-        
-        **Minimalist**
-        - Pure text without backgrounds
-        - Distraction-free design
-        - Focus on content only
-        
-        **Dramatic**
-        - Bold Impact font
-        - Golden text on dark backgrounds
-        - Subtle zoom effects
-        
-        **Retro**
-        - Vintage style with sepia tones
-        - Typewriter-style font
-        - Old-school aesthetic
-        """)
-    
-    with help_tab4:
-        st.markdown("""
-        ### Frequently Asked Questions
-        
-        **Q: How long does it take to generate a video?**
-        
-        A: Generation typically takes 1-5 minutes depending on video length, complexity, and your computer's performance.
-        
-        **Q: What format are the videos saved in?**
-        
-        A: Videos are saved as MP4 files with H.264 encoding, compatible with all major platforms including YouTube.
-        
-        **Q: Do I need FFmpeg installed?**
-        
-        A: Yes, FFmpeg is required for video processing. Make sure it's installed and available in your system path.
-        
-        **Q: Can I use these videos commercially?**
-        
-        A: The videos you generate are yours to use. However, be mindful of copyright if you use custom background videos or music not included with the app.
-        
-        **Q: Where can I get background music?**
-        
-        A: Place MP3 or WAV files in the resources/music directory to use as background music. Make sure you have rights to use any music you add.
-        
-        **Q: How can I improve video quality?**
-        
-        A: For best quality:
-        - Use high-resolution background videos (1080x1920)
-        - Write clear, concise ideas
-        - Select the appropriate content style for your topic
-        - Use custom backgrounds for specific themes
-        """)
-
-
-def render_template_editor_page():
-    """Render the video template editor page"""
-    # Add global perf_config reference
-    global perf_config
-    
-    # Helper functions for the template editor
-    def get_video_info(video_path):
-        """Get basic information about a video file"""
-        clip = VideoFileClip(video_path)
-        info = {
-            "duration": clip.duration,
-            "width": clip.size[0],
-            "height": clip.size[1],
-            "fps": clip.fps
-        }
-        clip.close()
-        return info
-    
-    def process_video_template(input_path, output_path, start_time, end_time, crop_params, additional_params=None):
-        """Process video template based on parameters"""
-        try:
-            # Load the video
-            clip = VideoFileClip(input_path)
-            
-            # Cut the clip to the selected time segment
-            clip = clip.subclip(start_time, end_time)
-            
-            # Apply cropping
-            if "method" in crop_params:
-                # Predefined crop methods
-                method = crop_params["method"]
-                w, h = clip.size
-                
-                if method == "center":
-                    # Center crop to 9:16 aspect ratio
-                    target_ratio = 9/16
-                    current_ratio = w/h
-                    
-                    if current_ratio > target_ratio:
-                        # Too wide, crop width
-                        new_w = int(h * target_ratio)
-                        x1 = (w - new_w) // 2
-                        clip = clip.crop(x1=x1, width=new_w)
-                    else:
-                        # Too tall, crop height
-                        new_h = int(w / target_ratio)
-                        y1 = (h - new_h) // 2
-                        clip = clip.crop(y1=y1, height=new_h)
-                        
-                elif method == "top":
-                    new_h = int(w * 16/9)
-                    clip = clip.crop(y1=0, height=min(new_h, h))
-                    
-                elif method == "bottom":
-                    new_h = int(w * 16/9)
-                    y1 = max(0, h - new_h)
-                    clip = clip.crop(y1=y1, height=min(new_h, h))
-                    
-                elif method == "left":
-                    new_w = int(h * 9/16)
-                    clip = clip.crop(x1=0, width=min(new_w, w))
-                    
-                elif method == "right":
-                    new_w = int(h * 9/16)
-                    x1 = max(0, w - new_w)
-                    clip = clip.crop(x1=x1, width=min(new_w, w))
-            else:
-                # Custom cropping
-                w, h = clip.size
-                top = int(h * crop_params["top"])
-                bottom = int(h * crop_params["bottom"])
-                left = int(w * crop_params["left"])
-                right = int(w * crop_params["right"])
-                
-                # Calculate new dimensions
-                new_h = h - top - bottom
-                new_w = w - left - right
-                
-                # Apply crop if dimensions are valid
-                if new_w > 0 and new_h > 0:
-                    clip = clip.crop(x1=left, y1=top, width=new_w, height=new_h)
-            
-            # Apply additional processing
-            if additional_params:
-                # Resize to shorts format (9:16)
-                if additional_params.get("resize_resolution", False):
-                    clip = clip.resize(width=1080, height=1920)
-                
-                # Apply basic filters
-                if additional_params.get("apply_filters", False):
-                    # Apply GPU-accelerated effects if available
-                    if st.session_state.get('template_editor_use_gpu', True) and perf_config.gpu_info['available']:
-                        from src.video_editor import apply_gpu_effect
-                        clip = apply_gpu_effect(clip, "colorx")
-                    else:
-                        # Standard effects without GPU
-                        clip = clip.fx(vfx.lum_contrast, lum=1.2, contrast=1.1)
-                
-                # Loop to target duration
-                if additional_params.get("loop_video", False):
-                    target_duration = additional_params.get("target_duration", 15)
-                    
-                    if clip.duration < target_duration:
-                        # Calculate number of loops needed
-                        loops_needed = math.ceil(target_duration / clip.duration)
-                        # Create a list of clip copies
-                        clips = [clip] * loops_needed
-                        # Concatenate clips
-                        from moviepy.editor import concatenate_videoclips
-                        clip = concatenate_videoclips(clips)
-                        # Trim to exact target duration
-                        clip = clip.subclip(0, target_duration)
-            
-            # Ensure output directory exists
-            os.makedirs(os.path.dirname(output_path), exist_ok=True)
-            
-            # Get codec and ffmpeg params based on GPU availability
-            use_gpu = st.session_state.get('template_editor_use_gpu', True)
-            if use_gpu and perf_config.gpu_info['available']:
-                logger.info(f"Using GPU acceleration with {perf_config.gpu_info['vendor']} GPU")
-                encoding_params = perf_config.get_moviepy_params()
-            else:
-                logger.info("Using CPU processing")
-                encoding_params = {
-                    'codec': 'libx264',
-                    'audio_codec': 'aac',
-                    'temp_audiofile': 'temp-audio.m4a',
-                    'remove_temp': True,
-                    'fps': 30
-                }
-            
-            try:
-                # Write the processed video
-                clip.write_videofile(
-                    output_path,
-                    **encoding_params
-                )
-            except Exception as encoding_error:
-                logger.warning(f"Error with selected encoder: {str(encoding_error)}. Falling back to CPU encoding.")
-                # Fallback to CPU encoding if GPU encoding fails
-                fallback_params = {
-                    'codec': 'libx264',
-                    'audio_codec': 'aac',
-                    'temp_audiofile': 'temp-audio.m4a',
-                    'remove_temp': True,
-                    'fps': 30,
-                    'preset': 'medium'
-                }
-                clip.write_videofile(
-                    output_path,
-                    **fallback_params
-                )
-            
-            clip.close()
-            return True
-            
-        except Exception as e:
-            print(f"Error processing video: {str(e)}")
-            raise e
-    
-    st.title("🎬 Video Template Editor")
-    st.subheader("Create custom video templates for your shorts")
-    
-    col1, col2 = st.columns([2, 1])
-    
-    with col1:
-        # Video file uploader
-        uploaded_video = st.file_uploader(
-            "Upload Video", 
-            type=["mp4", "mov", "avi"], 
-            help="Upload a video file to create a template"
-        )
-        
-        # Video preview and controls
-        if uploaded_video is not None:
-            # Save uploaded video to temp file
-            temp_video_path = os.path.join("temp", "temp_upload.mp4")
-            os.makedirs("temp", exist_ok=True)
-            
-            with open(temp_video_path, "wb") as f:
-                f.write(uploaded_video.getbuffer())
-            
-            # Display video
-            st.video(temp_video_path)
-            
-            # Video information
-            video_info = get_video_info(temp_video_path)
-            st.info(f"Duration: {video_info['duration']:.2f}s | Resolution: {video_info['width']}x{video_info['height']}")
-        else:
-            st.info("Upload a video to start editing")
-    
-    with col2:
-        st.subheader("Editing Controls")
-        
-        template_name = st.text_input(
-            "Template Name",
-            value="custom_template",
-            help="Enter a name for your template (no spaces or special characters)"
-        )
-        
-        # Replace any spaces or special characters
-        template_name = "".join(c if c.isalnum() or c == '_' else '_' for c in template_name)
-        
-        # Crop settings
-        st.markdown("### Video Crop")
-        crop_option = st.radio(
-            "Crop Method",
-            options=["Center", "Top", "Bottom", "Left", "Right", "Custom"],
-            index=0
-        )
-        
-        if crop_option == "Custom":
-            st.markdown("#### Custom Crop Settings")
-            # For simplicity, we'll use sliders to adjust crop percentage
-            top_crop = st.slider("Crop from Top (%)", 0, 100, 0)
-            bottom_crop = st.slider("Crop from Bottom (%)", 0, 100, 0)
-            left_crop = st.slider("Crop from Left (%)", 0, 100, 0)
-            right_crop = st.slider("Crop from Right (%)", 0, 100, 0)
-        
-        # Time segment settings
-        st.markdown("### Time Settings")
-        
-        if uploaded_video is not None:
-            max_duration = video_info['duration']
-            start_time = st.slider("Start Time (seconds)", 0.0, max(0.1, max_duration-1), 0.0)
-            end_time = st.slider("End Time (seconds)", min(start_time + 0.1, max_duration), max_duration, max_duration)
-            
-            st.info(f"Selected Duration: {end_time - start_time:.2f}s")
-        else:
-            st.slider("Start Time (seconds)", 0.0, 10.0, 0.0, disabled=True)
-            st.slider("End Time (seconds)", 0.0, 10.0, 10.0, disabled=True)
-            
-        # Additional settings
-        with st.expander("Advanced Settings"):
-            col1, col2 = st.columns(2)
-            
-            with col1:
-                resize_resolution = st.checkbox("Resize to Shorts Format (9:16)", value=True)
-                apply_filters = st.checkbox("Apply Basic Enhancement (Brightness/Contrast)", value=False)
-                
-                # Add GPU acceleration option
-                use_gpu = st.checkbox("Use GPU Acceleration", 
-                                    value=True,
-                                    help="Enable GPU acceleration for faster video processing (requires NVIDIA or AMD GPU)")
-                
-                # Display GPU info if available
-                if perf_config.gpu_info['available']:
-                    st.caption(f"Detected GPU: {perf_config.gpu_info['model'] or perf_config.gpu_info['vendor'].upper()}")
-                else:
-                    st.caption("No compatible GPU detected")
-            
-            with col2:
-                loop_video = st.checkbox("Loop to Target Duration", value=False)
-                
-                if loop_video:
-                    target_duration = st.slider("Target Duration (seconds)", 
-                                              min_value=5, 
-                                              max_value=60, 
-                                              value=15)
-            
-            # Store GPU acceleration setting in session state
-            if 'template_editor_use_gpu' not in st.session_state:
-                st.session_state.template_editor_use_gpu = use_gpu
-            else:
-                st.session_state.template_editor_use_gpu = use_gpu
-            
-        # Process button
-        if uploaded_video is not None:
-            process_button = st.button("Process Template", type="primary", use_container_width=True)
-            
-            if process_button:
-                with st.spinner("Processing video template..."):
-                    try:
-                        # Determine output path
-                        output_path = os.path.join("templates", f"{template_name}.mp4")
-                        
-                        # Process the video based on settings
-                        if crop_option == "Custom":
-                            crop_params = {
-                                "top": top_crop / 100,
-                                "bottom": bottom_crop / 100,
-                                "left": left_crop / 100,
-                                "right": right_crop / 100
-                            }
-                        else:
-                            crop_params = {"method": crop_option.lower()}
-                        
-                        # Additional parameters based on settings
-                        additional_params = {
-                            "resize_resolution": resize_resolution,
-                            "apply_filters": apply_filters,
-                            "loop_video": loop_video
-                        }
-                        
-                        if loop_video:
-                            additional_params["target_duration"] = target_duration
-                        
-                        # Call the process function
-                        result = process_video_template(
-                            temp_video_path,
-                            output_path,
-                            start_time,
-                            end_time,
-                            crop_params,
-                            additional_params
-                        )
-                        
-                        if result:
-                            st.success(f"Template '{template_name}' created successfully!")
-                            # Refresh template list
-                            st.session_state.templates_refreshed = True
-                    except Exception as e:
-                        st.error(f"Error processing template: {str(e)}")
-        else:
-            st.button("Process Template", disabled=True, use_container_width=True)
-    
-    # List of existing templates
-    st.markdown("---")
-    st.subheader("Existing Templates")
-    
-    templates = list_available_templates()
-    if templates:
-        template_cols = st.columns(4)
-        
-        for i, template in enumerate(templates):
-            with template_cols[i % 4]:
-                st.markdown(f"**{template.replace('_', ' ').title()}**")
-                
-                # Try to find template thumbnail or video
-                template_path = os.path.join("templates", f"{template}.mp4")
-                if os.path.exists(template_path):
-                    st.video(template_path, start_time=0)
-                    
-                    # Add delete button
-                    if template != "default" and st.button(f"Delete {template}", key=f"del_{template}"):
-                        try:
-                            os.remove(template_path)
-                            st.success(f"Template '{template}' deleted!")
-                            st.experimental_rerun()
-                        except Exception as e:
-                            st.error(f"Error deleting template: {str(e)}")
-    else:
-        st.info("No templates found. Create your first template using the editor above.")
-
-
-def process_csv_sequentially(df, output_dir):
-    """Process CSV data sequentially (fallback method)
-    
-    Args:
-        df (DataFrame): DataFrame containing video generation instructions
-        output_dir (str): Directory to save output files
-    """
-    # Record start time
-    start_time = time.time()
-    
-    # Process each row in the CSV
-    for i, row in df.iterrows():
-        with st.spinner(f"Generating video {i+1}/{len(df)}: {row['topic']}"):
-            try:
-                # Create a unique name for the output file
-                timestamp = datetime.now().strftime("%Y%m%d%H%M%S")
-                video_id = f"{i+1}_{timestamp}"
-                output_base = f"{output_dir}/video_{video_id}"
-                
-                # Generate content
-                progress_text = st.empty()
-                progress_bar = st.progress(0)
-                
-                progress_text.text("Generating content...")
-                script, title, hook = generate_content(
-                    row['topic'], 
-                    max_words=150,  # Use a fixed value for batch processing
-                    style=row['content_style']
-                )
-                progress_bar.progress(20)
-                
-                # Generate audio
-                progress_text.text("Generating audio...")
-                audio_path = f"{output_base}_audio.mp3"
-                convert_text_to_speech(script, audio_path, language=row['language'])
-                progress_bar.progress(40)
-                
-                # Generate background video
-                progress_text.text("Creating background video...")
-                background_path = f"{output_base}_background.mp4"
-                create_video(
-                    background_path,
-                    duration=int(row['duration']),
-                    template_name=row['template_name']
-                )
-                progress_bar.progress(60)
-                
-                # Generate captions
-                progress_text.text("Generating captions...")
-                captions_path = f"{output_base}_captions.json"
-                create_captions(script, audio_path, captions_path)
-                progress_bar.progress(80)
-                
-                # Create final video
-                progress_text.text("Creating final video...")
-                output_path = f"{output_base}_final.mp4"
-                final_video = create_final_video(
-                    background_path,
-                    audio_path,
-                    captions_path,
-                    output_path,
-                    theme=row['visual_theme'],
-                    add_music=True,
-                    add_intro=True, 
-                    add_outro=True
-                )
-                progress_bar.progress(100)
-                
-                # Update analytics
-                video_data = {
-                    "id": video_id,
-                    "topic": row['topic'],
-                    "style": row['content_style'],
-                    "language": row['language'],
-                    "duration": int(row['duration']),
-                    "theme": row['visual_theme'],
-                    "words": len(script.split()),
-                    "template": row['template_name'],
-                    "timestamp": datetime.now().isoformat(),
-                    "path": output_path
-                }
-                update_analytics(video_data)
-                
-                # Success message
-                progress_text.text(f"Video {i+1} completed: {row['topic']}")
-                
-            except Exception as e:
-                st.error(f"Error generating video {i+1}: {str(e)}")
-    
-    # Display completion message
-    end_time = time.time()
-    elapsed_time = end_time - start_time
-    st.success(f"Sequential batch processing completed in {elapsed_time:.2f} seconds!")
-    
-    # Display video links
-    st.markdown("### Generated Videos")
-    st.markdown("The following videos have been generated:")
-    
-    for file in os.listdir(output_dir):
-        if file.endswith("_final.mp4"):
-            video_path = os.path.join(output_dir, file)
-            st.video(video_path)
-
-
-# Main application
-def main():
-    """Main execution function"""
-    # Initialize session state
-    initialize_session_state()
-    
-    # Render header
-    render_header()
-    
-    # Render sidebar
-    render_sidebar()
-    
-    # Render appropriate page based on navigation state
-    if st.session_state.page == "generate":
-        render_generator_page()
-    elif st.session_state.page == "videos":
-        render_videos_page()
-    elif st.session_state.page == "analytics":
-        render_analytics_page()
-    elif st.session_state.page == "help":
-        render_help_page()
-    elif st.session_state.page == "template_editor":
-        render_template_editor_page()
-
-
-if __name__ == "__main__":
+"""
+YouTube Shorts Generator - Streamlit Frontend
+"""
+
+import os
+import time
+import orjson
+import asyncio
+import random
+import shutil
+import xxhash
+import functools
+import subprocess
+import string
+import logging
+import queue
+import atexit
+import threading
+import streamlit as st
+from pathlib import Path
+from datetime import datetime
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from dotenv import load_dotenv
+import math
+import platform
+
+# Configure logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+logger = logging.getLogger('ytauto-app')
+
+# Import backend functionality
+from src.content_generator import generate_content, CONTENT_STYLES
+from src.text_to_speech import convert_text_to_speech
+from src.video_generator import create_video, list_available_templates
+from src.captions_generator import create_captions
+from src.video_editor import create_final_video, VISUAL_THEMES
+from src.performance_config import get_performance_config, init_performance_settings
+
+# Load environment variables
+load_dotenv()
+
+
+def _apply_gpu_env(use_gpu):
+    """Set CUDA device visibility for this process and its children"""
+    if use_gpu:
+        os.environ['CUDA_VISIBLE_DEVICES'] = '0'
+        os.environ['CPU_ONLY'] = '0'
+    else:
+        os.environ['CUDA_VISIBLE_DEVICES'] = '-1'
+        os.environ['CPU_ONLY'] = '1'
+
+
+# CUDA captures device visibility when libcuda first initializes, so the
+# env vars must be set once at startup, before any CUDA-linked import;
+# rewriting them in button handlers mid-session has no effect on already
+# loaded libraries. The sidebar toggle warns when a restart is needed.
+_STARTUP_USE_GPU = os.environ.get('CPU_ONLY', '0') != '1'
+_apply_gpu_env(_STARTUP_USE_GPU)
+
+# Initialize performance settings
+init_performance_settings()
+perf_config = get_performance_config()
+
+# GPU detection ran once inside the singleton above; bind the dict here so
+# rerun-heavy code reads one module global instead of an attribute chain
+GPU_INFO = perf_config.gpu_info
+
+# Constants
+APP_VERSION = "1.1.0"
+ANALYTICS_FILE = "resources/analytics.json"  # legacy combined file (counters + history)
+ANALYTICS_ROLLUP_FILE = "resources/analytics_rollup.json"
+ANALYTICS_HISTORY_FILE = "resources/analytics_history.jsonl"
+LANGUAGES = {
+    "en": "English",
+    "es": "Spanish",
+    "fr": "French",
+    "de": "German",
+    "it": "Italian",
+    "pt": "Portuguese",
+    "ru": "Russian",
+    "ja": "Japanese",
+    "zh-CN": "Chinese (Simplified)",
+    "ar": "Arabic",
+    "hi": "Hindi",
+    "ko": "Korean"
+}
+
+# Widget option lists folded to constants once at import; the dicts never
+# change at runtime so there is no need to rebuild these every rerun
+LANGUAGE_KEYS = tuple(LANGUAGES)
+VISUAL_THEME_KEYS = tuple(VISUAL_THEMES)
+CONTENT_STYLE_KEYS = tuple(CONTENT_STYLES)
+
+
+# Shorts aspect ratio, hoisted so the hot crop path doesn't recompute it
+TARGET_AR = 9 / 16
+
+
+def _center_rect(w, h):
+    """Center crop to 9:16; one inset is always zero"""
+    new_w = min(w, int(h * TARGET_AR))
+    new_h = min(h, int(w / TARGET_AR))
+    return ((w - new_w) // 2, (h - new_h) // 2, new_w, new_h)
+
+
+# Crop rectangle per predefined method, as (x1, y1, width, height) for a
+# frame of size (w, h); dict dispatch replaces the old if/elif ladder
+CROP_RECTS = {
+    "center": _center_rect,
+    "top": lambda w, h: (0, 0, w, min(h, int(w * 16 / 9))),
+    "bottom": lambda w, h: (0, max(0, h - int(w * 16 / 9)), w, min(h, int(w * 16 / 9))),
+    "left": lambda w, h: (0, 0, min(w, int(h * TARGET_AR)), h),
+    "right": lambda w, h: (max(0, w - int(h * TARGET_AR)), 0, min(w, int(h * TARGET_AR)), h),
+}
+
+
+def compute_crop_rect(w, h, crop_params):
+    """Resolve crop_params to a single (x1, y1, width, height) rectangle
+
+    Predefined methods dispatch through CROP_RECTS; the custom variant
+    converts its edge percentages. Degenerate rectangles fall back to
+    the full frame.
+    """
+    method = crop_params.get("method")
+    if method in CROP_RECTS:
+        return CROP_RECTS[method](w, h)
+    if "top" in crop_params:
+        x1 = int(w * crop_params["left"])
+        y1 = int(h * crop_params["top"])
+        new_w = w - x1 - int(w * crop_params["right"])
+        new_h = h - y1 - int(h * crop_params["bottom"])
+        if new_w > 0 and new_h > 0:
+            return (x1, y1, new_w, new_h)
+    return (0, 0, w, h)
+
+# Local theme preview assets; background/text colors loosely match each theme
+THEME_PREVIEW_DIR = "resources/previews"
+THEME_PREVIEW_COLORS = {
+    "default": ((25, 25, 35), (255, 255, 255)),
+    "modern": ((0, 60, 120), (255, 255, 255)),
+    "minimalist": ((245, 245, 245), (30, 30, 30)),
+    "dramatic": ((10, 10, 10), (255, 215, 0)),
+    "retro": ((112, 66, 20), (245, 245, 220)),
+}
+
+
+@st.cache_data(show_spinner=False)
+def get_theme_preview(theme):
+    """Return a local preview image for a theme, rendering it once if missing
+
+    Previously the preview loaded an external placeholder URL on every rerun,
+    blocking the UI on the network. WebP keeps the asset payload small.
+    """
+    os.makedirs(THEME_PREVIEW_DIR, exist_ok=True)
+    preview_path = os.path.join(THEME_PREVIEW_DIR, f"{theme}.webp")
+    if not os.path.exists(preview_path):
+        from PIL import Image, ImageDraw
+        bg_color, text_color = THEME_PREVIEW_COLORS.get(theme, THEME_PREVIEW_COLORS["default"])
+        image = Image.new("RGB", (400, 600), bg_color)
+        draw = ImageDraw.Draw(image)
+        label = f"{theme.replace('_', ' ').title()} Theme"
+        draw.text((200, 300), label, fill=text_color, anchor="mm")
+        image.save(preview_path, "WEBP")
+    return preview_path
+
+
+@st.cache_resource(show_spinner=False)
+def get_io_pool():
+    """Shared pool for filesystem-bound work (intermediate file writes,
+    deletes, poster renders); keeps storage latency off the Streamlit
+    script thread. cache_resource makes it one pool per process — built
+    at module scope it would leak four threads on every rerun.
+    """
+    return ThreadPoolExecutor(max_workers=4)
+
+
+def submit_io(fn, *args, **kwargs):
+    """Run a filesystem-bound step on the shared I/O pool with retries
+
+    Transient OSErrors (network filesystems, antivirus locks) are retried
+    with exponential backoff before surfacing to the caller.
+
+    Returns:
+        concurrent.futures.Future: Future resolving to fn's return value
+    """
+    def _with_retry():
+        for attempt in range(3):
+            try:
+                return fn(*args, **kwargs)
+            except OSError:
+                if attempt == 2:
+                    raise
+                time.sleep(2 ** attempt)
+    return get_io_pool().submit(_with_retry)
+
+
+def probe_duration(path):
+    """Get media duration in seconds via ffprobe
+
+    Much cheaper than instantiating a VideoFileClip, which spawns a full
+    ffmpeg decoder just to read one header value.
+    """
+    proc = subprocess.run(
+        ["ffprobe", "-v", "error", "-show_entries", "format=duration", "-of", "json", path],
+        capture_output=True,
+        check=True
+    )
+    return float(orjson.loads(proc.stdout)["format"]["duration"])
+
+
+@st.cache_data(show_spinner=False, max_entries=256)
+def _probe_video_info(video_path, mtime, size):
+    """Probe video metadata with ffprobe, cached on (path, mtime, size)
+
+    Avoids spinning up a MoviePy reader (ffmpeg subprocess + first-frame
+    decode) just to read four header values; repeated editor reruns are free.
+    ffprobe reads only the container header — no frame is decoded — which
+    matches what an in-process demuxer (PyAV/decord) would give us without
+    taking on another binary dependency. st.cache_data (rather than
+    lru_cache) keeps the entries across script reruns.
+    """
+    out = subprocess.check_output([
+        "ffprobe", "-v", "error", "-select_streams", "v:0",
+        "-show_entries", "stream=width,height,r_frame_rate,duration",
+        "-of", "json", video_path
+    ])
+    stream = orjson.loads(out)["streams"][0]
+    num, den = map(int, stream["r_frame_rate"].split("/"))
+    duration = stream.get("duration")
+    return {
+        "duration": float(duration) if duration else probe_duration(video_path),
+        "width": stream["width"],
+        "height": stream["height"],
+        "fps": num / den if den else 0.0
+    }
+
+
+def get_video_info(video_path):
+    """Get basic information about a video file, or None if probing fails
+
+    The (mtime, size) cache key invalidates automatically when a file is
+    re-uploaded in place; widget-change reruns never re-probe.
+    """
+    try:
+        stat = os.stat(video_path)
+        return _probe_video_info(video_path, stat.st_mtime, stat.st_size)
+    except Exception as e:
+        logger.error(f"Error probing video info: {str(e)}")
+        return None
+
+
+@functools.lru_cache(maxsize=None)
+def _ensure_dir(path):
+    """Create a directory once per process; repeated calls are free"""
+    os.makedirs(path, exist_ok=True)
+
+
+# Create the working directories up front so the generate handler
+# doesn't re-stat them on every click
+for _dir in ("output", "resources", "resources/temp", "resources/music"):
+    _ensure_dir(_dir)
+
+
+# Page configuration
+st.set_page_config(
+    page_title="YouTube Shorts Generator",
+    page_icon="🎬",
+    layout="wide",
+    initial_sidebar_state="expanded"
+)
+
+# Custom CSS loaded once from a static asset instead of a multi-kB
+# string literal re-built in the script body on every rerun
+APP_CSS = Path(__file__).parent.joinpath("static", "app.css").read_text()
+st.markdown(f"<style>{APP_CSS}</style>", unsafe_allow_html=True)
+
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def cached_generate_content(idea, max_words, style):
+    """Memoized content generation keyed on (idea, max_words, style)
+
+    Re-clicking Generate after tweaking theme/music/template settings
+    reuses the cached script instead of paying for another OpenAI call.
+    """
+    return generate_content(idea, max_words=max_words, style=style)
+
+
+@st.cache_data(ttl=24 * 3600, show_spinner=False)
+def cached_tts(script_hash, language, _script):
+    """Memoized text-to-speech keyed on (script_hash, language)
+
+    The script itself is passed with a leading underscore so Streamlit
+    hashes only the digest, not the full text. The MP3 is written to a
+    content-addressed file in resources/temp so an unchanged script never
+    re-runs the TTS step.
+    """
+    cache_file = f"resources/temp/tts_{script_hash}_{language}.mp3"
+    if not os.path.exists(cache_file):
+        convert_text_to_speech(_script, cache_file, language=language)
+    return cache_file
+
+
+@st.cache_data(show_spinner=False, max_entries=32, ttl=300)
+def get_video_bytes(path, mtime):
+    """Read a video file once per (path, mtime); reruns hit the cache
+
+    Keying on mtime invalidates the entry automatically if the file is
+    regenerated in place; max_entries/ttl keep a large videos page from
+    pinning every MP4 in memory at once.
+    """
+    return Path(path).read_bytes()
+
+
+@st.cache_resource(show_spinner=False)
+def get_batch_processor(max_workers):
+    """Return the shared BatchProcessor for this worker count
+
+    The processor keeps a persistent worker pool, so it must be a cached
+    singleton: constructing one per button click would leak a full set of
+    worker processes every batch.
+    """
+    from src.batch_processor import BatchProcessor
+    return BatchProcessor(max_workers=max_workers)
+
+
+@st.cache_resource(show_spinner=False)
+def csv_template_bytes(path):
+    """Load the batch CSV template once instead of re-reading every rerun"""
+    template = Path(path)
+    return template.read_bytes() if template.exists() else None
+
+
+def get_video_poster(video_path):
+    """Return a cached poster frame for a video, or None while it renders
+
+    The poster JPEG is cached next to the MP4 and regenerated when the
+    video's mtime is newer. Missing posters are extracted on the I/O pool
+    so the grid never blocks on ffmpeg.
+    """
+    video_path = Path(video_path)
+    poster = video_path.with_name(f"{video_path.stem}_poster.jpg")
+    try:
+        if poster.stat().st_mtime >= video_path.stat().st_mtime:
+            return str(poster)
+    except OSError:
+        pass
+    submit_io(
+        subprocess.run,
+        ["ffmpeg", "-y", "-v", "error", "-ss", "0", "-i", str(video_path),
+         "-frames:v", "1", "-q:v", "3", str(poster)],
+        check=True
+    )
+    return None
+
+
+def get_template_thumbnail(template_path):
+    """Return a cached 320px thumbnail for a template, or None while it renders
+
+    Same scheme as the video posters: the JPEG sits next to the MP4,
+    invalidates on mtime, and missing thumbnails render on the I/O pool.
+    """
+    template_path = Path(template_path)
+    thumb = template_path.with_name(f"{template_path.stem}_thumb.jpg")
+    try:
+        if thumb.stat().st_mtime >= template_path.stat().st_mtime:
+            return str(thumb)
+    except OSError:
+        pass
+    submit_io(
+        subprocess.run,
+        ["ffmpeg", "-y", "-v", "error", "-ss", "0.5", "-i", str(template_path),
+         "-frames:v", "1", "-vf", "scale=320:-2", "-q:v", "3", str(thumb)],
+        check=True
+    )
+    return None
+
+
+# dtypes for the batch CSV; categoricals keep repeated values compact
+BATCH_CSV_DTYPES = {
+    "content_style": "category",
+    "language": "category",
+    "visual_theme": "category",
+    "template_name": "category",
+}
+
+
+def iter_csv_chunks(csv_file, chunksize=64):
+    """Stream the uploaded CSV in chunks so large batches never load fully
+
+    Returns a pandas TextFileReader; callers iterate DataFrame chunks and
+    rows stream into the pipeline as they are parsed.
+    """
+    import pandas as pd
+    csv_file.seek(0)
+    return pd.read_csv(csv_file, chunksize=chunksize, dtype=BATCH_CSV_DTYPES)
+
+
+@st.cache_data(ttl=60, show_spinner=False)
+def get_available_templates():
+    """Cached template listing so directory scans happen at most once per minute
+
+    Streamlit reruns the whole script on every widget interaction, so calling
+    list_available_templates() directly would hit the filesystem each rerun.
+    """
+    return list_available_templates()
+
+
+@st.cache_data(ttl=60, show_spinner=False)
+def list_template_files():
+    """Map template name -> (path, mtime) from one scandir pass
+
+    Feeds the gallery without a per-template os.path.exists stat on
+    every rerun; DirEntry serves the mtimes from the same pass.
+    """
+    files = {}
+    try:
+        with os.scandir("templates") as entries:
+            for entry in entries:
+                if entry.name.endswith(".mp4"):
+                    files[entry.name[:-4]] = (entry.path, entry.stat().st_mtime)
+    except FileNotFoundError:
+        pass
+    return files
+
+
+@st.cache_data(show_spinner=False)
+def build_history_df(total_videos):
+    """Build the generation-history DataFrame, cached on the video count
+
+    The JSONL log only ever grows by one line per video, so keying on the
+    rollup's total_videos counter reuses the frame until something new
+    is generated.
+    """
+    import pandas as pd
+    return pd.DataFrame(load_analytics_history())
+
+
+def list_output_videos(dirpath="output"):
+    """List (path, size, mtime) for final videos, cached on directory mtime
+
+    One os.scandir pass per directory change replaces the per-rerun glob +
+    three stat calls per file; DirEntry serves stats from the scandir data.
+    """
+    dir_mtime = os.stat(dirpath).st_mtime_ns
+    cached = st.session_state.get('_output_videos_cache')
+    if cached and cached[0] == dir_mtime:
+        return cached[1]
+
+    videos = []
+    with os.scandir(dirpath) as entries:
+        for entry in entries:
+            if entry.name.endswith("_final.mp4"):
+                stat = entry.stat()
+                videos.append((Path(entry.path), stat.st_size, stat.st_mtime))
+
+    st.session_state['_output_videos_cache'] = (dir_mtime, videos)
+    return videos
+
+
+def initialize_session_state():
+    """Initialize session state variables"""
+    if 'generation_history' not in st.session_state:
+        st.session_state.generation_history = []
+    if 'theme_preview' not in st.session_state:
+        st.session_state.theme_preview = {}
+    if 'analytics_data' not in st.session_state:
+        st.session_state.analytics_data = load_analytics_data()
+    if 'page' not in st.session_state:
+        st.session_state.page = "generate"
+
+
+def _with_counters(analytics):
+    """Wrap the per-category sub-dicts in Counter for branchless increments
+
+    Counter is a dict subclass, so orjson serialization is unaffected.
+    """
+    for key in ("by_theme", "by_style", "by_language"):
+        analytics[key] = Counter(analytics.get(key, {}))
+    return analytics
+
+
+def load_analytics_data():
+    """Load the analytics rollup (counters only) or initialize new data"""
+    if os.path.exists(ANALYTICS_ROLLUP_FILE):
+        try:
+            return _with_counters(orjson.loads(Path(ANALYTICS_ROLLUP_FILE).read_bytes()))
+        except Exception:
+            pass
+
+    # Migrate from the legacy combined analytics file if present
+    if os.path.exists(ANALYTICS_FILE):
+        try:
+            legacy = orjson.loads(Path(ANALYTICS_FILE).read_bytes())
+            history = legacy.pop("history", [])
+            os.makedirs(os.path.dirname(ANALYTICS_HISTORY_FILE), exist_ok=True)
+            with open(ANALYTICS_HISTORY_FILE, 'ab') as f:
+                for entry in history:
+                    f.write(orjson.dumps(entry) + b"\n")
+            Path(ANALYTICS_ROLLUP_FILE).write_bytes(
+                orjson.dumps(legacy, option=orjson.OPT_NON_STR_KEYS)
+            )
+            return _with_counters(legacy)
+        except Exception:
+            pass
+
+    # Initial analytics structure (history lives in the JSONL sidecar)
+    return {
+        "total_videos": 0,
+        "total_duration": 0,
+        "by_theme": Counter(),
+        "by_style": Counter(),
+        "by_language": Counter()
+    }
+
+
+def load_analytics_history():
+    """Stream generation history from the append-only JSONL log (lazy)"""
+    history = []
+    if os.path.exists(ANALYTICS_HISTORY_FILE):
+        try:
+            with open(ANALYTICS_HISTORY_FILE, 'rb') as f:
+                for line in f:
+                    if line.strip():
+                        history.append(orjson.loads(line))
+        except Exception as e:
+            logger.error(f"Error reading analytics history: {str(e)}")
+    return history
+
+
+def _analytics_writer(analytics_q):
+    """Drain the analytics queue, coalescing queued entries per flush
+
+    Appending keeps the history save O(1) no matter how long the log
+    grows, and write-to-temp + rename keeps the rollup atomic: a crash
+    mid-write can never leave a truncated file behind. Only the newest
+    rollup snapshot in a batch needs writing; it already includes the
+    older entries' counts.
+    """
+    while True:
+        rollup_bytes, entry = analytics_q.get()
+        entries = [entry]
+        while True:
+            try:
+                rollup_bytes, entry = analytics_q.get_nowait()
+                entries.append(entry)
+            except queue.Empty:
+                break
+        try:
+            os.makedirs(os.path.dirname(ANALYTICS_ROLLUP_FILE), exist_ok=True)
+            rollup_tmp = ANALYTICS_ROLLUP_FILE + ".tmp"
+            Path(rollup_tmp).write_bytes(rollup_bytes)
+            os.replace(rollup_tmp, ANALYTICS_ROLLUP_FILE)
+            with open(ANALYTICS_HISTORY_FILE, 'ab') as f:
+                f.write(b"".join(entries))
+        except Exception as e:
+            logger.error(f"Error persisting analytics: {str(e)}")
+        finally:
+            for _ in entries:
+                analytics_q.task_done()
+
+
+@st.cache_resource(show_spinner=False)
+def get_analytics_queue():
+    """Start the analytics writer once and return its queue
+
+    Producer-consumer queue for analytics persistence: the results loop
+    only enqueues; a daemon thread batches whatever has accumulated into
+    one rollup write plus one history append instead of a write+rename
+    per video. Built behind cache_resource so Streamlit reruns reuse the
+    same queue and writer instead of spawning a new thread (and stacking
+    another atexit hook) every interaction.
+    """
+    analytics_q = queue.Queue()
+    threading.Thread(target=_analytics_writer, args=(analytics_q,), daemon=True).start()
+    # Make sure queued analytics hit disk before the interpreter exits
+    atexit.register(analytics_q.join)
+    return analytics_q
+
+
+def update_analytics(video_data):
+    """Update analytics with new video generation data"""
+    analytics = st.session_state.analytics_data
+
+    # Update counters
+    analytics["total_videos"] += 1
+    analytics["total_duration"] += video_data.get("duration", 0)
+
+    # Update per-category counters (Counter makes the missing-key case free)
+    analytics["by_theme"][video_data.get("theme", "default")] += 1
+    analytics["by_style"][video_data.get("style", "educational")] += 1
+    analytics["by_language"][video_data.get("language", "en")] += 1
+
+    video_data["timestamp"] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+    # Counters above update synchronously so the UI reflects them at once;
+    # the disk writes are handed to the background writer thread, which
+    # coalesces bursts (e.g. a batch run) into a single rollup write.
+    # Serializing here snapshots the dict before further mutation.
+    get_analytics_queue().put((
+        orjson.dumps(analytics, option=orjson.OPT_NON_STR_KEYS),
+        orjson.dumps(video_data) + b"\n"
+    ))
+
+    # Update session state
+    st.session_state.analytics_data = analytics
+
+
+# App Header
+def render_header():
+    """Render the app header"""
+    col1, col2, col3 = st.columns([1, 3, 1])
+    with col2:
+        st.markdown("<h1 class='main-header'>YouTube Shorts Generator</h1>", unsafe_allow_html=True)
+        st.markdown("<p style='text-align: center; font-size: 1.2rem;'>Create engaging YouTube shorts in minutes from a simple idea</p>", unsafe_allow_html=True)
+
+
+# Sidebar configuration
+def render_sidebar():
+    """Render the sidebar with configuration options"""
+    with st.sidebar:
+        st.image("https://upload.wikimedia.org/wikipedia/commons/thumb/e/e1/YouTube_play_button_icon_%282013-2017%29.svg/1280px-YouTube_play_button_icon_%282013-2017%29.svg.png", width=60)
+        st.header("Configuration")
+        
+        # Navigation
+        st.subheader("Navigation")
+        if st.button("🛠️ Generator", use_container_width=True):
+            st.session_state.page = "generate"
+        if st.button("🎬 My Videos", use_container_width=True):
+            st.session_state.page = "videos"
+        if st.button("📊 Analytics", use_container_width=True):
+            st.session_state.page = "analytics"
+        if st.button("🎨 Template Editor", use_container_width=True):
+            st.session_state.page = "template_editor"
+        if st.button("❓ Help", use_container_width=True):
+            st.session_state.page = "help"
+            
+        st.markdown("---")
+        
+        # API Key Configuration
+        api_key = st.text_input("OpenAI API Key", 
+                               value=os.getenv("OPENAI_API_KEY", ""),
+                               type="password",
+                               help="Enter your OpenAI API key for content generation")
+        
+        if api_key:
+            os.environ["OPENAI_API_KEY"] = api_key
+            st.success("API Key set!")
+        else:
+            st.warning("Please enter your OpenAI API key")
+        
+        st.markdown("---")
+        st.markdown("### About")
+        st.markdown(f"""
+        This app automatically generates YouTube Shorts based on your idea.
+        
+        Version: {APP_VERSION}
+        
+        Features:
+        - AI-powered script generation
+        - Multiple content styles
+        - Visual themes & effects
+        - Background music support
+        - Multiple language support
+        - Analytics & history tracking
+        """)
+        
+        # Footer
+        st.markdown("---")
+        st.markdown("<div class='footer'>© 2025 YouTube Shorts Generator</div>", unsafe_allow_html=True)
+
+
+# Generator page
+def render_generator_page():
+    """Render the main generator page"""
+    # Add global perf_config reference
+    global perf_config
+    
+    st.markdown("<h2 class='sub-header'>Generate New Video</h2>", unsafe_allow_html=True)
+    
+    # Add tabs for single video creation and batch processing
+    tab1, tab2 = st.tabs(["Single Video", "Batch Processing"])
+    
+    with tab1:
+        # Create two columns for main settings and preview
+        col1, col2 = st.columns([3, 2])
+        
+        with col1:
+            # Input for video idea
+            idea = st.text_area("Enter your video idea", 
+                               placeholder="Example: Amazing facts about space exploration",
+                               help="Describe the topic or concept for your YouTube Short")
+            
+            # Content style selection
+            content_style = st.selectbox(
+                "Content Style",
+                options=CONTENT_STYLE_KEYS,
+                index=0,
+                format_func=lambda x: x.replace('_', ' ').title(),
+                help="Select the style of content for your video"
+            )
+            
+            # Two columns for basic settings
+            basic_col1, basic_col2 = st.columns(2)
+            
+            with basic_col1:
+                # Video duration
+                duration = st.slider("Video Duration (seconds)", 
+                                   min_value=10, 
+                                   max_value=60, 
+                                   value=30,
+                                   step=5,
+                                   help="YouTube Shorts can be up to 60 seconds")
+                
+                # TTS language
+                tts_language = st.selectbox(
+                    "Voice Language",
+                    options=LANGUAGE_KEYS,
+                    index=0,
+                    format_func=lambda x: LANGUAGES[x],
+                    help="Select language for the voice narration"
+                )
+            
+            with basic_col2:
+                # Visual theme
+                visual_theme = st.selectbox(
+                    "Visual Theme",
+                    options=VISUAL_THEME_KEYS,
+                    index=0,
+                    format_func=lambda x: x.replace('_', ' ').title(),
+                    help="Select the visual style for your video"
+                )
+                
+                # Background template selection
+                template_options = get_available_templates()
+                template_name = st.selectbox(
+                    "Background Template",
+                    options=template_options,
+                    index=0,
+                    format_func=lambda x: x.replace('_', ' ').title(),
+                    help="Select a video template from the templates directory"
+                )
+            
+            # Add max_words parameter back
+            max_words = st.slider("Max Script Words", 
+                                min_value=50, 
+                                max_value=250, 
+                                value=150,
+                                help="Maximum number of words in the generated script")
+            
+            # Advanced options expander
+            with st.expander("Advanced Options"):
+                adv_col1, adv_col2 = st.columns(2)
+                
+                with adv_col1:
+                    add_intro = st.checkbox("Add Intro Animation", 
+                                         value=True,
+                                         help="Add a short intro animation to your video")
+                    
+                    add_music = st.checkbox("Add Background Music", 
+                                         value=True,
+                                         help="Add background music to your video (requires music files in resources/music)")
+                    
+                    # GPU acceleration option
+                    use_gpu = st.checkbox("Use GPU Acceleration", 
+                                        value=True,
+                                        help="Enable GPU acceleration for faster video processing (requires NVIDIA or AMD GPU)")
+                    
+                    # Display GPU info if available
+                    if GPU_INFO['available']:
+                        st.caption(f"Detected GPU: {GPU_INFO['model'] or GPU_INFO['vendor'].upper()}")
+                    else:
+                        st.caption("No compatible GPU detected")
+                
+                with adv_col2:
+                    # Add option for batch processing
+                    use_batch_processing = st.checkbox("Enable Batch Processing", 
+                                                    value=False,
+                                                    help="Process multiple videos in parallel for faster results")
+                    
+                    if use_batch_processing:
+                        batch_size = st.slider("Max Concurrent Jobs",
+                                             min_value=2,
+                                             max_value=8,
+                                             value=4,
+                                             help="Maximum number of videos to process simultaneously")
+                    
+                    # Show performance info option
+                    show_perf_info = st.checkbox("Show Performance Info", 
+                                              value=False,
+                                              help="Display hardware utilization information during processing")
+                
+                # Store GPU acceleration and batch processing settings in session state
+                st.session_state.update(
+                    use_gpu=use_gpu,
+                    use_batch_processing=use_batch_processing,
+                    batch_size=batch_size if use_batch_processing else st.session_state.get('batch_size', 4),
+                    show_perf_info=show_perf_info
+                )
+                
+                # Display current hardware info if showing performance info
+                if show_perf_info:
+                    st.divider()
+                    hardware_col1, hardware_col2 = st.columns(2)
+
+                    with hardware_col1:
+                        st.write("**Hardware Configuration:**")
+                        st.write(f"CPU Cores: {perf_config.num_cpu_cores}")
+                        st.write(f"Optimal Threads: {perf_config.optimal_threads}")
+
+                    with hardware_col2:
+                        st.write("**GPU Information:**")
+                        if GPU_INFO['available']:
+                            st.write(f"GPU: {GPU_INFO['model'] or GPU_INFO['vendor'].upper()}")
+                            st.write(f"Video Codec: {perf_config.codec}")
+                            st.write(f"CUDA Available: {perf_config.has_cuda}")
+                        else:
+                            st.write("No compatible GPU detected")
+                            st.write("Using CPU for video processing")
+        
+        with col2:
+            # Theme preview
+            st.markdown("<h3 style='text-align:center; margin-bottom:1rem;'>Theme Preview</h3>", unsafe_allow_html=True)
+            
+            # Show sample based on selected theme
+            theme_image_placeholder = st.empty()
+            theme_desc_placeholder = st.empty()
+            
+            # Show theme preview (simulated)
+            theme_descriptions = {
+                "default": "Clean and simple design with white text on semi-transparent black background.",
+                "modern": "Sleek blue accents with smooth fade-in animations.",
+                "minimalist": "Pure text without backgrounds for a clean, distraction-free look.",
+                "dramatic": "Bold Impact font with golden text on dark background and subtle zoom effect.",
+                "retro": "Vintage style with sepia tones and old-school typewriter font."
+            }
+            
+            theme_image_placeholder.image(get_theme_preview(visual_theme),
+                             use_column_width=True,
+                             caption="Sample visual style")
+            
+            theme_desc_placeholder.info(theme_descriptions.get(visual_theme, "Select a theme to see its description"))
+        
+    # Generate button
+    generate_button = st.button("💫 Generate YouTube Short", type="primary", use_container_width=True)
+    
+    if generate_button and idea:
+        if not os.getenv("OPENAI_API_KEY"):
+            st.error("⚠️ Please enter your OpenAI API key in the sidebar.")
+        else:
+            # Create progress bar
+            progress_bar = st.progress(0)
+            status_text = st.empty()
+            
+            try:
+                # Generate unique timestamp for this run
+                timestamp = time.strftime("%Y%m%d_%H%M%S")
+                output_base = f"output/short_{timestamp}"
+                
+                # Step 1: Generate content
+                status_text.text("Generating script and title...")
+                progress_text = st.empty()
+                progress_text.text("Generating content...")
+                script, title, hook = cached_generate_content(idea, max_words, content_style)
+                progress_bar.progress(20)
+                
+                # Show generated content
+                st.subheader("Generated Content")
+                st.markdown(f"**Title:** {title}")
+                if hook:
+                    st.markdown(f"**Hook:** {hook}")
+                st.markdown(f"**Script:**\n{script}")
+                
+                # Steps 2 + 3: TTS (network-bound) and background video
+                # (ffmpeg-bound) are independent, so overlap them
+                status_text.text("Converting text to speech and creating background video...")
+                # xxh3 hashes the script at multiple GB/s, so the cache key
+                # costs essentially nothing even for long scripts
+                script_hash = xxhash.xxh3_64(script.encode('utf-8')).hexdigest()
+                audio_file = f"{output_base}_audio.mp3"
+
+                custom_bg = ('enable_custom_bg' in locals() and enable_custom_bg
+                             and 'bg_file' in locals() and bg_file)
+
+                def _make_background():
+                    if custom_bg:
+                        # Save uploaded background video, streaming in 1 MiB
+                        # chunks so the upload is never materialized in RAM
+                        temp_bg_path = f"resources/temp/uploaded_bg_{timestamp}.mp4"
+                        bg_file.seek(0)
+                        with open(temp_bg_path, "wb") as f:
+                            shutil.copyfileobj(bg_file, f, 1 << 20)
+
+                        # Process the uploaded background
+                        output_bg = f"{output_base}_background.mp4"
+                        from src.video_generator import process_background_video
+                        process_background_video(temp_bg_path, output_bg, duration)
+                        return output_bg
+
+                    # Generate background video
+                    return create_video(
+                        f"{output_base}_background.mp4",
+                        duration=int(duration),
+                        template_name=template_name
+                    )
+
+                async def _media_stages():
+                    return await asyncio.gather(
+                        asyncio.to_thread(cached_tts, script_hash, tts_language, script),
+                        asyncio.to_thread(_make_background)
+                    )
+
+                cached_audio, background_video = asyncio.run(_media_stages())
+                shutil.copy(cached_audio, audio_file)
+
+                # Display audio
+                st.audio(audio_file)
+
+                progress_bar.progress(60)
+                
+                # Step 4: Generate captions
+                status_text.text("Creating captions...")
+                captions_file = create_captions(script, audio_file)
+                progress_bar.progress(80)
+                
+                # Step 5: Create final video
+                status_text.text("Finalizing video...")
+                
+                # GPU visibility was fixed at startup; just surface a
+                # mismatch instead of churning env vars CUDA won't re-read
+                if st.session_state.get('use_gpu', True) != _STARTUP_USE_GPU:
+                    st.warning("Restart the app for the GPU toggle to take effect.")
+
+                # Show performance monitoring if requested
+                if 'show_perf_info' in st.session_state and st.session_state.show_perf_info:
+                    try:
+                        perf_col1, perf_col2 = st.columns(2)
+                        with perf_col1:
+                            st.markdown("**Processing with:**")
+                            if GPU_INFO['available'] and st.session_state.use_gpu:
+                                st.markdown(f"🚀 **GPU**: {GPU_INFO['model'] or GPU_INFO['vendor'].upper()}")
+                                st.markdown(f"🎬 **Codec**: {perf_config.codec}")
+                                st.markdown(f"⚙️ **Threads**: {perf_config.optimal_threads}")
+                            else:
+                                st.markdown("💻 **CPU processing**")
+                                st.markdown(f"⚙️ **Threads**: {perf_config.optimal_threads}")
+                        
+                        # Add placeholder for timing information
+                        with perf_col2:
+                            st.markdown("**Performance Metrics:**")
+                            time_placeholder = st.empty()
+                            fps_placeholder = st.empty()
+                            
+                            # Start timing
+                            perf_start_time = time.time()
+                    except Exception as e:
+                        st.warning(f"Could not initialize performance monitoring: {str(e)}")
+                
+                # Build the shared assembly arguments once; both the batch
+                # job and every fallback branch reuse the same dict
+                final_output = f"{output_base}_final.mp4"
+                final_kwargs = dict(
+                    theme=visual_theme,
+                    add_music=add_music,
+                    add_intro=add_intro,
+                    add_outro=True
+                )
+
+                def do_final_video():
+                    return create_final_video(
+                        background_video,
+                        audio_file,
+                        captions_file,
+                        final_output,
+                        **final_kwargs
+                    )
+
+                # Use batch processing if selected
+                if 'use_batch_processing' in st.session_state and st.session_state.use_batch_processing:
+                    try:
+                        # Import batch processor
+                        from src.batch_processor import create_job
+
+                        # Reuse the cached processor for this batch size
+                        batch_size = st.session_state.batch_size if 'batch_size' in st.session_state else 4
+                        processor = get_batch_processor(batch_size)
+
+                        # Create a single job
+                        job = create_job(
+                            background_video,
+                            audio_file,
+                            captions_file,
+                            final_output,
+                            job_id=timestamp,
+                            **final_kwargs
+                        )
+
+                        # Process the job (single job in batch mode for consistent API)
+                        results = processor.process_batch([job], show_progress=False)
+
+                        # Get the result
+                        if results and results[0]['status'] == 'success':
+                            final_video = results[0]['result_file']
+                            processing_time = results[0]['elapsed_time']
+                            status_text.text(f"✅ Video generated in {processing_time:.2f} seconds using batch processing!")
+                        else:
+                            st.error(f"Error in batch processing: {results[0]['error'] if results else 'Unknown error'}")
+                            raise Exception("Batch processing failed")
+
+                    except ImportError:
+                        st.warning("Batch processing module not available. Falling back to standard processing.")
+                        final_video = do_final_video()
+                    except Exception as e:
+                        st.error(f"Batch processing error: {str(e)}")
+                        # Fallback to standard processing
+                        final_video = do_final_video()
+                else:
+                    # Standard processing
+                    final_video = do_final_video()
+                
+                progress_bar.progress(100)
+                
+                # Display success message and final video
+                status_text.text("✅ YouTube Short successfully generated!")
+                
+                # Update performance metrics if enabled
+                if 'show_perf_info' in st.session_state and st.session_state.show_perf_info and 'perf_start_time' in locals():
+                    try:
+                        # Calculate performance metrics
+                        perf_end_time = time.time()
+                        processing_time = perf_end_time - perf_start_time
+                        
+                        # Get video duration (ffprobe header read, no decoder)
+                        video_duration = probe_duration(final_video)
+
+                        # Calculate FPS and speedup factor
+                        fps = video_duration / processing_time
+                        
+                        # Update the placeholders
+                        time_placeholder.markdown(f"⏱️ **Processing time**: {processing_time:.2f} seconds")
+                        fps_placeholder.markdown(f"⚡ **Processing speed**: {fps:.2f}x real-time")
+                        
+                        # Add additional metrics
+                        st.markdown(f"Video duration: {video_duration:.2f} seconds")
+                        st.markdown(f"Processing ratio: {processing_time/video_duration:.2f}x")
+                    except Exception as e:
+                        st.warning(f"Error calculating performance metrics: {str(e)}")
+                
+                # Show final video
+                st.video(final_video)
+                
+                # Success message with download button
+                st.success(f"Your YouTube Short '{title}' has been generated successfully!")
+                
+                st.download_button(
+                    label="⬇️ Download Video",
+                    data=get_video_bytes(final_video, os.path.getmtime(final_video)),
+                    file_name=f"youtube_short_{timestamp}.mp4",
+                    mime="video/mp4"
+                )
+                
+                # Add to history
+                video_data = {
+                    "id": timestamp,
+                    "title": title,
+                    "idea": idea,
+                    "style": content_style,
+                    "theme": visual_theme,
+                    "language": tts_language,
+                    "duration": duration,
+                    "file_path": final_video
+                }
+                
+                st.session_state.generation_history.append(video_data)
+                
+                # Update analytics
+                update_analytics(video_data)
+                
+            except Exception as e:
+                st.error(f"Error generating video: {str(e)}")
+                status_text.text("❌ Error occurred during generation")
+    
+    elif generate_button and not idea:
+        st.warning("Please enter a video idea first.")
+
+    with tab2:
+        st.markdown("### Generate Videos in Batch from CSV")
+        
+        # Add help expander with instructions
+        with st.expander("How to use batch processing"):
+            st.markdown("""
+            ## CSV Batch Processing Instructions
+            
+            1. **Download the template CSV** using the button below
+            2. **Fill the CSV** with your video ideas following the format:
+               - **topic**: Main idea for the video
+               - **content_style**: Style of content (educational, listicle, etc.)
+               - **duration**: Length in seconds (10-60)
+               - **language**: Voice language code (en, es, fr, etc.)
+               - **visual_theme**: Visual style (modern, minimal, vibrant, etc.)
+               - **template_name**: Name of the template to use (without extension)
+            3. **Upload your completed CSV** using the uploader below
+            4. **Click "Generate Videos in Batch"** to process all videos
+            
+            The generated videos will be saved in the output directory and shown below after processing.
+            """)
+        
+        # CSV upload
+        st.markdown("#### Upload a CSV file with video ideas")
+        csv_file = st.file_uploader("Upload CSV", type=["csv"], help="Upload a CSV file with video ideas")
+        
+        # Show template download link
+        template_path = "templates/video_ideas_template.csv"
+        template_data = csv_template_bytes(template_path)
+        if template_data is not None:
+            st.download_button(
+                label="Download CSV Template",
+                data=template_data,
+                file_name="video_ideas_template.csv",
+                mime="text/csv",
+                help="Download a template CSV file to fill with your video ideas"
+            )
+        else:
+            st.warning("CSV template file not found. Please run setup first.")
+        
+        # Process CSV if uploaded
+        if csv_file is not None:
+            try:
+                # pandas is only needed once a CSV is actually uploaded
+                import pandas as pd
+
+                # Peek at the head only; preview and schema validation must
+                # not force a full read of a large upload
+                csv_file.seek(0)
+                preview_df = pd.read_csv(csv_file, nrows=50)
+
+                # Display CSV contents
+                st.markdown("#### CSV Preview")
+                st.dataframe(preview_df)
+
+                # Validate CSV format
+                required_columns = ["topic", "content_style", "duration", "language", "visual_theme", "template_name"]
+                missing_columns = [col for col in required_columns if col not in preview_df.columns]
+                
+                if missing_columns:
+                    st.error(f"Missing required columns: {', '.join(missing_columns)}")
+                else:
+                    # Process videos
+                    st.markdown("#### Generate Videos")
+                    
+                    # Settings for batch processing
+                    st.markdown("Batch Processing Settings:")
+                    output_dir = st.text_input("Output Directory", 
+                                             value="output/batch",
+                                             help="Directory where generated videos will be saved")
+                    
+                    # Create output directory if it doesn't exist
+                    os.makedirs(output_dir, exist_ok=True)
+                    
+                    # Add button to start batch processing
+                    if st.button("Generate Videos in Batch"):
+                        # Record start time
+                        start_time = time.time()
+                        
+                        # GPU visibility was fixed at startup; just surface a
+                        # mismatch instead of churning env vars CUDA won't re-read
+                        if st.session_state.get('use_gpu', True) != _STARTUP_USE_GPU:
+                            st.warning("Restart the app for the GPU toggle to take effect.")
+
+                        # Use true parallel batch processing if selected
+                        if 'use_batch_processing' in st.session_state and st.session_state.use_batch_processing:
+                            try:
+                                # Import batch processor
+                                from src.batch_processor import create_job
+
+                                # Reuse the cached processor for this batch size
+                                batch_size = st.session_state.batch_size if 'batch_size' in st.session_state else 4
+                                processor = get_batch_processor(batch_size)
+                                
+                                st.info(f"Using parallel batch processing with {batch_size} concurrent jobs")
+
+                                # One timestamp per batch: cheaper than a
+                                # strftime per row, and the index prefix keeps
+                                # IDs unique even for sub-second iterations
+                                base_ts = datetime.now().strftime("%Y%m%d%H%M%S")
+
+                                def prep_row(i, row):
+                                    """Run the four prep stages for one CSV row and return its job"""
+                                    # Create a unique name for the output file
+                                    video_id = f"{i+1}_{base_ts}"
+                                    output_base = f"{output_dir}/video_{video_id}"
+
+                                    # Generate script and title
+                                    script, title, hook = cached_generate_content(
+                                        row.topic,
+                                        150,  # Use a fixed value for batch processing
+                                        row.content_style
+                                    )
+
+                                    # Generate audio
+                                    audio_path = f"{output_base}_audio.mp3"
+                                    convert_text_to_speech(script, audio_path, language=row.language)
+
+                                    # Generate background video
+                                    background_path = f"{output_base}_background.mp4"
+                                    create_video(
+                                        background_path,
+                                        duration=int(row.duration),
+                                        template_name=row.template_name
+                                    )
+
+                                    # Generate captions
+                                    captions_path = f"{output_base}_captions.json"
+                                    create_captions(script, audio_path, captions_path)
+
+                                    # Create job for final video
+                                    return create_job(
+                                        background_path,
+                                        audio_path,
+                                        captions_path,
+                                        f"{output_base}_final.mp4",
+                                        job_id=f"video_{i+1}",
+                                        theme=row.visual_theme,
+                                        add_music=True,
+                                        add_intro=True,
+                                        add_outro=True
+                                    )
+
+                                # Prep is network- and ffmpeg-bound, so fan the
+                                # rows out across threads as the CSV streams in
+                                # instead of preparing them one after another
+                                processed_rows = []
+                                futures = []
+                                with st.spinner("Preparing content for batch videos..."):
+                                    with ThreadPoolExecutor(max_workers=batch_size) as prep_pool:
+                                        for chunk in iter_csv_chunks(csv_file):
+                                            # itertuples skips the per-row
+                                            # Series allocation iterrows pays
+                                            for row in chunk.itertuples(index=False, name='Job'):
+                                                futures.append(prep_pool.submit(prep_row, len(futures), row))
+                                                processed_rows.append(row)
+                                        # Collect in submission order so results
+                                        # stay index-aligned with processed_rows
+                                        jobs = [f.result() for f in futures]
+                                
+                                # Process all jobs in parallel
+                                progress_text = st.empty()
+                                progress_text.text(f"Processing {len(jobs)} videos in parallel...")
+                                
+                                # Create a progress bar
+                                batch_progress = st.progress(0)
+                                
+                                # Process the jobs
+                                results = processor.process_batch(jobs, show_progress=False)
+                                
+                                # Update the progress bar to complete
+                                batch_progress.progress(100)
+                                
+                                # Process results
+                                successful_jobs = sum(1 for r in results if r['status'] == 'success')
+                                failed_jobs = sum(1 for r in results if r['status'] == 'error')
+                                
+                                # Update analytics for successful jobs. Results
+                                # arrive in completion order, not submission
+                                # order, so match each one back to its CSV row
+                                # through the job_id rather than by position.
+                                row_by_job_id = {job['job_id']: row
+                                                 for job, row in zip(jobs, processed_rows)}
+                                completed_at = datetime.now().isoformat()
+                                for result in results:
+                                    if result['status'] == 'success':
+                                        row = row_by_job_id[result['job_id']]
+                                        video_data = {
+                                            "id": result['job_id'],
+                                            "topic": row.topic,
+                                            "style": row.content_style,
+                                            "language": row.language,
+                                            "duration": int(row.duration),
+                                            "theme": row.visual_theme,
+                                            "timestamp": completed_at,
+                                            "path": result['result_file'],
+                                            "processing_time": result['elapsed_time']
+                                        }
+                                        update_analytics(video_data)
+                                
+                                # Display completion message
+                                end_time = time.time()
+                                elapsed_time = end_time - start_time
+                                st.success(f"Batch processing completed in {elapsed_time:.2f} seconds! {successful_jobs} videos succeeded, {failed_jobs} failed.")
+                                
+                                # Display video links for successful jobs
+                                st.markdown("### Generated Videos")
+                                st.markdown("The following videos have been generated:")
+                                
+                                for result in results:
+                                    if result['status'] == 'success':
+                                        st.video(result['result_file'])
+                                
+                            except ImportError as e:
+                                st.warning(f"Parallel batch processing not available: {str(e)}. Falling back to sequential processing.")
+                                # Fall back to traditional sequential processing
+                                process_csv_sequentially(iter_csv_chunks(csv_file), output_dir)
+                            except Exception as e:
+                                st.error(f"Error in parallel batch processing: {str(e)}")
+                                # Fall back to traditional sequential processing
+                                process_csv_sequentially(iter_csv_chunks(csv_file), output_dir)
+                        else:
+                            # Traditional sequential processing
+                            process_csv_sequentially(iter_csv_chunks(csv_file), output_dir)
+            
+            except Exception as e:
+                st.error(f"Error processing CSV: {str(e)}")
+
+
+# Videos page (My Videos)
+def render_videos_page():
+    """Render the videos management page"""
+    # Add global perf_config reference
+    global perf_config
+    
+    st.markdown("<h2 class='sub-header'>Videos Management</h2>", unsafe_allow_html=True)
+    
+    # Check for video files
+    output_dir = Path("output")
+    if output_dir.exists():
+        video_entries = list_output_videos(str(output_dir))
+
+        if video_entries:
+            # Reduce the cached (path, size, mtime) tuples with numpy: one
+            # C-level sum/max instead of N Python iterations per rerun
+            import numpy as np
+            sizes = np.fromiter((s for _, s, _ in video_entries),
+                                dtype=np.int64, count=len(video_entries))
+            mtimes = np.fromiter((m for _, _, m in video_entries),
+                                 dtype=np.float64, count=len(video_entries))
+            total_videos = sizes.size
+            total_size_mb = sizes.sum() / (1024 * 1024)
+            
+            stat1, stat2, stat3 = st.columns(3)
+            with stat1:
+                st.markdown(f"""
+                <div class='stats-card'>
+                    <div class='stats-number'>{total_videos}</div>
+                    <div>Videos Generated</div>
+                </div>
+                """, unsafe_allow_html=True)
+            
+            with stat2:
+                st.markdown(f"""
+                <div class='stats-card'>
+                    <div class='stats-number'>{total_size_mb:.1f} MB</div>
+                    <div>Total Size</div>
+                </div>
+                """, unsafe_allow_html=True)
+            
+            with stat3:
+                latest_date_str = datetime.fromtimestamp(mtimes.max()).strftime("%Y-%m-%d")
+                st.markdown(f"""
+                <div class='stats-card'>
+                    <div class='stats-number'>{latest_date_str}</div>
+                    <div>Latest Video</div>
+                </div>
+                """, unsafe_allow_html=True)
+            
+            st.markdown("---")
+            
+            # Search and filter
+            search = st.text_input("Search videos by timestamp or ID", 
+                                 placeholder="e.g., 20250301")
+            
+            # Filter videos, hiding paths whose deletes are still in flight
+            # on the I/O pool so they don't flash back into the grid
+            deleted_paths = st.session_state.setdefault('deleted_paths', set())
+            video_files = [path for path, _, _ in video_entries if str(path) not in deleted_paths]
+            filtered_videos = [v for v in video_files if search.lower() in v.stem.lower()] if search else video_files
+            
+            if filtered_videos:
+                st.write(f"Showing {len(filtered_videos)} videos")
+
+                # Parse all filename timestamps in one vectorized call
+                # instead of strptime per card inside the render loop
+                import pandas as pd
+                stems = ["_".join(v.stem.split("_")[1:3]) for v in filtered_videos]
+                display_times = (
+                    pd.to_datetime(pd.Series(stems), format="%Y%m%d_%H%M%S", errors="coerce")
+                    .dt.strftime("%Y-%m-%d %H:%M:%S")
+                    .fillna("unknown")
+                    .tolist()
+                )
+
+                # Create columns to display videos
+                num_cols = 3
+                videos_per_row = (len(filtered_videos) + num_cols - 1) // num_cols
+                
+                for row in range(videos_per_row):
+                    cols = st.columns(num_cols)
+                    for col_idx in range(num_cols):
+                        video_idx = row * num_cols + col_idx
+                        if video_idx < len(filtered_videos):
+                            with cols[col_idx]:
+                                video_file = filtered_videos[video_idx]
+                                
+                                # Get timestamp from filename (pre-parsed above)
+                                timestamp = video_file.stem.split("_")[1]
+                                formatted_time = display_times[video_idx]
+
+                                # Show a poster thumbnail per card; only the
+                                # clicked video embeds a real <video> player,
+                                # so first paint costs one JPEG per card
+                                # instead of N MP4 header fetches
+                                poster = get_video_poster(video_file)
+                                if st.session_state.get('playing') == str(video_file) or poster is None:
+                                    st.video(str(video_file))
+                                else:
+                                    st.image(poster, use_column_width=True)
+                                    if st.button("Play", key=f"play_{video_idx}"):
+                                        st.session_state.playing = str(video_file)
+                                        st.experimental_rerun()
+                                st.caption(f"Generated on {formatted_time}")
+                                
+                                # Download via Streamlit's static file route:
+                                # a hardlink into ./static costs no disk
+                                # space, and bytes only leave the server when
+                                # the user actually clicks the link — the old
+                                # download_button held every grid MP4 in RAM
+                                static_target = Path("static") / video_file.name
+                                if not static_target.exists():
+                                    try:
+                                        os.link(video_file, static_target)
+                                    except OSError:
+                                        shutil.copy2(video_file, static_target)
+                                st.markdown(
+                                    f'<a href="app/static/{video_file.name}" '
+                                    f'download="youtube_short_{timestamp}.mp4">Download</a>',
+                                    unsafe_allow_html=True
+                                )
+                                
+                                # Delete button; the unlink runs on the I/O
+                                # pool so a slow disk doesn't stall the rerun
+                                if st.button("Delete", key=f"delete_{video_idx}"):
+                                    try:
+                                        deleted_paths.add(str(video_file))
+                                        submit_io(video_file.unlink, missing_ok=True)
+                                        # Drop the static/ hardlink too, or the
+                                        # video stays downloadable and its
+                                        # blocks are never reclaimed
+                                        submit_io(static_target.unlink, missing_ok=True)
+                                        st.success("Video deleted successfully!")
+                                        st.experimental_rerun()
+                                    except Exception as e:
+                                        st.error(f"Error deleting video: {str(e)}")
+            else:
+                st.info("No videos match your search criteria")
+        else:
+            st.info("No generated videos found. Generate a video first!")
+    else:
+        st.info("Output directory doesn't exist yet. Generate a video first!")
+
+
+# Analytics page
+def render_analytics_page():
+    """Render the analytics page"""
+    # Add global perf_config reference
+    global perf_config
+
+    # Heavy chart/dataframe imports stay off the generator hot path;
+    # they only load when this page is visited
+    import pandas as pd
+    import plotly.express as px
+
+    st.markdown("<h2 class='sub-header'>Analytics Dashboard</h2>", unsafe_allow_html=True)
+    
+    analytics = st.session_state.analytics_data
+    
+    if analytics["total_videos"] > 0:
+        # Overview statistics
+        stat1, stat2, stat3, stat4 = st.columns(4)
+        
+        with stat1:
+            st.markdown(f"""
+            <div class='stats-card'>
+                <div class='stats-number'>{analytics["total_videos"]}</div>
+                <div>Total Videos</div>
+            </div>
+            """, unsafe_allow_html=True)
+        
+        with stat2:
+            avg_duration = analytics["total_duration"] / analytics["total_videos"] if analytics["total_videos"] > 0 else 0
+            st.markdown(f"""
+            <div class='stats-card'>
+                <div class='stats-number'>{avg_duration:.1f}s</div>
+                <div>Avg Duration</div>
+            </div>
+            """, unsafe_allow_html=True)
+        
+        with stat3:
+            # Most used theme (idxmax runs in pandas' C kernel)
+            if analytics["by_theme"]:
+                most_used_theme = pd.Series(analytics["by_theme"]).idxmax()
+                st.markdown(f"""
+                <div class='stats-card'>
+                    <div class='stats-number'>{most_used_theme.title()}</div>
+                    <div>Top Theme</div>
+                </div>
+                """, unsafe_allow_html=True)
+            else:
+                st.markdown("""
+                <div class='stats-card'>
+                    <div class='stats-number'>-</div>
+                    <div>Top Theme</div>
+                </div>
+                """, unsafe_allow_html=True)
+        
+        with stat4:
+            # Most used style
+            if analytics["by_style"]:
+                most_used_style = pd.Series(analytics["by_style"]).idxmax()
+                st.markdown(f"""
+                <div class='stats-card'>
+                    <div class='stats-number'>{most_used_style.title()}</div>
+                    <div>Top Style</div>
+                </div>
+                """, unsafe_allow_html=True)
+            else:
+                st.markdown("""
+                <div class='stats-card'>
+                    <div class='stats-number'>-</div>
+                    <div>Top Style</div>
+                </div>
+                """, unsafe_allow_html=True)
+        
+        st.markdown("---")
+        
+        # Charts
+        chart_col1, chart_col2 = st.columns(2)
+        
+        # The figures are pure functions of the counter dicts; cache them on
+        # a frozen tuple of the items so unrelated widget interactions don't
+        # redo the DataFrame build and Plotly trace serialization
+        @st.cache_data(show_spinner=False)
+        def build_theme_pie(items):
+            theme_df = pd.DataFrame(items, columns=['Theme', 'Count'])
+            fig = px.pie(theme_df, values='Count', names='Theme', hole=0.4)
+            fig.update_layout(height=400)
+            return fig
+
+        @st.cache_data(show_spinner=False)
+        def build_style_bar(items):
+            style_df = pd.DataFrame(items, columns=['Style', 'Count'])
+            fig = px.bar(style_df, x='Style', y='Count', color='Style')
+            fig.update_layout(height=400)
+            return fig
+
+        with chart_col1:
+            # Theme chart
+            if analytics["by_theme"]:
+                st.subheader("Videos by Theme")
+                theme_items = tuple(sorted((k.title(), v) for k, v in analytics["by_theme"].items()))
+                st.plotly_chart(build_theme_pie(theme_items), use_container_width=True)
+
+        with chart_col2:
+            # Style chart
+            if analytics["by_style"]:
+                st.subheader("Videos by Content Style")
+                style_items = tuple(sorted((k.title(), v) for k, v in analytics["by_style"].items()))
+                st.plotly_chart(build_style_bar(style_items), use_container_width=True)
+        
+        # History table (streamed lazily from the JSONL log, cached per count)
+        st.subheader("Generation History")
+        history_df = build_history_df(analytics["total_videos"])
+        if not history_df.empty:
+            # Clean up columns for display
+            display_cols = ["timestamp", "title", "idea", "style", "theme", "language", "duration"]
+            display_cols = [col for col in display_cols if col in history_df.columns]
+
+            st.dataframe(
+                history_df[display_cols],
+                use_container_width=True,
+                column_config={
+                    "timestamp": "Generated On",
+                    "title": "Title",
+                    "idea": "Idea",
+                    "style": "Content Style",
+                    "theme": "Visual Theme",
+                    "language": "Language",
+                    "duration": "Duration (s)"
+                }
+            )
+
+        # Pretty-printed export for humans; the on-disk rollup stays compact
+        st.download_button(
+            label="⬇️ Download Analytics (JSON)",
+            data=orjson.dumps(
+                dict(analytics, history=history_df.to_dict(orient="records")),
+                option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS
+            ),
+            file_name="analytics_export.json",
+            mime="application/json"
+        )
+    else:
+        st.info("No analytics data available yet. Generate some videos to see statistics!")
+
+
+# Help page
+def render_help_page():
+    """Render the help page"""
+    # Add global perf_config reference
+    global perf_config
+    
+    st.markdown("<h2 class='sub-header'>Help & Documentation</h2>", unsafe_allow_html=True)
+    
+    # Create tabs for different help sections
+    help_tab1, help_tab2, help_tab3, help_tab4 = st.tabs([
+        "Getting Started", "Content Styles", "Visual Themes", "FAQ"
+    ])
+    
+    with help_tab1:
+        st.markdown("""
+        ### Getting Started
+        
+        #### Step 1: Configure API
+        1. Enter your OpenAI API key in the sidebar
+        2. You need this for generating video content
+        
+        #### Step 2: Create Your First Short
+        1. Navigate to the Generator page
+        2. Enter your video idea in the text field
+        3. Select your preferred content style and visual theme
+        4. Click "Generate YouTube Short"
+        5. Wait for processing - this may take a few minutes
+        6. Preview your video and download it when ready
+        
+        #### Step 3: Customize Your Videos
+        - Try different content styles, visual themes, and languages
+        - Check the "Advanced Options" section for more customization
+        - Upload custom background videos for unique shorts
+        
+        #### Step 4: Track and Analyze
+        - View all your generated videos in the "My Videos" page
+        - Check analytics and statistics in the "Analytics" page
+        - Refine your approach based on what works best
+        """)
+    
+    with help_tab2:
+        st.markdown("""
+        ### Content Styles
+        
+        Each style creates a different type of script:
+        
+        **Educational**
+        - Informative and factual
+        - Focuses on explaining concepts clearly
+        - Includes interesting facts and details
+        
+        **Entertaining**
+        - Fun, engaging, and sometimes humorous
+        - Designed to capture attention and entertain
+        - More casual tone
+        
+        **Storytelling**
+        - Narrative format with beginning, middle, and end
+        - Emotionally engaging content
+        - Character or scenario focused
+        
+        **Tutorial**
+        - Step-by-step instructions
+        - Process or skill focused
+        - Clear, actionable information
+        
+        **Fact List**
+        - Collection of interesting facts
+        - Bite-sized information
+        - Focuses on surprising or lesser-known details
+        
+        **Motivational**
+        - Inspirational tone
+        - Encourages and uplifts the viewer
+        - Often includes quotes or actionable advice
+        """)
+    
+    with help_tab3:
+        st.markdown("""
+        ### Visual Themes
+        
+        The visual theme affects how your video looks:
+        
+        **Default**
+        - Clean, simple design
+        - White text on semi-transparent black background
+        - Balanced and professional
+        
+        **Modern**
+        - Sleek with blue accents
+        - Smooth fade-in animations
+        - Contemporary and clean
+        
+        **Minimalist**
+        - Pure text without backgrounds
+        - Distraction-free design
+        - Focus on content only
+        
+        **Dramatic**
+        - Bold Impact font
+        - Golden text on dark backgrounds
+        - Subtle zoom effects
+        
+        **Retro**
+        - Vintage style with sepia tones
+        - Typewriter-style font
+        - Old-school aesthetic
+        """)
+    
+    with help_tab4:
+        st.markdown("""
+        ### Frequently Asked Questions
+        
+        **Q: How long does it take to generate a video?**
+        
+        A: Generation typically takes 1-5 minutes depending on video length, complexity, and your computer's performance.
+        
+        **Q: What format are the videos saved in?**
+        
+        A: Videos are saved as MP4 files with H.264 encoding, compatible with all major platforms including YouTube.
+        
+        **Q: Do I need FFmpeg installed?**
+        
+        A: Yes, FFmpeg is required for video processing. Make sure it's installed and available in your system path.
+        
+        **Q: Can I use these videos commercially?**
+        
+        A: The videos you generate are yours to use. However, be mindful of copyright if you use custom background videos or music not included with the app.
+        
+        **Q: Where can I get background music?**
+        
+        A: Place MP3 or WAV files in the resources/music directory to use as background music. Make sure you have rights to use any music you add.
+        
+        **Q: How can I improve video quality?**
+        
+        A: For best quality:
+        - Use high-resolution background videos (1080x1920)
+        - Write clear, concise ideas
+        - Select the appropriate content style for your topic
+        - Use custom backgrounds for specific themes
+        """)
+
+
+def render_template_editor_page():
+    """Render the video template editor page"""
+    # Add global perf_config reference
+    global perf_config
+
+    # MoviePy is by far the heaviest import in the app (numpy, imageio,
+    # ffmpeg probing); defer it to the one page that edits clips directly
+    from moviepy.editor import VideoFileClip
+
+    # Helper functions for the template editor
+    def process_video_template(input_path, output_path, start_time, end_time, crop_params, additional_params=None):
+        """Process video template based on parameters"""
+        try:
+            # ffmpeg fast path: probe dimensions from the cached ffprobe
+            # info instead of opening the clip, and run trim, crop, scale
+            # and filters as one filtergraph so decode and encode stay in
+            # ffmpeg's C path. MoviePy below is only the fallback when
+            # ffmpeg is missing or the probe fails.
+            info = get_video_info(input_path) if shutil.which("ffmpeg") else None
+            if info:
+                w, h = info["width"], info["height"]
+                x1, y1, new_w, new_h = compute_crop_rect(w, h, crop_params)
+
+                filters = []
+                if (new_w, new_h) != (w, h):
+                    filters.append(f"crop={new_w}:{new_h}:{x1}:{y1}")
+                if additional_params:
+                    if (additional_params.get("resize_resolution")
+                            and (new_w, new_h) != (1080, 1920)):
+                        filters.append("scale=1080:1920:flags=bicubic")
+                    if additional_params.get("apply_filters"):
+                        # Equivalent of the lum_contrast brightness/contrast fx
+                        filters.append("eq=contrast=1.1:brightness=0.05")
+
+                if (st.session_state.get('template_editor_use_gpu', True)
+                        and GPU_INFO['available']):
+                    codec, preset = perf_config.codec, perf_config.encoding_preset
+                else:
+                    codec, preset = "libx264", "faster"
+
+                os.makedirs(os.path.dirname(output_path), exist_ok=True)
+
+                # When looping, write the processed segment to a temp file
+                # first, then loop it below with stream copy. Cycling frames
+                # in-graph via the loop filter instead would re-encode every
+                # repeated frame and leave audio unlooped; the second pass
+                # here repeats finished packets at remux speed.
+                needs_loop = bool(additional_params and additional_params.get("loop_video"))
+                segment = (os.path.splitext(output_path)[0] + "_segment.mp4"
+                           if needs_loop else output_path)
+
+                # NVDEC decode when targeting NVENC; if scaling is the only
+                # filter, keep frames GPU-resident end-to-end (decode ->
+                # scale_cuda -> encode) and skip the PCIe roundtrip entirely
+                hwaccel = []
+                if codec == 'h264_nvenc':
+                    hwaccel = ["-hwaccel", "cuda", "-hwaccel_device", "0"]
+                    if (filters == ["scale=1080:1920:flags=bicubic"]
+                            and perf_config.ffmpeg_has_filter("scale_cuda")):
+                        hwaccel += ["-hwaccel_output_format", "cuda"]
+                        filters = ["scale_cuda=1080:1920"]
+
+                cmd = ["ffmpeg", "-y", "-v", "error", *hwaccel,
+                       "-ss", str(start_time), "-to", str(end_time),
+                       "-i", input_path]
+                if filters:
+                    cmd += ["-vf", ",".join(filters),
+                            "-c:v", codec, "-preset", preset, "-c:a", "aac"]
+                else:
+                    # Nothing to re-render; remux the trimmed segment
+                    cmd += ["-c", "copy"]
+                cmd.append(segment)
+                subprocess.run(cmd, check=True)
+
+                if needs_loop:
+                    target_duration = additional_params.get("target_duration", 15)
+                    segment_duration = max(0.01, end_time - start_time)
+                    extra_loops = max(0, math.ceil(target_duration / segment_duration) - 1)
+                    subprocess.run(
+                        ["ffmpeg", "-y", "-v", "error",
+                         "-stream_loop", str(extra_loops), "-i", segment,
+                         "-t", str(target_duration), "-c", "copy", output_path],
+                        check=True
+                    )
+                    os.remove(segment)
+                return True
+
+            # Load the video
+            clip = VideoFileClip(input_path)
+
+            # Cut the clip to the selected time segment first so every
+            # downstream filter touches (end-start)*fps frames, not the
+            # full source timeline
+            clip = clip.subclip(start_time, end_time)
+
+            # Apply cropping through the shared rectangle dispatch; one
+            # clip.size read, one crop call for every method
+            w, h = clip.size
+            x1, y1, new_w, new_h = compute_crop_rect(w, h, crop_params)
+            if (new_w, new_h) != (w, h):
+                clip = clip.crop(x1=x1, y1=y1, width=new_w, height=new_h)
+
+            # Apply additional processing. Pixel-touching work goes into
+            # the encoder's -vf chain (libavfilter's SIMD C path) instead
+            # of per-frame numpy transforms in the MoviePy generator
+            loop_target = None
+            extra_vf = []
+            if additional_params:
+                # Resize to shorts format (9:16) via libswscale, directly
+                # on YUV — clip.resize would do an RGB+PIL roundtrip per frame
+                if additional_params.get("resize_resolution", False):
+                    extra_vf.append("scale=1080:1920:flags=bicubic")
+
+                # Apply basic filters
+                if additional_params.get("apply_filters", False):
+                    # Apply GPU-accelerated effects if available
+                    if st.session_state.get('template_editor_use_gpu', True) and GPU_INFO['available']:
+                        from src.video_editor import apply_gpu_effect
+                        clip = apply_gpu_effect(clip, "colorx")
+                    else:
+                        # Equivalent of vfx.lum_contrast, evaluated in the
+                        # encoder instead of interpreted per frame
+                        extra_vf.append("eq=contrast=1.1:brightness=0.05")
+
+                # Looping is deferred to ffmpeg below: -stream_loop repeats
+                # packets at the muxer level instead of re-decoding every
+                # iteration through concatenate_videoclips
+                if additional_params.get("loop_video", False):
+                    target_duration = additional_params.get("target_duration", 15)
+                    if clip.duration < target_duration:
+                        loop_target = target_duration
+
+            # Ensure output directory exists
+            os.makedirs(os.path.dirname(output_path), exist_ok=True)
+            
+            # Get codec and ffmpeg params based on GPU availability
+            use_gpu = st.session_state.get('template_editor_use_gpu', True)
+            if use_gpu and GPU_INFO['available']:
+                logger.info(f"Using GPU acceleration with {GPU_INFO['vendor']} GPU")
+                encoding_params = perf_config.get_moviepy_params()
+            else:
+                logger.info("Using CPU processing")
+                encoding_params = {
+                    'codec': 'libx264',
+                    'audio_codec': 'aac',
+                    'temp_audiofile': 'temp-audio.m4a',
+                    'remove_temp': True,
+                    'fps': 30,
+                    'preset': 'ultrafast',
+                    'threads': perf_config.optimal_threads
+                }
+
+            if extra_vf:
+                encoding_params['ffmpeg_params'] = (
+                    (encoding_params.get('ffmpeg_params') or [])
+                    + ['-vf', ",".join(extra_vf)]
+                )
+
+            segment_duration = max(0.01, clip.duration)
+            try:
+                try:
+                    # Write the processed video
+                    clip.write_videofile(
+                        output_path,
+                        **encoding_params
+                    )
+                except Exception as encoding_error:
+                    logger.warning(f"Error with selected encoder: {str(encoding_error)}. Falling back to CPU encoding.")
+                    # Fallback to CPU encoding if GPU encoding fails
+                    fallback_params = {
+                        'codec': 'libx264',
+                        'audio_codec': 'aac',
+                        'temp_audiofile': 'temp-audio.m4a',
+                        'remove_temp': True,
+                        'fps': 30,
+                        'preset': 'medium'
+                    }
+                    if extra_vf:
+                        fallback_params['ffmpeg_params'] = ['-vf', ",".join(extra_vf)]
+                    clip.write_videofile(
+                        output_path,
+                        **fallback_params
+                    )
+            finally:
+                # Release the decoder readers even when both passes fail;
+                # a leaked reader holds an ffmpeg process and its buffers
+                # across the retry
+                clip.close()
+
+            # Repeat the written segment up to the target duration with a
+            # stream copy; no frame is decoded again
+            if loop_target is not None:
+                segment = os.path.splitext(output_path)[0] + "_segment.mp4"
+                os.replace(output_path, segment)
+                extra_loops = max(0, math.ceil(loop_target / segment_duration) - 1)
+                subprocess.run(
+                    ["ffmpeg", "-y", "-v", "error",
+                     "-stream_loop", str(extra_loops), "-i", segment,
+                     "-t", str(loop_target), "-c", "copy", output_path],
+                    check=True
+                )
+                os.remove(segment)
+            return True
+            
+        except Exception as e:
+            print(f"Error processing video: {str(e)}")
+            raise e
+    
+    st.title("🎬 Video Template Editor")
+    st.subheader("Create custom video templates for your shorts")
+    
+    col1, col2 = st.columns([2, 1])
+    
+    with col1:
+        # Video file uploader
+        uploaded_video = st.file_uploader(
+            "Upload Video", 
+            type=["mp4", "mov", "avi"], 
+            help="Upload a video file to create a template"
+        )
+        
+        # Video preview and controls
+        if uploaded_video is not None:
+            # Save uploaded video to temp file
+            temp_video_path = os.path.join("temp", "temp_upload.mp4")
+            os.makedirs("temp", exist_ok=True)
+            
+            # Stream the upload in MB-sized chunks; getbuffer() would
+            # materialize the whole file in RAM a second time
+            uploaded_video.seek(0)
+            with open(temp_video_path, "wb") as f:
+                shutil.copyfileobj(uploaded_video, f, 4 << 20)
+            
+            # Display video
+            st.video(temp_video_path)
+            
+            # Video information. get_video_info returns None when ffprobe
+            # is missing or the probe fails; fall back to a MoviePy reader
+            # there (imageio-ffmpeg bundles its own binary) so the page
+            # still works on machines without a system ffmpeg.
+            video_info = get_video_info(temp_video_path)
+            if video_info is None:
+                try:
+                    with VideoFileClip(temp_video_path) as probe_clip:
+                        video_info = {
+                            "duration": probe_clip.duration,
+                            "width": probe_clip.w,
+                            "height": probe_clip.h,
+                            "fps": probe_clip.fps
+                        }
+                except Exception as e:
+                    st.error(f"Could not read video metadata: {str(e)}")
+            if video_info:
+                st.info(f"Duration: {video_info['duration']:.2f}s | Resolution: {video_info['width']}x{video_info['height']}")
+        else:
+            st.info("Upload a video to start editing")
+    
+    with col2:
+        st.subheader("Editing Controls")
+        
+        template_name = st.text_input(
+            "Template Name",
+            value="custom_template",
+            help="Enter a name for your template (no spaces or special characters)"
+        )
+        
+        # Replace any spaces or special characters
+        template_name = "".join(c if c.isalnum() or c == '_' else '_' for c in template_name)
+        
+        # Crop settings
+        st.markdown("### Video Crop")
+        crop_option = st.radio(
+            "Crop Method",
+            options=["Center", "Top", "Bottom", "Left", "Right", "Custom"],
+            index=0
+        )
+        
+        if crop_option == "Custom":
+            st.markdown("#### Custom Crop Settings")
+            # For simplicity, we'll use sliders to adjust crop percentage
+            top_crop = st.slider("Crop from Top (%)", 0, 100, 0)
+            bottom_crop = st.slider("Crop from Bottom (%)", 0, 100, 0)
+            left_crop = st.slider("Crop from Left (%)", 0, 100, 0)
+            right_crop = st.slider("Crop from Right (%)", 0, 100, 0)
+        
+        # Time segment settings
+        st.markdown("### Time Settings")
+        
+        if uploaded_video is not None and video_info:
+            max_duration = video_info['duration']
+            start_time = st.slider("Start Time (seconds)", 0.0, max(0.1, max_duration-1), 0.0)
+            end_time = st.slider("End Time (seconds)", min(start_time + 0.1, max_duration), max_duration, max_duration)
+            
+            st.info(f"Selected Duration: {end_time - start_time:.2f}s")
+        else:
+            st.slider("Start Time (seconds)", 0.0, 10.0, 0.0, disabled=True)
+            st.slider("End Time (seconds)", 0.0, 10.0, 10.0, disabled=True)
+            
+        # Additional settings
+        with st.expander("Advanced Settings"):
+            col1, col2 = st.columns(2)
+            
+            with col1:
+                resize_resolution = st.checkbox("Resize to Shorts Format (9:16)", value=True)
+                apply_filters = st.checkbox("Apply Basic Enhancement (Brightness/Contrast)", value=False)
+                
+                # Add GPU acceleration option
+                use_gpu = st.checkbox("Use GPU Acceleration", 
+                                    value=True,
+                                    help="Enable GPU acceleration for faster video processing (requires NVIDIA or AMD GPU)")
+                
+                # Display GPU info if available
+                if GPU_INFO['available']:
+                    st.caption(f"Detected GPU: {GPU_INFO['model'] or GPU_INFO['vendor'].upper()}")
+                else:
+                    st.caption("No compatible GPU detected")
+            
+            with col2:
+                loop_video = st.checkbox("Loop to Target Duration", value=False)
+                
+                if loop_video:
+                    target_duration = st.slider("Target Duration (seconds)", 
+                                              min_value=5, 
+                                              max_value=60, 
+                                              value=15)
+            
+            # Store GPU acceleration setting in session state
+            st.session_state.template_editor_use_gpu = use_gpu
+            
+        # Process button
+        if uploaded_video is not None:
+            process_button = st.button("Process Template", type="primary", use_container_width=True)
+            
+            if process_button:
+                with st.spinner("Processing video template..."):
+                    try:
+                        # Determine output path
+                        output_path = os.path.join("templates", f"{template_name}.mp4")
+                        
+                        # Process the video based on settings
+                        if crop_option == "Custom":
+                            crop_params = {
+                                "top": top_crop / 100,
+                                "bottom": bottom_crop / 100,
+                                "left": left_crop / 100,
+                                "right": right_crop / 100
+                            }
+                        else:
+                            crop_params = {"method": crop_option.lower()}
+                        
+                        # Additional parameters based on settings
+                        additional_params = {
+                            "resize_resolution": resize_resolution,
+                            "apply_filters": apply_filters,
+                            "loop_video": loop_video
+                        }
+                        
+                        if loop_video:
+                            additional_params["target_duration"] = target_duration
+                        
+                        # Call the process function
+                        result = process_video_template(
+                            temp_video_path,
+                            output_path,
+                            start_time,
+                            end_time,
+                            crop_params,
+                            additional_params
+                        )
+                        
+                        if result:
+                            st.success(f"Template '{template_name}' created successfully!")
+                            # Refresh template list
+                            get_available_templates.clear()
+                            list_template_files.clear()
+                            st.session_state.templates_refreshed = True
+                    except Exception as e:
+                        st.error(f"Error processing template: {str(e)}")
+        else:
+            st.button("Process Template", disabled=True, use_container_width=True)
+    
+    # List of existing templates
+    st.markdown("---")
+    st.subheader("Existing Templates")
+    
+    templates = get_available_templates()
+    template_files = list_template_files()
+    if templates:
+        template_cols = st.columns(4)
+
+        for i, template in enumerate(templates):
+            with template_cols[i % 4]:
+                st.markdown(f"**{template.replace('_', ' ').title()}**")
+
+                # Resolve against the cached scandir map instead of a
+                # per-template exists() stat each rerun
+                template_path = template_files.get(template, (None, None))[0]
+                if template_path:
+                    # Thumbnail by default; only the clicked template embeds
+                    # a full <video> element in the page payload
+                    thumb = get_template_thumbnail(template_path)
+                    if st.session_state.get('playing_template') == template or thumb is None:
+                        st.video(template_path, start_time=0)
+                    else:
+                        st.image(thumb, use_column_width=True)
+                        if st.button("Play", key=f"play_tmpl_{template}"):
+                            st.session_state.playing_template = template
+                            st.experimental_rerun()
+
+
+                    # Add delete button
+                    if template != "default" and st.button(f"Delete {template}", key=f"del_{template}"):
+                        try:
+                            os.remove(template_path)
+                            get_available_templates.clear()
+                            list_template_files.clear()
+                            st.success(f"Template '{template}' deleted!")
+                            st.experimental_rerun()
+                        except Exception as e:
+                            st.error(f"Error deleting template: {str(e)}")
+    else:
+        st.info("No templates found. Create your first template using the editor above.")
+
+
+def process_csv_sequentially(csv_chunks, output_dir):
+    """Process CSV data as a two-stage pipeline (fallback method)
+
+    Prep (content, TTS, background, captions) for row i+1 runs on the
+    shared I/O pool while row i's final encode holds the main thread, so
+    the network-bound and ffmpeg-bound stages overlap instead of leaving
+    cores idle. Streamlit widgets are only touched from the main thread.
+
+    Args:
+        csv_chunks (iterable): Iterable of DataFrame chunks with video
+            generation instructions (see iter_csv_chunks)
+        output_dir (str): Directory to save output files
+    """
+    # Record start time
+    start_time = time.time()
+
+    # One timestamp per batch; the index prefix keeps IDs unique even when
+    # cached content makes an iteration finish in under a second
+    base_ts = datetime.now().strftime("%Y%m%d%H%M%S")
+
+    def prep_stages(i, row):
+        """Run every pre-encode stage for one row and return its context"""
+        video_id = f"{i+1}_{base_ts}"
+        output_base = f"{output_dir}/video_{video_id}"
+
+        script, title, hook = cached_generate_content(
+            row.topic,
+            150,  # Use a fixed value for batch processing
+            row.content_style
+        )
+
+        # Background generation doesn't depend on the narration, so it
+        # overlaps the TTS and captions writes on the I/O pool
+        background_path = f"{output_base}_background.mp4"
+        background_future = submit_io(
+            create_video,
+            background_path,
+            duration=int(row.duration),
+            template_name=row.template_name
+        )
+
+        audio_path = f"{output_base}_audio.mp3"
+        convert_text_to_speech(script, audio_path, language=row.language)
+
+        captions_path = f"{output_base}_captions.json"
+        create_captions(script, audio_path, captions_path)
+
+        # Ensure the background file is flushed before final assembly
+        background_future.result()
+
+        return {
+            "video_id": video_id,
+            "script": script,
+            "background_path": background_path,
+            "audio_path": audio_path,
+            "captions_path": captions_path,
+            "output_path": f"{output_base}_final.mp4",
+        }
+
+    # Stream rows chunk by chunk, keeping one row's prep in flight ahead
+    # of the encode
+    csv_rows = enumerate(row for chunk in csv_chunks
+                         for row in chunk.itertuples(index=False, name='Job'))
+
+    def next_prep():
+        """Kick off prep for the next row, or None at end of input"""
+        nxt = next(csv_rows, None)
+        if nxt is None:
+            return None
+        return (*nxt, get_io_pool().submit(prep_stages, *nxt))
+
+    progress_text = st.empty()
+    pending = next_prep()
+    while pending is not None:
+        i, row, prep_future = pending
+        with st.spinner(f"Generating video {i+1}: {row.topic}"):
+            try:
+                ctx = prep_future.result()
+
+                # Start the next row's prep before encoding this one so
+                # the stages overlap
+                pending = next_prep()
+
+                progress_text.text(f"Creating final video {i+1}: {row.topic}")
+                create_final_video(
+                    ctx["background_path"],
+                    ctx["audio_path"],
+                    ctx["captions_path"],
+                    ctx["output_path"],
+                    theme=row.visual_theme,
+                    add_music=True,
+                    add_intro=True,
+                    add_outro=True
+                )
+
+                # Update analytics
+                video_data = {
+                    "id": ctx["video_id"],
+                    "topic": row.topic,
+                    "style": row.content_style,
+                    "language": row.language,
+                    "duration": int(row.duration),
+                    "theme": row.visual_theme,
+                    "words": len(ctx["script"].split()),
+                    "template": row.template_name,
+                    "timestamp": datetime.now().isoformat(),
+                    "path": ctx["output_path"]
+                }
+                update_analytics(video_data)
+
+                # Success message
+                progress_text.text(f"Video {i+1} completed: {row.topic}")
+
+            except Exception as e:
+                # If prep itself failed, the next row hasn't been kicked
+                # off yet; do it now so the pipeline keeps moving
+                if pending is not None and pending[0] == i:
+                    pending = next_prep()
+                st.error(f"Error generating video {i+1}: {str(e)}")
+    
+    # Display completion message
+    end_time = time.time()
+    elapsed_time = end_time - start_time
+    st.success(f"Sequential batch processing completed in {elapsed_time:.2f} seconds!")
+    
+    # Display video links
+    st.markdown("### Generated Videos")
+    st.markdown("The following videos have been generated:")
+    
+    for file in os.listdir(output_dir):
+        if file.endswith("_final.mp4"):
+            video_path = os.path.join(output_dir, file)
+            st.video(video_path)
+
+
+# Main application
+def main():
+    """Main execution function"""
+    # Initialize session state
+    initialize_session_state()
+    
+    # Render header
+    render_header()
+    
+    # Render sidebar
+    render_sidebar()
+    
+    # Render appropriate page based on navigation state
+    if st.session_state.page == "generate":
+        render_generator_page()
+    elif st.session_state.page == "videos":
+        render_videos_page()
+    elif st.session_state.page == "analytics":
+        render_analytics_page()
+    elif st.session_state.page == "help":
+        render_help_page()
+    elif st.session_state.page == "template_editor":
+        render_template_editor_page()
+
+
+if __name__ == "__main__":
     main() 
\ No newline at end of file
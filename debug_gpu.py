@@ -4,15 +4,96 @@ GPU Detection Debug Tool
 This script helps identify if your GPU is properly detected and configured for the application.
 """
 
+import os
+import shutil
 import subprocess
 import platform
 import logging
 import sys
 
-logging.basicConfig(level=logging.DEBUG, 
+logging.basicConfig(level=logging.DEBUG,
                     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger('gpu-debug')
 
+# probe_nvenc results keyed by (ffmpeg path, mtime) so repeated runs in one
+# process skip the subprocess
+_NVENC_CACHE = {}
+
+def probe_nvenc():
+    """Check which NVIDIA codecs the linked ffmpeg binary actually supports
+
+    Vendor detection only says a GPU is present; whether encodes can use it
+    depends on the ffmpeg build, so ask ffmpeg itself.
+
+    Returns:
+        dict: Flags for h264_nvenc, hevc_nvenc and h264_cuvid support
+    """
+    ffmpeg_path = shutil.which('ffmpeg')
+    if ffmpeg_path is None:
+        return {'h264_nvenc': False, 'hevc_nvenc': False, 'h264_cuvid': False}
+
+    key = (ffmpeg_path, os.path.getmtime(ffmpeg_path))
+    if key in _NVENC_CACHE:
+        return _NVENC_CACHE[key]
+
+    try:
+        encoders = subprocess.run(
+            [ffmpeg_path, '-hide_banner', '-encoders'],
+            capture_output=True, timeout=5
+        ).stdout
+        decoders = subprocess.run(
+            [ffmpeg_path, '-hide_banner', '-decoders'],
+            capture_output=True, timeout=5
+        ).stdout
+    except Exception as e:
+        logger.error(f"Error probing ffmpeg codecs: {e}")
+        encoders = decoders = b''
+
+    result = {
+        'h264_nvenc': b'h264_nvenc' in encoders,
+        'hevc_nvenc': b'hevc_nvenc' in encoders,
+        'h264_cuvid': b'h264_cuvid' in decoders,
+    }
+    _NVENC_CACHE[key] = result
+    return result
+
+def nvml_probe():
+    """Query NVIDIA GPUs straight from the NVML driver library
+
+    One C call per field instead of shelling out to vendor tools; answers
+    in milliseconds and works on every platform with an NVIDIA driver.
+
+    Returns:
+        list: One dict per GPU with model and memory, or None when pynvml
+            is missing or no NVIDIA driver is loaded
+    """
+    try:
+        import pynvml
+    except ImportError:
+        return None
+
+    try:
+        pynvml.nvmlInit()
+    except Exception:
+        # No NVIDIA driver on this machine
+        return None
+
+    try:
+        gpus = []
+        for i in range(pynvml.nvmlDeviceGetCount()):
+            handle = pynvml.nvmlDeviceGetHandleByIndex(i)
+            name = pynvml.nvmlDeviceGetName(handle)
+            if isinstance(name, bytes):
+                name = name.decode()
+            memory = pynvml.nvmlDeviceGetMemoryInfo(handle)
+            gpus.append({'model': name, 'mem_mb': memory.total >> 20})
+        return gpus
+    except Exception as e:
+        logger.error(f"Error querying NVML: {e}")
+        return None
+    finally:
+        pynvml.nvmlShutdown()
+
 def detect_windows_gpu():
     """Detect GPU on Windows systems"""
     logger.info("Running Windows GPU detection...")
@@ -36,53 +117,25 @@ def detect_windows_gpu():
         else:
             logger.warning("No recognized dedicated GPU vendor detected")
         
-        # Test DirectX information
-        try:
-            dxdiag = subprocess.check_output(
-                "powershell -Command \"dxdiag /t dxinfo.txt\"", 
-                shell=True
-            )
-            
-            # Wait a bit for the file to be written
-            import time
-            time.sleep(2)
-            
-            # Read the DXDiag output
-            if os.path.exists("dxinfo.txt"):
-                with open("dxinfo.txt", "r") as f:
-                    dx_content = f.read()
-                
-                print("\nDirectX Information:")
-                
-                # Extract relevant GPU sections
-                display_sections = []
-                current_section = []
-                in_display_section = False
-                
-                for line in dx_content.split('\n'):
-                    if line.startswith("-------------"):
-                        if in_display_section:
-                            display_sections.append("\n".join(current_section))
-                        current_section = []
-                        in_display_section = False
-                    elif line.startswith("Display Devices"):
-                        in_display_section = True
-                        current_section.append(line)
-                    elif in_display_section:
-                        current_section.append(line)
-                
-                # Print display sections
-                for section in display_sections:
-                    print(section)
-                    print("\n" + "-"*80 + "\n")
-                
-                # Clean up
-                os.remove("dxinfo.txt")
-            else:
-                logger.warning("DXDiag output file not found")
-        except Exception as e:
-            logger.error(f"Error running DXDiag: {e}")
-    
+        # What matters for encoding is the ffmpeg build, not DirectX; ask
+        # ffmpeg which NVIDIA codecs it was linked with
+        nvenc = probe_nvenc()
+        print("\nffmpeg NVIDIA codec support:")
+        for name, supported in nvenc.items():
+            print(f"{name}: {supported}")
+
+        if 'nvidia' in output_lower:
+            try:
+                smi = subprocess.run(
+                    ["nvidia-smi", "--query-gpu=name,driver_version",
+                     "--format=csv,noheader"],
+                    capture_output=True, text=True, timeout=5
+                ).stdout.strip()
+                if smi:
+                    print(f"\nnvidia-smi: {smi}")
+            except Exception as e:
+                logger.error(f"Error running nvidia-smi: {e}")
+
     except Exception as e:
         logger.error(f"Error during Windows GPU detection: {e}")
 
@@ -91,15 +144,25 @@ def main():
     logger.info("Starting GPU detection debug process")
     logger.info(f"Operating System: {platform.system()} {platform.release()}")
     
-    if platform.system() == "Windows":
+    # NVML answers in milliseconds on any platform with an NVIDIA driver;
+    # only fall back to the Windows vendor-tool scraping without it
+    gpus = nvml_probe()
+    if gpus is not None:
+        print("\nNVML GPU Information:")
+        for gpu in gpus:
+            print(f"{gpu['model']} ({gpu['mem_mb']} MB)")
+        nvenc = probe_nvenc()
+        print("\nffmpeg NVIDIA codec support:")
+        for name, supported in nvenc.items():
+            print(f"{name}: {supported}")
+    elif platform.system() == "Windows":
         detect_windows_gpu()
     else:
-        logger.info("This debug script currently only supports Windows. Please add appropriate detection for your OS.")
+        logger.info("NVML unavailable and no detection path for this OS; install pynvml for direct driver queries.")
     
     # Try to import our performance config
     logger.info("Testing application's built-in GPU detection...")
     try:
-        import os
         # Add the current directory to the path if not already there
         if os.getcwd() not in sys.path:
             sys.path.append(os.getcwd())
@@ -124,5 +187,4 @@ def main():
     logger.info("GPU detection debug completed")
 
 if __name__ == "__main__":
-    import os
-    main() 
\ No newline at end of file
+    main()
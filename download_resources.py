@@ -6,10 +6,13 @@ Downloads sample background videos and music for YouTube shorts
 
 import os
 import sys
+import shutil
 import requests
 import zipfile
 import logging
 import argparse
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 
 # Configure logging
@@ -31,44 +34,95 @@ VIDEO_DIR = os.path.join(DEFAULT_RESOURCES_DIR)
 MUSIC_DIR = os.path.join(DEFAULT_RESOURCES_DIR, "music")
 
 
+class _ProgressFile:
+    """File wrapper that prints download progress every 64 MiB written
+
+    Printing on every chunk makes the console the bottleneck for large
+    downloads; throttling to 64 MiB intervals keeps the progress visible
+    while the copy loop stays I/O bound.
+    """
+
+    def __init__(self, file, total_size):
+        self._file = file
+        self._total_size = total_size
+        self.downloaded = 0
+        self._last_bucket = -1
+
+    def write(self, data):
+        written = self._file.write(data)
+        self.downloaded += len(data)
+        bucket = self.downloaded >> 26  # 64 MiB intervals
+        if bucket != self._last_bucket:
+            self._last_bucket = bucket
+            progress = (self.downloaded / self._total_size) * 100 if self._total_size > 0 else 0
+            sys.stdout.write(
+                f"\rDownloading: {progress:.1f}% "
+                f"({self.downloaded/(1024*1024):.1f} MB / {self._total_size/(1024*1024):.1f} MB)"
+            )
+            sys.stdout.flush()
+        return written
+
+
 def download_file(url, target_path):
     """
     Download a file from URL to target path with progress
-    
+
     Args:
         url (str): URL to download
         target_path (str): Path to save the file
-        
+
     Returns:
         bool: True if successful, False otherwise
     """
     try:
-        response = requests.get(url, stream=True)
+        # Send the ETag from the previous download so an unchanged
+        # resource answers 304 and skips the whole transfer
+        etag_path = target_path + '.etag'
+        headers = {}
+        if os.path.exists(etag_path):
+            with open(etag_path, 'r') as f:
+                etag = f.read().strip()
+            if etag:
+                headers['If-None-Match'] = etag
+
+        response = requests.get(url, stream=True, headers=headers)
+        if response.status_code == 304:
+            logger.info(f"{url} unchanged since last download, skipping")
+            return True
         response.raise_for_status()
-        
+
         # Get file size for progress
         total_size = int(response.headers.get('content-length', 0))
-        downloaded = 0
-        
+
+        # An existing file of the advertised size is already complete;
+        # close the stream without reading the body
+        if (total_size > 0 and os.path.exists(target_path)
+                and os.path.getsize(target_path) == total_size):
+            response.close()
+            logger.info(f"{target_path} already matches the remote size, skipping")
+            return True
+
         # Create target directory if it doesn't exist
         os.makedirs(os.path.dirname(target_path), exist_ok=True)
-        
-        # Download with progress
+
+        # Stream straight from the socket in 1 MiB blocks instead of
+        # enumerating 8 KiB chunks in Python; decode_content keeps any
+        # gzip transfer encoding handled by urllib3
+        response.raw.decode_content = True
         with open(target_path, 'wb') as file:
-            for chunk in response.iter_content(chunk_size=8192):
-                file.write(chunk)
-                downloaded += len(chunk)
-                
-                # Calculate progress percentage
-                progress = (downloaded / total_size) * 100 if total_size > 0 else 0
-                
-                # Print progress
-                sys.stdout.write(f"\rDownloading: {progress:.1f}% ({downloaded/(1024*1024):.1f} MB / {total_size/(1024*1024):.1f} MB)")
-                sys.stdout.flush()
-        
+            writer = _ProgressFile(file, total_size)
+            shutil.copyfileobj(response.raw, writer, length=1 << 20)
+
         print()  # New line after progress is complete
+
+        # Remember the ETag so the next run can revalidate with a 304
+        new_etag = response.headers.get('ETag', '')
+        if new_etag:
+            with open(etag_path, 'w') as f:
+                f.write(new_etag)
+
         return True
-    
+
     except Exception as e:
         logger.error(f"Error downloading {url}: {str(e)}")
         return False
@@ -91,19 +145,50 @@ def extract_zip(zip_path, extract_to):
         # Create target directory if it doesn't exist
         os.makedirs(extract_to, exist_ok=True)
         
-        # Extract zip
+        # Read the member list once, then inflate in parallel. zlib and the
+        # file I/O both release the GIL, so extraction scales with cores;
+        # each thread opens its own ZipFile because a shared handle
+        # serializes every read on an internal lock.
         with zipfile.ZipFile(zip_path, 'r') as zip_ref:
-            # Get total number of files
-            total_files = len(zip_ref.infolist())
-            
-            # Extract with progress
-            for i, file in enumerate(zip_ref.infolist()):
-                zip_ref.extract(file, extract_to)
-                
-                # Print progress
-                sys.stdout.write(f"\rExtracting: {i+1}/{total_files} files")
-                sys.stdout.flush()
-                
+            infolist = zip_ref.infolist()
+
+        # Create the directory tree up front: ZipFile.extract's own
+        # makedirs is not concurrency-safe, and two threads materializing
+        # the same parent directory race into FileExistsError. Only file
+        # members are then submitted to the pool.
+        file_members = []
+        for member in infolist:
+            if member.is_dir():
+                os.makedirs(os.path.join(extract_to, member.filename), exist_ok=True)
+            else:
+                parent = os.path.dirname(member.filename)
+                if parent:
+                    os.makedirs(os.path.join(extract_to, parent), exist_ok=True)
+                file_members.append(member)
+        total_files = len(file_members)
+
+        thread_local = threading.local()
+        handles = []
+
+        def extract_member(member):
+            if not hasattr(thread_local, 'zip_ref'):
+                thread_local.zip_ref = zipfile.ZipFile(zip_path, 'r')
+                handles.append(thread_local.zip_ref)
+            thread_local.zip_ref.extract(member, extract_to)
+
+        try:
+            with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+                futures = [executor.submit(extract_member, m) for m in file_members]
+                for done, future in enumerate(as_completed(futures), start=1):
+                    future.result()
+
+                    # Print progress
+                    sys.stdout.write(f"\rExtracting: {done}/{total_files} files")
+                    sys.stdout.flush()
+        finally:
+            for handle in handles:
+                handle.close()
+
         print()  # New line after progress is complete
         logger.info(f"Successfully extracted {total_files} files")
         return True
@@ -120,35 +205,43 @@ def process_extracted_files(directory):
     Args:
         directory (str): Directory to process
     """
-    # Walk through extracted files and move them to root directory
-    for root, dirs, files in os.walk(directory):
-        # Skip the root directory
-        if root == directory:
-            continue
-            
-        for file in files:
-            source_file = os.path.join(root, file)
-            target_file = os.path.join(directory, file)
-            
-            # Skip if file exists
-            if os.path.exists(target_file):
-                continue
-                
-            # Move file
-            try:
-                os.rename(source_file, target_file)
-            except Exception as e:
-                logger.error(f"Error moving {source_file}: {str(e)}")
-    
-    # Remove empty directories
-    for root, dirs, files in os.walk(directory, topdown=False):
-        for dir_name in dirs:
+    # One scandir-based pass does both jobs: each directory's entries are
+    # read once (type comes from the dirent, no extra stat per entry),
+    # files are moved up, and emptied directories are removed on the way
+    # back out of the recursion
+    def _flatten(root):
+        with os.scandir(root) as it:
+            entries = list(it)
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                _flatten(entry.path)
+                try:
+                    os.rmdir(entry.path)
+                except OSError:
+                    # Not empty: something could not be moved out of it
+                    pass
+            else:
+                target_file = os.path.join(directory, entry.name)
+
+                # Skip if file exists
+                if os.path.exists(target_file):
+                    continue
+
+                # Move file
+                try:
+                    os.rename(entry.path, target_file)
+                except Exception as e:
+                    logger.error(f"Error moving {entry.path}: {str(e)}")
+
+    with os.scandir(directory) as it:
+        top_level = list(it)
+    for entry in top_level:
+        if entry.is_dir(follow_symlinks=False):
+            _flatten(entry.path)
             try:
-                dir_path = os.path.join(root, dir_name)
-                if not os.listdir(dir_path):  # Check if directory is empty
-                    os.rmdir(dir_path)
-            except Exception as e:
-                logger.error(f"Error removing directory {dir_path}: {str(e)}")
+                os.rmdir(entry.path)
+            except OSError:
+                pass
 
 
 def download_resources(resource_type):
@@ -177,6 +270,11 @@ def download_resources(resource_type):
         # Download zip file
         zip_path = os.path.join(target_dir, f"{res_type}.zip")
         if download_file(url, zip_path):
+            # A 304 revalidation leaves no zip behind; the previous run
+            # already extracted it
+            if not os.path.exists(zip_path):
+                logger.info(f"{res_type} already up to date")
+                continue
             # Extract zip file
             if extract_zip(zip_path, target_dir):
                 # Process extracted files
@@ -198,6 +296,8 @@ def download_resources(resource_type):
 
 def main():
     """Main execution function"""
+    global DEFAULT_RESOURCES_DIR, VIDEO_DIR, MUSIC_DIR
+
     parser = argparse.ArgumentParser(description="Download resources for YouTube Shorts Generator")
     parser.add_argument(
         "--resource", 
@@ -216,7 +316,6 @@ def main():
     args = parser.parse_args()
     
     # Update global variables based on output directory
-    global DEFAULT_RESOURCES_DIR, VIDEO_DIR, MUSIC_DIR
     DEFAULT_RESOURCES_DIR = args.output_dir
     VIDEO_DIR = os.path.join(DEFAULT_RESOURCES_DIR)
     MUSIC_DIR = os.path.join(DEFAULT_RESOURCES_DIR, "music")
@@ -3,28 +3,181 @@ Dependencies installer for GPU-accelerated video processing
 """
 import os
 import sys
+import glob
+import json
+import shutil
+import hashlib
+import functools
 import subprocess
 import platform
 
-def install_package(package, upgrade=False):
-    """Install a package using pip"""
-    cmd = [sys.executable, "-m", "pip", "install"]
+def _get_cache_dir():
+    """Return the persistent pip cache directory, creating it if needed
+
+    A stable cache path means repeated installs (CI, container rebuilds)
+    reuse downloaded wheels instead of re-fetching hundreds of MB.
+    """
+    cache_dir = os.environ.get("PIP_CACHE_DIR",
+                               os.path.expanduser("~/.cache/yt-shorts-pip"))
+    os.makedirs(cache_dir, exist_ok=True)
+    return cache_dir
+
+def install_packages(packages, upgrade=False, index_url=None):
+    """Install a batch of packages with a single installer invocation
+
+    One process resolves the whole batch together, instead of paying the
+    interpreter spawn and resolver run once per package. When uv is on
+    PATH it is preferred: it resolves in native code and downloads the
+    batch's wheels in parallel, so the big torch bundle takes roughly the
+    time of its slowest wheel instead of their sum. pip serializes
+    downloads but remains the fallback everywhere.
+    """
+    uv = shutil.which("uv")
+    if uv:
+        cmd = [uv, "pip", "install", "--python", sys.executable]
+    else:
+        cmd = [sys.executable, "-m", "pip", "install",
+               "--cache-dir", _get_cache_dir()]
     if upgrade:
         cmd.append("--upgrade")
-    cmd.append(package)
-    
+    if index_url:
+        cmd += ["--index-url", index_url]
+    cmd.extend(packages)
+
     try:
         subprocess.check_call(cmd)
-        print(f"Successfully installed {package}")
+        print(f"Successfully installed {', '.join(packages)}")
         return True
     except subprocess.CalledProcessError:
-        print(f"Failed to install {package}")
+        print(f"Failed to install: {', '.join(packages)}")
+        return False
+
+def _nvml_gpu_present():
+    """Confirm an NVIDIA GPU through the NVML driver library
+
+    A direct library query instead of forking nvidia-smi; it also rules
+    out machines with a leftover nvidia-smi binary but no driver.
+    """
+    try:
+        import pynvml
+    except ImportError:
+        return False
+    try:
+        pynvml.nvmlInit()
+    except Exception:
+        return False
+    try:
+        return pynvml.nvmlDeviceGetCount() > 0
+    except Exception:
         return False
+    finally:
+        pynvml.nvmlShutdown()
+
+def _sysfs_gpu_vendor():
+    """Read display-class PCI vendor IDs straight from sysfs (Linux)
+
+    One open+read per PCI device, no subprocess. Returns 'nvidia', 'amd',
+    'cpu' when only other display hardware is present, or None when
+    nothing could be read (non-Linux or no sysfs).
+    """
+    vendors = []
+    for device in glob.glob("/sys/bus/pci/devices/*"):
+        try:
+            with open(os.path.join(device, "class")) as f:
+                if not f.read().startswith("0x03"):  # display controllers
+                    continue
+            with open(os.path.join(device, "vendor")) as f:
+                vendors.append(f.read().strip())
+        except OSError:
+            continue
+    if "0x10de" in vendors:
+        return "nvidia"
+    if "0x1002" in vendors:
+        return "amd"
+    if vendors:
+        return "cpu"
+    return None
 
+def _nvml_compute_capability():
+    """Return (major, minor) compute capability of the first visible NVIDIA GPU
+
+    Respects CUDA_VISIBLE_DEVICES so the wheel choice matches the device
+    the app will actually run on. Returns None when pynvml or a driver is
+    missing, in which case the caller trusts the vendor match alone.
+    """
+    try:
+        import pynvml
+    except ImportError:
+        return None
+    try:
+        pynvml.nvmlInit()
+    except Exception:
+        return None
+    try:
+        count = pynvml.nvmlDeviceGetCount()
+        indices = range(count)
+        visible = os.environ.get("CUDA_VISIBLE_DEVICES")
+        if visible is not None:
+            indices = [int(i) for i in visible.split(",")
+                       if i.strip().lstrip("-").isdigit() and 0 <= int(i) < count]
+        for index in indices:
+            handle = pynvml.nvmlDeviceGetHandleByIndex(index)
+            return tuple(pynvml.nvmlDeviceGetCudaComputeCapability(handle))
+        return None
+    except Exception:
+        return None
+    finally:
+        pynvml.nvmlShutdown()
+
+@functools.lru_cache(maxsize=1)
 def detect_gpu():
-    """Detect GPU type and return appropriate PyTorch installation command"""
+    """Detect GPU type and return appropriate PyTorch installation command
+
+    The answer is memoized in-process and persisted per host, so repeat
+    runs skip the probe entirely; delete gpu-detect.json from the cache
+    directory after a hardware change.
+    """
+    cache_file = os.path.join(_get_cache_dir(), "gpu-detect.json")
+    host = platform.node()
+    try:
+        with open(cache_file) as f:
+            cached = json.load(f)
+        if cached.get("host") == host:
+            print(f"Using cached GPU detection: {cached['gpu']}")
+            return cached["gpu"]
+    except (OSError, ValueError, KeyError):
+        pass
+
+    gpu_type = _detect_gpu_uncached()
+    try:
+        with open(cache_file, "w") as f:
+            json.dump({"host": host, "gpu": gpu_type}, f)
+    except OSError:
+        pass
+    return gpu_type
+
+def _detect_gpu_uncached():
+    """Probe the hardware, cheapest method first"""
+    # NVML answers in milliseconds on any platform with a driver
+    if _nvml_gpu_present():
+        print("NVIDIA GPU detected")
+        return "nvidia"
+
+    # On Linux, sysfs identifies the vendor without forking anything
+    if platform.system() == "Linux":
+        vendor = _sysfs_gpu_vendor()
+        if vendor == "nvidia":
+            print("NVIDIA GPU detected")
+            return vendor
+        if vendor == "amd":
+            print("AMD GPU detected")
+            return vendor
+        if vendor == "cpu":
+            print("No compatible GPU detected, will use CPU")
+            return vendor
+
     is_windows = platform.system() == "Windows"
-    
+
     if is_windows:
         try:
             # Check for NVIDIA GPU on Windows
@@ -66,76 +219,111 @@ def detect_gpu():
 def main():
     print("Installing dependencies for GPU-accelerated video processing...")
     
-    # Basic dependencies
+    # pillow-simd is an AVX2 drop-in replacement for Pillow on x86_64;
+    # caption rasterization and alpha compositing are exactly its hot
+    # paths. Other architectures keep stock Pillow. The swap itself
+    # happens below, only when an install actually runs.
+    want_simd = platform.machine().lower() in ("x86_64", "amd64")
+    pillow_package = "pillow-simd" if want_simd else "pillow"
+
+    # Everything without a GPU-specific index goes into one pip run:
+    # a single resolver pass instead of eight process spawns. Pillow is
+    # handled separately so a pillow-simd build failure can't take the
+    # whole batch down with it.
     base_packages = [
         "numpy",
-        "pillow",
         "moviepy>=1.0.3",
         "streamlit>=1.22.0",
         "opencv-python>=4.7.0.72",
-        "ffmpeg-python>=0.2.0"
+        "ffmpeg-python>=0.2.0",
+        "tqdm",
+        "concurrent-log-handler"
     ]
-    
-    # Install base packages
-    for package in base_packages:
-        install_package(package, upgrade=True)
-    
     # Detect GPU type
     gpu_type = detect_gpu()
-    
-    # Install PyTorch based on GPU type
+
+    # Pick the PyTorch variant; the torch trio is the second (and last)
+    # pip invocation because it may need its own index URL
+    torch_packages = ["torch", "torchvision", "torchaudio"]
     if gpu_type == "nvidia":
-        # Install CUDA-enabled PyTorch
-        print("Installing PyTorch with CUDA support...")
-        install_package("torch torchvision torchaudio --index-url https://download.pytorch.org/whl/cu118")
-    elif gpu_type == "amd":
-        # For AMD, we can use ROCm on Linux, but on Windows we'll use CPU PyTorch
-        if platform.system() == "Windows":
-            print("Installing PyTorch for Windows (CPU version for AMD compatibility)...")
-            install_package("torch torchvision torchaudio")
+        # A present GPU is not necessarily a usable one: the cu118 wheels
+        # ship kernels for sm_35 through sm_90, and downloading ~2 GB of
+        # binaries the device can't run just produces a silent CPU
+        # fallback at runtime. Check the compute capability first.
+        compute_capability = _nvml_compute_capability()
+        if compute_capability is not None and not ((3, 5) <= compute_capability <= (9, 0)):
+            major, minor = compute_capability
+            print(f"GPU compute capability {major}.{minor} is outside the "
+                  f"cu118 wheel range (3.5-9.0); installing CPU PyTorch instead.")
+            torch_index = None
+            torch_note = "Installing PyTorch CPU version..."
         else:
-            # Linux with AMD GPU
-            print("Installing PyTorch with ROCm support for AMD GPU...")
-            install_package("torch torchvision torchaudio --index-url https://download.pytorch.org/whl/rocm5.4.2")
+            torch_index = "https://download.pytorch.org/whl/cu118"
+            torch_note = "Installing PyTorch with CUDA support..."
+    elif gpu_type == "amd" and platform.system() != "Windows":
+        torch_index = "https://download.pytorch.org/whl/rocm5.4.2"
+        torch_note = "Installing PyTorch with ROCm support for AMD GPU..."
+    elif gpu_type == "amd":
+        # For AMD on Windows there is no ROCm, so use CPU PyTorch
+        torch_index = None
+        torch_note = "Installing PyTorch for Windows (CPU version for AMD compatibility)..."
     else:
         # CPU fallback
-        print("Installing PyTorch CPU version...")
-        install_package("torch torchvision torchaudio")
-    
-    # Install multiprocessing modules for parallel processing
-    parallel_packages = [
-        "tqdm",
-        "concurrent-log-handler"
-    ]
-    for package in parallel_packages:
-        install_package(package)
+        torch_index = None
+        torch_note = "Installing PyTorch CPU version..."
+
+    # A sentinel per exact package set lets warm reruns (CI, container
+    # rebuilds) skip the install phase entirely
+    manifest = ",".join(base_packages + [pillow_package] + torch_packages + [torch_index or "default-index"])
+    sentinel = os.path.join(
+        _get_cache_dir(),
+        ".installed-" + hashlib.blake2b(manifest.encode()).hexdigest()[:16]
+    )
+    if os.path.exists(sentinel):
+        print(f"Dependencies already installed for this configuration; delete {sentinel} to force a reinstall.")
+    else:
+        installed = install_packages(base_packages, upgrade=True)
+        if want_simd:
+            # Strip stock Pillow only now that an install is actually
+            # happening: uninstalling before the sentinel check stripped
+            # it on warm reruns that then skipped the reinstall
+            subprocess.call([sys.executable, "-m", "pip", "uninstall", "-y", "pillow"])
+            # pillow-simd ships no wheels on PyPI, so the source build
+            # fails on machines without a compiler and headers; fall back
+            # to stock Pillow rather than leaving the environment with
+            # no PIL at all
+            if not install_packages(["pillow-simd"], upgrade=True):
+                print("pillow-simd build failed; falling back to stock Pillow")
+                installed = install_packages(["pillow"], upgrade=True) and installed
+        else:
+            installed = install_packages(["pillow"], upgrade=True) and installed
+        print(torch_note)
+        installed = install_packages(torch_packages, index_url=torch_index) and installed
+        if installed:
+            with open(sentinel, "w") as f:
+                f.write(manifest)
     
-    # Ensure ffmpeg is accessible
-    if platform.system() == "Windows":
+    # Ensure ffmpeg is accessible; a PATH search needs no subprocess
+    ffmpeg_path = shutil.which("ffmpeg")
+    if ffmpeg_path:
+        print(f"FFmpeg found at {ffmpeg_path}")
+    elif platform.system() == "Windows":
+        print("FFmpeg not found in PATH. Please install FFmpeg manually and add it to your PATH.")
+        print("You can download FFmpeg from: https://www.gyan.dev/ffmpeg/builds/")
+        print("Download the 'ffmpeg-release-essentials.zip' file, extract it, and add the bin folder to your PATH.")
+    elif platform.system() == "Darwin":  # macOS
+        print("FFmpeg not found. Attempting to install...")
         try:
-            subprocess.check_output(["where", "ffmpeg"])
-            print("FFmpeg is already installed and accessible.")
-        except subprocess.CalledProcessError:
-            print("FFmpeg not found in PATH. Please install FFmpeg manually and add it to your PATH.")
-            print("You can download FFmpeg from: https://www.gyan.dev/ffmpeg/builds/")
-            print("Download the 'ffmpeg-release-essentials.zip' file, extract it, and add the bin folder to your PATH.")
-    else:
+            subprocess.check_call(["brew", "install", "ffmpeg"])
+        except:
+            print("Failed to install FFmpeg. Please install it manually.")
+    else:  # Linux
+        print("FFmpeg not found. Attempting to install...")
         try:
-            subprocess.check_output(["which", "ffmpeg"])
-            print("FFmpeg is already installed and accessible.")
-        except subprocess.CalledProcessError:
-            print("FFmpeg not found. Attempting to install...")
-            if platform.system() == "Darwin":  # macOS
-                try:
-                    subprocess.check_call(["brew", "install", "ffmpeg"])
-                except:
-                    print("Failed to install FFmpeg. Please install it manually.")
-            else:  # Linux
-                try:
-                    subprocess.check_call(["sudo", "apt", "update"])
-                    subprocess.check_call(["sudo", "apt", "install", "-y", "ffmpeg"])
-                except:
-                    print("Failed to install FFmpeg. Please install it manually.")
+            subprocess.check_call(["sudo", "apt", "update"])
+            subprocess.check_call(["sudo", "apt", "install", "-y", "ffmpeg"])
+        except:
+            print("Failed to install FFmpeg. Please install it manually.")
     
     print("\nDependencies installation complete!")
     print("You can now use the GPU-accelerated video editor for faster processing.")
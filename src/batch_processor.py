@@ -5,7 +5,9 @@ Processes multiple videos in parallel using multiprocessing pools and GPU accele
 
 import os
 import time
+import asyncio
 import logging
+import platform
 import multiprocessing
 from concurrent.futures import ProcessPoolExecutor, as_completed
 from tqdm import tqdm
@@ -19,6 +21,92 @@ logger = logging.getLogger(__name__)
 # Get performance configuration
 perf_config = get_performance_config()
 
+# Semaphore bounding concurrent hardware encodes across worker processes.
+# Consumer GPUs only run 2-3 NVENC sessions at once; extra ffmpeg processes
+# just queue inside the driver, so gate them here instead.
+#
+# Note on session reuse: a long-lived PyNvVideoCodec encoder shared across
+# rows would also amortize NVENC session init, but every stage in this
+# pipeline exchanges files through ffmpeg/MoviePy, so adopting it would
+# mean rewriting the decode/compose path around raw GPU frames. Until
+# then, per-video ffmpeg processes plus this semaphore are the boundary.
+_nvenc_sem = None
+
+def _init_worker(nvenc_sem):
+    """Initializer run in each worker process to share the encode semaphore"""
+    global _nvenc_sem
+    _nvenc_sem = nvenc_sem
+
+def _process_video_job(job):
+    """Process a single video job in a worker process
+
+    Module-level on purpose: submitting a bound method would pickle the
+    BatchProcessor along with it, and the processor holds the worker pool
+    itself, which cannot cross a process boundary. The job dict carries
+    everything the worker needs; the NVENC semaphore arrives separately
+    through the pool initializer.
+
+    Args:
+        job (dict): Dictionary containing job parameters
+
+    Returns:
+        dict: Job result dictionary
+    """
+    start_time = time.time()
+    job_id = job.get('job_id', 'unknown')
+
+    try:
+        # Extract job parameters
+        background_video = job['background_video']
+        audio_file = job['audio_file']
+        captions_file = job['captions_file']
+        output_file = job['output_file']
+        theme = job.get('theme', 'default')
+        add_music = job.get('add_music', False)
+        add_intro = job.get('add_intro', False)
+        add_outro = job.get('add_outro', True)
+
+        # Create the video, holding an encoder slot while the GPU is in use
+        if _nvenc_sem is not None:
+            _nvenc_sem.acquire()
+        try:
+            result_file = create_final_video(
+                background_video,
+                audio_file,
+                captions_file,
+                output_file,
+                theme=theme,
+                add_music=add_music,
+                add_intro=add_intro,
+                add_outro=add_outro
+            )
+        finally:
+            if _nvenc_sem is not None:
+                _nvenc_sem.release()
+
+        # Calculate processing time
+        elapsed = time.time() - start_time
+
+        # Return job result
+        return {
+            'job_id': job_id,
+            'status': 'success',
+            'result_file': result_file,
+            'elapsed_time': elapsed,
+            'error': None
+        }
+
+    except Exception as e:
+        elapsed = time.time() - start_time
+        logger.error(f"Error processing job {job_id}: {str(e)}")
+        return {
+            'job_id': job_id,
+            'status': 'error',
+            'result_file': None,
+            'elapsed_time': elapsed,
+            'error': str(e)
+        }
+
 class BatchProcessor:
     """
     Processes multiple videos in parallel for maximum efficiency
@@ -34,88 +122,301 @@ class BatchProcessor:
         if max_workers is None:
             # Leave at least 1 core free for system tasks
             self.max_workers = max(1, perf_config.num_cpu_cores - 1)
-            
-            # If using GPU, limit workers to avoid memory issues
+
+            # If using GPU, limit workers to what its memory actually fits
             if perf_config.gpu_info['available']:
-                # For GPU processing, typically 2-4 workers is optimal to avoid memory contention
-                self.max_workers = min(self.max_workers, 4)
+                self.max_workers = min(self.max_workers, self._vram_worker_limit())
         else:
             self.max_workers = max_workers
-        
+
+        # Created lazily and kept for the object's lifetime: workers pay
+        # their heavy imports (moviepy, torch) once, not once per batch
+        self._executor = None
+
         logger.info(f"Batch processor initialized with {self.max_workers} worker processes")
+
+    @staticmethod
+    def _vram_worker_limit():
+        """Cap GPU workers by free VRAM instead of a fixed constant
+
+        A shorts-resolution job holds decode surfaces, filter buffers and
+        an NVENC session — around 1.5 GB in practice. Dividing free
+        memory by that lets a 24 GB card run more than the old fixed 4
+        workers, while a 6 GB card drops to what fits instead of hitting
+        CUDA OOM mid-batch. Without pynvml or a driver the old constant
+        stands.
+        """
+        fallback = 4
+        estimated_job_vram = 1536 << 20
+        try:
+            import pynvml
+        except ImportError:
+            return fallback
+        try:
+            pynvml.nvmlInit()
+        except Exception:
+            return fallback
+        try:
+            handle = pynvml.nvmlDeviceGetHandleByIndex(0)
+            free = pynvml.nvmlDeviceGetMemoryInfo(handle).free
+            return max(1, int(free // estimated_job_vram))
+        except Exception as e:
+            logger.warning(f"Could not query GPU memory, using {fallback} workers: {str(e)}")
+            return fallback
+        finally:
+            pynvml.nvmlShutdown()
+
+    def _get_executor(self):
+        """Return the persistent worker pool, creating it on first use"""
+        if self._executor is None:
+            if platform.system() == 'Linux':
+                # forkserver: workers fork from a clean server process that
+                # has this module (and its moviepy import) loaded exactly
+                # once, and caller threads are never copied into children
+                ctx = multiprocessing.get_context('forkserver')
+            else:
+                ctx = multiprocessing.get_context()
+
+            # Limit concurrent hardware encodes to the GPU's NVENC session count
+            nvenc_sem = None
+            if perf_config.gpu_info['available']:
+                nvenc_sessions = int(os.environ.get('NVENC_SESSIONS', '2'))
+                nvenc_sem = ctx.Semaphore(nvenc_sessions)
+
+            self._executor = ProcessPoolExecutor(max_workers=self.max_workers,
+                                                 mp_context=ctx,
+                                                 initializer=_init_worker,
+                                                 initargs=(nvenc_sem,))
+        return self._executor
+
+    def close(self):
+        """Shut down the persistent worker pool"""
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
     
     def process_video_job(self, job):
-        """Process a single video job
-        
+        """Process a single video job in the current process
+
         Args:
             job (dict): Dictionary containing job parameters
-            
+
         Returns:
             dict: Job result dictionary
         """
+        return _process_video_job(job)
+
+    def process_batch_shared_input(self, jobs):
+        """Process jobs that share the same inputs with one ffmpeg invocation
+
+        When every job reads the same background/audio/captions trio (the
+        benchmark's batch mode does exactly this), a single multi-output
+        ffmpeg command decodes the source and burns the captions once,
+        then fans the stream out to one encoder per output — saving N-1
+        decode passes. Jobs that don't qualify (differing inputs, intro or
+        music requested) fall back to the regular per-job pool, as does
+        any ffmpeg failure.
+
+        Args:
+            jobs (list): List of job dictionaries with parameters for each video
+
+        Returns:
+            list: List of result dictionaries
+        """
+        if not jobs:
+            logger.warning("No jobs provided to process")
+            return []
+
+        first = jobs[0]
+        shared_keys = ('background_video', 'audio_file', 'captions_file')
+        shareable = (
+            all(job[key] == first[key] for job in jobs for key in shared_keys)
+            and not any(job.get('add_intro') or job.get('add_music') for job in jobs)
+            # The compositor's subtitle styling only reproduces the default
+            # theme, so themed jobs must keep the per-job pipeline
+            and all(job.get('theme', 'default') == 'default' for job in jobs)
+            and all(job.get('add_outro', True) == first.get('add_outro', True)
+                    for job in jobs)
+        )
+        if not shareable:
+            return self.process_batch(jobs)
+
+        from .ffmpeg_compositor import compose_batch_shared_input
+
         start_time = time.time()
-        job_id = job.get('job_id', 'unknown')
-        
         try:
-            # Extract job parameters
-            background_video = job['background_video']
-            audio_file = job['audio_file']
-            captions_file = job['captions_file']
-            output_file = job['output_file']
-            theme = job.get('theme', 'default')
-            add_music = job.get('add_music', False)
-            add_intro = job.get('add_intro', False)
-            add_outro = job.get('add_outro', True)
-            
-            # Create the video
-            result_file = create_final_video(
-                background_video, 
-                audio_file, 
-                captions_file, 
-                output_file,
-                theme=theme,
-                add_music=add_music,
-                add_intro=add_intro,
-                add_outro=add_outro
+            compose_batch_shared_input(
+                first['background_video'],
+                first['audio_file'],
+                first['captions_file'],
+                [job['output_file'] for job in jobs],
+                add_outro=first.get('add_outro', True)
             )
-            
-            # Calculate processing time
-            elapsed = time.time() - start_time
-            
-            # Return job result
-            return {
-                'job_id': job_id,
-                'status': 'success',
-                'result_file': result_file,
-                'elapsed_time': elapsed,
-                'error': None
-            }
-            
         except Exception as e:
-            elapsed = time.time() - start_time
-            logger.error(f"Error processing job {job_id}: {str(e)}")
-            return {
-                'job_id': job_id,
-                'status': 'error',
-                'result_file': None,
-                'elapsed_time': elapsed,
-                'error': str(e)
-            }
-    
+            logger.error(f"Shared-input batch failed, falling back to per-job processing: {str(e)}")
+            return self.process_batch(jobs)
+
+        elapsed = time.time() - start_time
+        logger.info(f"Shared-input batch of {len(jobs)} jobs completed in {elapsed:.2f} seconds")
+        return [{
+            'job_id': job.get('job_id', 'unknown'),
+            'status': 'success',
+            'result_file': job['output_file'],
+            'elapsed_time': elapsed,
+            'error': None
+        } for job in jobs]
+
+    def process_batch_async(self, jobs, show_progress=True):
+        """Run compositor-eligible jobs as concurrent ffmpeg subprocesses
+
+        The encode is ffmpeg's work, not Python's: wrapping it in worker
+        processes pays fork and import cost around a subprocess that runs
+        outside the GIL anyway. When every job can take the ffmpeg
+        compositor path (no intro), this drives one asyncio subprocess per
+        job from the current process, capped by a semaphore at max_workers
+        — and at the NVENC session count for GPU encodes. Batches with
+        MoviePy-only work fall back to the process pool.
+
+        Args:
+            jobs (list): List of job dictionaries with parameters for each video
+            show_progress (bool, optional): Whether to show a progress bar
+
+        Returns:
+            list: List of result dictionaries
+        """
+        if not jobs:
+            logger.warning("No jobs provided to process")
+            return []
+
+        if any(job.get('add_intro') or job.get('theme', 'default') != 'default'
+               for job in jobs):
+            # Intros need the MoviePy pipeline and themed captions need its
+            # styling; both are Python-bound and genuinely benefit from
+            # worker processes
+            return self._process_batch_pool(jobs, show_progress=show_progress)
+
+        from .ffmpeg_compositor import prepare_final_video_command
+
+        concurrency = self.max_workers
+        if perf_config.gpu_info['available']:
+            concurrency = min(concurrency, int(os.environ.get('NVENC_SESSIONS', '2')))
+        logger.info(f"Processing {len(jobs)} jobs as ffmpeg subprocesses, {concurrency} at a time")
+
+        pbar = tqdm(total=len(jobs), desc="Processing videos") if show_progress else None
+
+        async def run_job(sem, job):
+            job_id = job.get('job_id', 'unknown')
+            start_time = time.time()
+            async with sem:
+                try:
+                    cmd = prepare_final_video_command(
+                        job['background_video'],
+                        job['audio_file'],
+                        job['captions_file'],
+                        job['output_file'],
+                        add_music=job.get('add_music', False),
+                        add_outro=job.get('add_outro', True)
+                    )
+                    proc = await asyncio.create_subprocess_exec(
+                        *cmd,
+                        stdout=asyncio.subprocess.PIPE,
+                        stderr=asyncio.subprocess.PIPE
+                    )
+                    _, stderr = await proc.communicate()
+                    if proc.returncode != 0:
+                        message = stderr.decode(errors='replace').strip()
+                        raise RuntimeError(message or f"ffmpeg exited with {proc.returncode}")
+                    result = {
+                        'job_id': job_id,
+                        'status': 'success',
+                        'result_file': job['output_file'],
+                        'elapsed_time': time.time() - start_time,
+                        'error': None
+                    }
+                except Exception as e:
+                    logger.error(f"Error processing job {job_id}: {str(e)}")
+                    result = {
+                        'job_id': job_id,
+                        'status': 'error',
+                        'result_file': None,
+                        'elapsed_time': time.time() - start_time,
+                        'error': str(e)
+                    }
+            if pbar:
+                pbar.update(1)
+            return result
+
+        async def run_all():
+            sem = asyncio.Semaphore(concurrency)
+            return list(await asyncio.gather(*(run_job(sem, job) for job in jobs)))
+
+        try:
+            results = asyncio.run(run_all())
+        finally:
+            if pbar:
+                pbar.close()
+
+        successful_jobs = sum(1 for r in results if r['status'] == 'success')
+        failed_jobs = sum(1 for r in results if r['status'] == 'error')
+        logger.info(f"Batch processing completed: {successful_jobs} succeeded, {failed_jobs} failed")
+
+        return results
+
     def process_batch(self, jobs, show_progress=True):
         """Process a batch of video jobs in parallel
-        
+
+        Compositor-eligible batches (no intro, default theme) run as
+        concurrent ffmpeg subprocesses through process_batch_async; any
+        job that fails there is retried once on the worker pool, where
+        create_final_video's MoviePy fallback can still rescue it.
+        Everything else goes straight to the pool.
+
         Args:
             jobs (list): List of job dictionaries with parameters for each video
             show_progress (bool, optional): Whether to show a progress bar
-            
+
         Returns:
             list: List of result dictionaries
         """
         if not jobs:
             logger.warning("No jobs provided to process")
             return []
-        
+
+        if all(not job.get('add_intro') and job.get('theme', 'default') == 'default'
+               for job in jobs):
+            results = self.process_batch_async(jobs, show_progress=show_progress)
+            failed = [(i, jobs[i]) for i, r in enumerate(results) if r['status'] == 'error']
+            if failed:
+                logger.info(f"Retrying {len(failed)} failed ffmpeg jobs on the worker pool")
+                retried = self._process_batch_pool([job for _, job in failed],
+                                                   show_progress=False)
+                by_id = {r['job_id']: r for r in retried}
+                for i, job in failed:
+                    results[i] = by_id.get(job.get('job_id', 'unknown'), results[i])
+            return results
+
+        return self._process_batch_pool(jobs, show_progress=show_progress)
+
+    def _process_batch_pool(self, jobs, show_progress=True):
+        """Process a batch of video jobs on the persistent worker pool
+
+        Args:
+            jobs (list): List of job dictionaries with parameters for each video
+            show_progress (bool, optional): Whether to show a progress bar
+
+        Returns:
+            list: List of result dictionaries
+        """
+        if not jobs:
+            logger.warning("No jobs provided to process")
+            return []
+
         num_jobs = len(jobs)
         logger.info(f"Processing {num_jobs} jobs with {self.max_workers} workers")
         
@@ -125,43 +426,45 @@ class BatchProcessor:
             pbar = tqdm(total=num_jobs, desc="Processing videos")
         
         results = []
-        
-        # Process jobs in parallel
-        with ProcessPoolExecutor(max_workers=self.max_workers) as executor:
-            # Submit all jobs
-            future_to_job = {executor.submit(self.process_video_job, job): job for job in jobs}
-            
-            # Process results as they complete
-            for future in as_completed(future_to_job):
-                job = future_to_job[future]
-                try:
-                    result = future.result()
-                    results.append(result)
-                    
-                    # Log result
-                    job_id = job.get('job_id', 'unknown')
-                    if result['status'] == 'success':
-                        logger.info(f"Job {job_id} completed successfully in {result['elapsed_time']:.2f} seconds")
-                    else:
-                        logger.error(f"Job {job_id} failed: {result['error']}")
-                    
-                    # Update progress bar
-                    if pbar:
-                        pbar.update(1)
-                        
-                except Exception as e:
-                    job_id = job.get('job_id', 'unknown')
-                    logger.error(f"Exception in job {job_id}: {str(e)}")
-                    results.append({
-                        'job_id': job_id,
-                        'status': 'error',
-                        'result_file': None,
-                        'elapsed_time': 0,
-                        'error': str(e)
-                    })
-                    if pbar:
-                        pbar.update(1)
-        
+
+        # Process jobs on the persistent pool; it outlives this batch
+        executor = self._get_executor()
+
+        # Submit all jobs (the module-level function, so nothing but the
+        # job dict is pickled to the worker)
+        future_to_job = {executor.submit(_process_video_job, job): job for job in jobs}
+
+        # Process results as they complete
+        for future in as_completed(future_to_job):
+            job = future_to_job[future]
+            try:
+                result = future.result()
+                results.append(result)
+
+                # Log result
+                job_id = job.get('job_id', 'unknown')
+                if result['status'] == 'success':
+                    logger.info(f"Job {job_id} completed successfully in {result['elapsed_time']:.2f} seconds")
+                else:
+                    logger.error(f"Job {job_id} failed: {result['error']}")
+
+                # Update progress bar
+                if pbar:
+                    pbar.update(1)
+
+            except Exception as e:
+                job_id = job.get('job_id', 'unknown')
+                logger.error(f"Exception in job {job_id}: {str(e)}")
+                results.append({
+                    'job_id': job_id,
+                    'status': 'error',
+                    'result_file': None,
+                    'elapsed_time': 0,
+                    'error': str(e)
+                })
+                if pbar:
+                    pbar.update(1)
+
         # Close progress bar
         if pbar:
             pbar.close()
@@ -224,56 +527,42 @@ def process_directory(input_dir, output_dir, theme='default', add_music=False, a
     # Ensure output directory exists
     os.makedirs(output_dir, exist_ok=True)
     
-    # Find sets of files to process
+    # Bin entries by extension in one scandir pass: name and path come
+    # straight from the dirent, so there is no per-file stat, splitext
+    # or path re-join
+    videos, audios, captions = {}, {}, {}
+    buckets = {'.mp4': videos, '.mov': videos, '.avi': videos,
+               '.mp3': audios, '.wav': audios, '.json': captions}
+    with os.scandir(input_dir) as it:
+        for entry in it:
+            name = entry.name
+            dot = name.rfind('.')
+            if dot < 0:
+                continue
+            bucket = buckets.get(name[dot:].lower())
+            if bucket is not None:
+                bucket[name[:dot]] = entry.path
+
+    # A job needs all three files; set intersection finds the complete
+    # base names directly
+    complete = videos.keys() & audios.keys() & captions.keys()
+    for base_name in (videos.keys() | audios.keys() | captions.keys()) - complete:
+        logger.warning(f"Skipping {base_name}: missing required files")
+
     jobs = []
-    
-    # Group files by base name (before extension)
-    file_groups = {}
-    for filename in os.listdir(input_dir):
-        base_name, ext = os.path.splitext(filename)
-        if ext.lower() in ['.mp4', '.mov', '.avi', '.mp3', '.wav', '.json']:
-            if base_name not in file_groups:
-                file_groups[base_name] = []
-            file_groups[base_name].append((filename, ext.lower()))
-    
-    # Create jobs from file groups
-    for base_name, files in file_groups.items():
-        # Find required files
-        background_video = None
-        audio_file = None
-        captions_file = None
-        
-        for filename, ext in files:
-            full_path = os.path.join(input_dir, filename)
-            if ext in ['.mp4', '.mov', '.avi']:
-                background_video = full_path
-            elif ext in ['.mp3', '.wav']:
-                audio_file = full_path
-            elif ext == '.json':
-                captions_file = full_path
-        
-        # Skip if missing required files
-        if not (background_video and audio_file and captions_file):
-            logger.warning(f"Skipping {base_name}: missing required files")
-            continue
-        
-        # Create output file path
+    for base_name in sorted(complete):
         output_file = os.path.join(output_dir, f"{base_name}_final.mp4")
-        
-        # Create and add job
-        job = create_job(
-            background_video, 
-            audio_file, 
-            captions_file, 
+        jobs.append(create_job(
+            videos[base_name],
+            audios[base_name],
+            captions[base_name],
             output_file,
             job_id=base_name,
             theme=theme,
             add_music=add_music,
             add_intro=add_intro,
             add_outro=add_outro
-        )
-        
-        jobs.append(job)
+        ))
     
     # Process all jobs
     if jobs:
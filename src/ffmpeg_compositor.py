@@ -0,0 +1,377 @@
+"""
+FFmpeg Compositor Module
+Assembles the final YouTube short with a single ffmpeg filter_complex call,
+bypassing MoviePy's frame-by-frame Python pipeline for the encode step.
+
+Decode, caption burn-in, mixing and encode all happen inside that one
+process: frames move between stages through libavfilter's buffers, never
+through intermediate files or Python, so a batch of jobs costs disk
+bandwidth only for its inputs and final outputs.
+"""
+
+import os
+import json
+import logging
+import platform
+import subprocess
+
+from .performance_config import get_performance_config, NVENC_QUALITY_PARAMS
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Get performance configuration
+perf_config = get_performance_config()
+
+
+def _format_srt_time(milliseconds):
+    """Format a millisecond timestamp as an SRT time string (HH:MM:SS,mmm)"""
+    milliseconds = max(0, int(milliseconds))
+    hours, remainder = divmod(milliseconds, 3600000)
+    minutes, remainder = divmod(remainder, 60000)
+    seconds, millis = divmod(remainder, 1000)
+    return f"{hours:02d}:{minutes:02d}:{seconds:02d},{millis:03d}"
+
+
+def captions_to_srt(captions_file, srt_file):
+    """Convert the app's JSON captions format to an SRT subtitle file
+
+    Args:
+        captions_file (str): Path to captions data file (JSON)
+        srt_file (str): Path to save the SRT file
+
+    Returns:
+        str: Path to the SRT file
+    """
+    with open(captions_file, 'r', encoding='utf-8') as f:
+        captions_data = json.load(f)
+
+    entries = []
+    for index, caption in enumerate(captions_data, start=1):
+        lines = caption["text"] if isinstance(caption["text"], list) else [caption["text"]]
+        start = _format_srt_time(caption["start_time"])
+        end = _format_srt_time(caption["end_time"])
+        entries.append(f"{index}\n{start} --> {end}\n" + "\n".join(lines))
+
+    with open(srt_file, 'w', encoding='utf-8') as f:
+        f.write("\n\n".join(entries) + "\n")
+
+    return srt_file
+
+
+def _escape_filter_path(path):
+    """Escape a file path for use inside an ffmpeg filter argument"""
+    path = path.replace("\\", "/")
+    if platform.system() == 'Windows':
+        # Drive-letter colons must be escaped inside filter strings
+        path = path.replace(":", "\\:")
+    return path
+
+
+def probe_duration(path):
+    """Get media duration in seconds using ffprobe"""
+    proc = subprocess.run(
+        ["ffprobe", "-v", "error", "-show_entries", "format=duration", "-of", "json", path],
+        capture_output=True,
+        check=True
+    )
+    return float(json.loads(proc.stdout)["format"]["duration"])
+
+
+def _probe_video_stream(path):
+    """Get codec name and dimensions of the first video stream via ffprobe"""
+    proc = subprocess.run(
+        ["ffprobe", "-v", "error", "-select_streams", "v:0",
+         "-show_entries", "stream=codec_name,width,height", "-of", "json", path],
+        capture_output=True,
+        check=True
+    )
+    stream = json.loads(proc.stdout)["streams"][0]
+    return stream["codec_name"], int(stream["width"]), int(stream["height"])
+
+
+def _nvdec_input_args(background_video):
+    """Choose hardware-decode input flags for the background video
+
+    Oversized H.264 sources (4K backgrounds are common) are resized during
+    decode by the cuvid decoder itself, so frames arrive from NVDEC already
+    at shorts resolution instead of hauling full-size frames across the bus
+    and scaling them later. Other codecs or already-small sources use the
+    generic cuda hwaccel.
+    """
+    try:
+        codec_name, width, height = _probe_video_stream(background_video)
+    except Exception as e:
+        logger.warning(f"Could not probe {background_video}, using generic hwaccel: {str(e)}")
+        return ["-hwaccel", "cuda", "-hwaccel_device", "0"]
+
+    if codec_name == 'h264' and width * height > 1080 * 1920:
+        return ["-hwaccel", "cuvid", "-c:v", "h264_cuvid",
+                "-resize", "1080x1920", "-hwaccel_device", "0"]
+    return ["-hwaccel", "cuda", "-hwaccel_device", "0"]
+
+
+def build_ffmpeg_command(background_video, audio_file, srt_file, output_file,
+                         music_file=None, cta_start=None):
+    """Build the ffmpeg command line for final video assembly
+
+    The background is looped to cover the narration, captions are burned in
+    with the subtitles filter, and background music (when present) is mixed
+    under the voice track. Encoding uses the hardware codec selected by
+    perf_config when a GPU is available.
+
+    Args:
+        background_video (str): Path to background video
+        audio_file (str): Path to narration audio
+        srt_file (str): Path to SRT subtitle file
+        output_file (str): Path to save the final video
+        music_file (str, optional): Path to background music file
+        cta_start (float, optional): Time to show the call-to-action overlay
+
+    Returns:
+        list: ffmpeg argv
+    """
+    # Honor a forced CPU-only run even when a GPU encoder was detected
+    if os.environ.get('CPU_ONLY', '0') == '1':
+        codec, preset = 'libx264', 'veryfast'
+    else:
+        codec, preset = perf_config.codec, perf_config.encoding_preset
+
+    cmd = ["ffmpeg", "-y", "-v", "error"]
+    if codec.endswith('_nvenc'):
+        # Decode the background on NVDEC so the CPU only runs the subtitle
+        # burn-in, resizing oversized sources inside the decoder. Frames
+        # stay in system memory (no -hwaccel_output_format cuda) because
+        # the subtitles filter has no CUDA implementation.
+        cmd += _nvdec_input_args(background_video)
+    cmd += ["-stream_loop", "-1", "-i", background_video,
+            "-i", audio_file]
+    if music_file:
+        cmd += ["-stream_loop", "-1", "-i", music_file]
+
+    filters = [f"[0:v]subtitles='{_escape_filter_path(srt_file)}'[vsub]"]
+    video_label = "vsub"
+    if cta_start is not None:
+        filters.append(
+            f"[{video_label}]drawtext=text='Like & Subscribe!'"
+            f":fontsize=60:fontcolor=white:box=1:boxcolor=black@0.5:boxborderw=20"
+            f":x=(w-text_w)/2:y=h-200:enable='gte(t,{cta_start:.3f})'[vout]"
+        )
+        video_label = "vout"
+
+    if music_file:
+        filters.append("[2:a]volume=0.2[music]")
+        filters.append("[1:a][music]amix=inputs=2:duration=first[aout]")
+        audio_label = "aout"
+    else:
+        audio_label = "1:a"
+
+    cmd += ["-filter_complex", ";".join(filters),
+            "-map", f"[{video_label}]", "-map", f"[{audio_label}]",
+            "-c:v", codec,
+            "-preset", preset]
+    if codec.endswith('_nvenc'):
+        # Same NVENC tuning as get_moviepy_params: quality-targeted VBR
+        # plus lookahead/B-frames/AQ paid for with the ASIC's headroom
+        cmd += NVENC_QUALITY_PARAMS
+    # Batch drivers set FFMPEG_THREADS to divide the cores between
+    # concurrent software encodes; unset, ffmpeg picks its own count
+    ffmpeg_threads = os.environ.get('FFMPEG_THREADS')
+    if ffmpeg_threads:
+        cmd += ["-threads", ffmpeg_threads]
+    cmd += ["-c:a", "aac",
+            "-shortest",
+            output_file]
+    return cmd
+
+
+def build_shared_input_command(background_video, audio_file, srt_file, output_files,
+                               cta_start=None):
+    """Build one ffmpeg command that encodes several outputs from one decode
+
+    The background is decoded and the captions burned in exactly once; a
+    split filter then fans the composited stream out to one encoder per
+    output file, so N outputs cost one decode pass instead of N.
+
+    Args:
+        background_video (str): Path to background video
+        audio_file (str): Path to narration audio
+        srt_file (str): Path to SRT subtitle file
+        output_files (list): Paths for each encoded output
+        cta_start (float, optional): Time to show the call-to-action overlay
+
+    Returns:
+        list: ffmpeg argv
+    """
+    # Honor a forced CPU-only run even when a GPU encoder was detected
+    if os.environ.get('CPU_ONLY', '0') == '1':
+        codec, preset = 'libx264', 'veryfast'
+    else:
+        codec, preset = perf_config.codec, perf_config.encoding_preset
+
+    cmd = ["ffmpeg", "-y", "-v", "error"]
+    if codec.endswith('_nvenc'):
+        cmd += _nvdec_input_args(background_video)
+    cmd += ["-stream_loop", "-1", "-i", background_video,
+            "-i", audio_file]
+
+    filters = [f"[0:v]subtitles='{_escape_filter_path(srt_file)}'[vsub]"]
+    video_label = "vsub"
+    if cta_start is not None:
+        filters.append(
+            f"[{video_label}]drawtext=text='Like & Subscribe!'"
+            f":fontsize=60:fontcolor=white:box=1:boxcolor=black@0.5:boxborderw=20"
+            f":x=(w-text_w)/2:y=h-200:enable='gte(t,{cta_start:.3f})'[vout]"
+        )
+        video_label = "vout"
+
+    n_outputs = len(output_files)
+    filters.append(
+        f"[{video_label}]split={n_outputs}"
+        + "".join(f"[v{i}]" for i in range(n_outputs))
+    )
+    cmd += ["-filter_complex", ";".join(filters)]
+
+    ffmpeg_threads = os.environ.get('FFMPEG_THREADS')
+    for i, output_file in enumerate(output_files):
+        cmd += ["-map", f"[v{i}]", "-map", "1:a",
+                "-c:v", codec,
+                "-preset", preset]
+        if codec.endswith('_nvenc'):
+            cmd += NVENC_QUALITY_PARAMS
+        if ffmpeg_threads:
+            cmd += ["-threads", ffmpeg_threads]
+        cmd += ["-c:a", "aac", "-shortest", output_file]
+    return cmd
+
+
+def compose_batch_shared_input(background_video, audio_file, captions_file,
+                               output_files, add_outro=True):
+    """Create several identical final videos with a single ffmpeg invocation
+
+    Args:
+        background_video (str): Path to background video
+        audio_file (str): Path to narration audio
+        captions_file (str): Path to captions data file (JSON)
+        output_files (list): Paths to save each final video
+        add_outro (bool): Whether to draw the call-to-action overlay
+
+    Returns:
+        list: Paths to the final videos
+
+    Raises:
+        subprocess.CalledProcessError: If ffmpeg fails (caller falls back)
+    """
+    for output_file in output_files:
+        os.makedirs(os.path.dirname(output_file), exist_ok=True)
+
+    srt_file = os.path.splitext(output_files[0])[0] + ".srt"
+    captions_to_srt(captions_file, srt_file)
+
+    cta_start = None
+    if add_outro:
+        duration = probe_duration(audio_file)
+        cta_start = max(0.0, duration - min(5.0, duration / 4))
+
+    cmd = build_shared_input_command(
+        background_video, audio_file, srt_file, output_files,
+        cta_start=cta_start
+    )
+
+    logger.info(
+        f"Compositing {len(output_files)} outputs from one decode "
+        f"with ffmpeg ({perf_config.codec})"
+    )
+    subprocess.run(cmd, check=True, capture_output=True)
+
+    logger.info(f"Final videos created: {', '.join(output_files)}")
+    return output_files
+
+
+def prepare_final_video_command(background_video, audio_file, captions_file,
+                                output_file, add_music=False, add_outro=True,
+                                music_file=None):
+    """Stage everything the final encode needs and return the ffmpeg argv
+
+    Writes the SRT file, picks music and computes the call-to-action time,
+    leaving only the ffmpeg invocation to the caller — so the same
+    preparation serves both the blocking path here and async batch drivers.
+
+    Args:
+        background_video (str): Path to background video
+        audio_file (str): Path to narration audio
+        captions_file (str): Path to captions data file (JSON)
+        output_file (str): Path to save the final video
+        add_music (bool): Whether to mix in background music
+        add_outro (bool): Whether to draw the call-to-action overlay
+        music_file (str, optional): Music file to use; picked automatically
+            from resources/music when omitted
+
+    Returns:
+        list: ffmpeg argv
+    """
+    os.makedirs(os.path.dirname(output_file), exist_ok=True)
+
+    # Burned-in captions need an SRT file next to the output
+    srt_file = os.path.splitext(output_file)[0] + ".srt"
+    captions_to_srt(captions_file, srt_file)
+
+    if add_music and music_file is None:
+        music_file = _find_music_file()
+
+    cta_start = None
+    if add_outro:
+        duration = probe_duration(audio_file)
+        cta_start = max(0.0, duration - min(5.0, duration / 4))
+
+    return build_ffmpeg_command(
+        background_video, audio_file, srt_file, output_file,
+        music_file=music_file if add_music else None,
+        cta_start=cta_start
+    )
+
+
+def compose_final_video(background_video, audio_file, captions_file, output_file,
+                        add_music=False, add_outro=True, music_file=None):
+    """Create the final video with a single ffmpeg invocation
+
+    Args:
+        background_video (str): Path to background video
+        audio_file (str): Path to narration audio
+        captions_file (str): Path to captions data file (JSON)
+        output_file (str): Path to save the final video
+        add_music (bool): Whether to mix in background music
+        add_outro (bool): Whether to draw the call-to-action overlay
+        music_file (str, optional): Music file to use; picked automatically
+            from resources/music when omitted
+
+    Returns:
+        str: Path to the final video
+
+    Raises:
+        subprocess.CalledProcessError: If ffmpeg fails (caller falls back)
+    """
+    cmd = prepare_final_video_command(
+        background_video, audio_file, captions_file, output_file,
+        add_music=add_music, add_outro=add_outro, music_file=music_file
+    )
+
+    logger.info(f"Compositing final video with ffmpeg ({perf_config.codec})")
+    subprocess.run(cmd, check=True, capture_output=True)
+
+    logger.info(f"Final video created: {output_file}")
+    return output_file
+
+
+def _find_music_file():
+    """Pick a music file from resources/music, or None if there are none"""
+    import random
+    music_dir = os.path.join("resources", "music")
+    if not os.path.exists(music_dir):
+        return None
+    music_files = [
+        os.path.join(music_dir, f)
+        for f in os.listdir(music_dir)
+        if f.endswith((".mp3", ".wav"))
+    ]
+    return random.choice(music_files) if music_files else None
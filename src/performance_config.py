@@ -4,6 +4,8 @@ Optimizes system settings for high-performance video editing
 """
 
 import os
+import json
+import time
 import multiprocessing
 import logging
 import platform
@@ -12,6 +14,23 @@ import subprocess
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# NVENC quality flags shared by every encode path. The ASIC runs far
+# above realtime at these settings, so spending its headroom on
+# lookahead, B-frames and adaptive quantization buys ~30% lower bitrate
+# at the same visual quality instead of unused speed.
+NVENC_QUALITY_PARAMS = [
+    '-tune', 'hq',
+    '-rc', 'vbr',
+    '-cq', '23',
+    '-b:v', '0',
+    '-rc-lookahead', '20',
+    '-bf', '3',
+    '-b_ref_mode', 'middle',
+    '-spatial_aq', '1',
+    '-temporal_aq', '1',
+    '-profile:v', 'high',
+]
+
 class PerformanceConfig:
     """Manages performance-related settings for the video editor"""
     
@@ -23,17 +42,96 @@ class PerformanceConfig:
         self.has_cuda = self._has_cuda()
         self.has_mps = self._has_mps()  # Apple Silicon GPU support
         self.ffmpeg_params = self._get_ffmpeg_params()
-        self.encoding_preset = self._get_encoding_preset()
+        # Codec first: the preset namespace depends on it (NVENC uses
+        # p1..p7, not the libx264 names)
         self.codec = self._get_codec()
+        self.encoding_preset = self._get_encoding_preset()
         
     def _detect_gpu(self):
-        """Detect GPU information"""
+        """Detect GPU information, reading the on-disk cache when fresh
+
+        Every worker process re-imports this module and would otherwise
+        re-fork the vendor tools for the same answer; with the cache the
+        probe is one file read. Entries are keyed by the NVIDIA driver
+        version and expire after 24 hours, so driver updates and hardware
+        changes re-probe.
+        """
+        cache_file = os.path.join(os.path.expanduser("~/.cache/yt-shorts"),
+                                  "perfconf.json")
+        driver = self._nvidia_driver_version()
+        try:
+            with open(cache_file) as f:
+                cached = json.load(f)
+            if (cached.get('driver') == driver
+                    and time.time() - cached.get('probed_at', 0) < 86400):
+                return cached['gpu_info']
+        except (OSError, ValueError, KeyError):
+            pass
+
+        gpu_info = self._probe_gpu()
+        try:
+            os.makedirs(os.path.dirname(cache_file), exist_ok=True)
+            with open(cache_file, 'w') as f:
+                json.dump({'driver': driver,
+                           'probed_at': time.time(),
+                           'gpu_info': gpu_info}, f)
+        except OSError as e:
+            logger.warning(f"Could not write GPU probe cache: {str(e)}")
+        return gpu_info
+
+    @staticmethod
+    def _nvidia_driver_version():
+        """Read the NVIDIA driver version without forking, for cache keying"""
+        try:
+            with open('/proc/driver/nvidia/version') as f:
+                return f.readline().strip()
+        except OSError:
+            return None
+
+    @staticmethod
+    def _nvml_gpu_name():
+        """Return the first NVIDIA GPU's name via NVML, or None
+
+        One call into the driver library instead of forking WMI or
+        nvidia-smi; answers in milliseconds on any platform with an
+        NVIDIA driver. None (pynvml or driver missing) hands detection
+        over to the subprocess probes.
+        """
+        try:
+            import pynvml
+        except ImportError:
+            return None
+        try:
+            pynvml.nvmlInit()
+        except Exception:
+            return None
+        try:
+            if pynvml.nvmlDeviceGetCount() < 1:
+                return None
+            name = pynvml.nvmlDeviceGetName(pynvml.nvmlDeviceGetHandleByIndex(0))
+            return name.decode() if isinstance(name, bytes) else name
+        except Exception:
+            return None
+        finally:
+            pynvml.nvmlShutdown()
+
+    def _probe_gpu(self):
+        """Probe the hardware for GPU information"""
         gpu_info = {
             'vendor': None,
             'model': None,
             'available': False
         }
-        
+
+        # NVML first, same order as debug_gpu: the library query is the
+        # cheapest probe and rules out stale vendor tools on GPU-less boxes
+        nvml_name = self._nvml_gpu_name()
+        if nvml_name is not None:
+            gpu_info['vendor'] = 'nvidia'
+            gpu_info['model'] = nvml_name
+            gpu_info['available'] = True
+            return gpu_info
+
         try:
             if platform.system() == 'Windows':
                 # Get GPU info on Windows
@@ -151,56 +249,102 @@ class PerformanceConfig:
         return params
 
     def _get_encoding_preset(self):
-        """Get optimal encoding preset based on hardware"""
-        # Options: ultrafast, superfast, veryfast, faster, fast, medium, slow, slower, veryslow
+        """Get optimal encoding preset based on hardware and codec"""
+        # NVENC ignores the libx264 names; its namespace is p1 (fastest)
+        # to p7 (best quality), with p4 the balanced default
+        if self.codec.endswith('_nvenc'):
+            return "p4"
+        # libx264 options: ultrafast, superfast, veryfast, faster, fast,
+        # medium, slow, slower, veryslow
         if self.gpu_info['available']:
             return "fast"  # Good balance with GPU acceleration
         else:
             # Without GPU, use faster preset to compensate
             return "veryfast"
     
+    def _ffmpeg_has_encoder(self, encoder):
+        """Check whether the installed ffmpeg build provides an encoder
+
+        The encoder list is probed once and cached, so repeated codec
+        lookups don't spawn extra ffmpeg processes.
+        """
+        if not hasattr(self, '_ffmpeg_encoders'):
+            try:
+                self._ffmpeg_encoders = subprocess.check_output(
+                    ['ffmpeg', '-hide_banner', '-encoders'],
+                    stderr=subprocess.STDOUT
+                ).decode('utf-8')
+            except Exception as e:
+                logger.warning(f"Error listing ffmpeg encoders: {str(e)}")
+                self._ffmpeg_encoders = ''
+        return encoder in self._ffmpeg_encoders
+
+    def ffmpeg_has_filter(self, name):
+        """Check whether the installed ffmpeg build provides a filter
+
+        Probed once and cached, like the encoder list.
+        """
+        if not hasattr(self, '_ffmpeg_filters'):
+            try:
+                self._ffmpeg_filters = subprocess.check_output(
+                    ['ffmpeg', '-hide_banner', '-filters'],
+                    stderr=subprocess.STDOUT
+                ).decode('utf-8')
+            except Exception as e:
+                logger.warning(f"Error listing ffmpeg filters: {str(e)}")
+                self._ffmpeg_filters = ''
+        return name in self._ffmpeg_filters
+
     def _get_codec(self):
         """Get optimal video codec based on hardware"""
         if not self.gpu_info['available']:
             return 'libx264'  # Default CPU codec
-        
-        if platform.system() == 'Windows':
-            if self.gpu_info['vendor'] == 'nvidia':
+
+        # NVIDIA on Windows/Linux: NVENC hardware encoder
+        if self.gpu_info['vendor'] == 'nvidia' and platform.system() in ('Windows', 'Linux'):
+            if self._ffmpeg_has_encoder('h264_nvenc'):
                 return 'h264_nvenc'
-            elif self.gpu_info['vendor'] == 'amd':
-                # Try to use AMD hardware encoding with h264_amf
-                try:
-                    # Check if h264_amf is available by running a test command
-                    subprocess.check_output(['ffmpeg', '-encoders'], stderr=subprocess.STDOUT).decode('utf-8')
-                    if 'h264_amf' in subprocess.check_output(['ffmpeg', '-encoders'], stderr=subprocess.STDOUT).decode('utf-8'):
-                        logger.info("Using AMD h264_amf encoder")
-                        return 'h264_amf'
-                    else:
-                        logger.info("AMD h264_amf encoder not available, falling back to libx264")
-                        return 'libx264'
-                except:
-                    # If any error occurs, fall back to CPU encoding
-                    logger.info("Error checking for AMD encoder, falling back to libx264")
-                    return 'libx264'
-        
-        # Linux with NVIDIA
-        elif platform.system() == 'Linux' and self.gpu_info['vendor'] == 'nvidia':
-            return 'h264_nvenc'
-        
+            logger.info("h264_nvenc not available in ffmpeg, falling back to libx264")
+            return 'libx264'
+
+        # AMD on Windows: AMF hardware encoder
+        if self.gpu_info['vendor'] == 'amd' and platform.system() == 'Windows':
+            if self._ffmpeg_has_encoder('h264_amf'):
+                logger.info("Using AMD h264_amf encoder")
+                return 'h264_amf'
+            logger.info("AMD h264_amf encoder not available, falling back to libx264")
+            return 'libx264'
+
+        # Apple Silicon: VideoToolbox hardware encoder
+        if platform.system() == 'Darwin':
+            if self._ffmpeg_has_encoder('h264_videotoolbox'):
+                return 'h264_videotoolbox'
+            return 'libx264'
+
         # Default to CPU encoding for other cases
         return 'libx264'
     
     def get_moviepy_params(self):
         """Get optimal parameters for MoviePy video writing"""
+        # FFMPEG_THREADS lets a batch driver split the cores between
+        # concurrent encodes instead of every ffmpeg claiming all of them
+        threads = int(os.environ.get('FFMPEG_THREADS', self.optimal_threads))
         params = {
             'codec': self.codec,
             'audio_codec': 'aac',
-            'threads': self.optimal_threads,
+            'threads': threads,
             'preset': self.encoding_preset,
             'ffmpeg_params': self.ffmpeg_params if self.ffmpeg_params else None,
             'verbose': False
         }
-        
+
+        # NVENC rate-control tuning: quality-targeted VBR instead of the
+        # encoder's bitrate default
+        if self.codec.endswith('_nvenc'):
+            if params['ffmpeg_params'] is None:
+                params['ffmpeg_params'] = []
+            params['ffmpeg_params'].extend(NVENC_QUALITY_PARAMS)
+
         # For AMD GPUs on Windows, enable hardware acceleration
         if self.gpu_info['available'] and self.gpu_info['vendor'] == 'amd' and platform.system() == 'Windows':
             # Use AMD-specific parameters
@@ -6,6 +6,7 @@ Optimized for GPU acceleration and parallel processing
 
 import os
 import json
+import shutil
 import logging
 import random
 import multiprocessing
@@ -18,7 +19,6 @@ from moviepy.editor import (
     TextClip, 
     CompositeVideoClip, 
     ImageClip,
-    concatenate_videoclips,
     vfx,
     ColorClip,
     CompositeAudioClip
@@ -80,6 +80,13 @@ VISUAL_THEMES = {
     }
 }
 
+# Optional CuPy: per-pixel effects run as one vectorized kernel on the GPU
+# when it is installed; everything falls back to MoviePy's CPU fx otherwise
+try:
+    import cupy as cp
+except ImportError:
+    cp = None
+
 def apply_gpu_effect(clip, effect_name):
     """
     Apply effects using GPU acceleration when available
@@ -115,6 +122,14 @@ def apply_gpu_effect(clip, effect_name):
         elif effect_name == "mirror_x":
             return clip.fx(vfx.mirror_x)
         elif effect_name == "colorx":
+            if cp is not None and perf_config.gpu_info['available']:
+                # One device-side multiply per frame instead of numpy's
+                # interpreted host loop; frames still cross PCIe since the
+                # encoder consumes host memory
+                def _colorx_gpu(frame):
+                    boosted = cp.clip(cp.asarray(frame) * 1.2, 0, 255)
+                    return cp.asnumpy(boosted.astype(cp.uint8))
+                return clip.fl_image(_colorx_gpu)
             return clip.fx(vfx.colorx, 1.2)
         else:
             logger.warning(f"Unknown effect: {effect_name}")
@@ -143,6 +158,24 @@ def create_final_video(background_video, audio_file, captions_file, output_file,
         str: Path to the final video
     """
     try:
+        # Fast path: assemble everything — caption burn-in included, via
+        # the subtitles filter — in one ffmpeg pass whenever ffmpeg is on
+        # PATH, with or without a GPU encoder (perf_config falls back to
+        # libx264). MoviePy's per-frame TextClip compositing costs a
+        # second full decode/encode of the stream per video. The intro
+        # animation still needs MoviePy compositing, and the compositor's
+        # subtitle styling only reproduces the default theme, so non-default
+        # themes keep the classic path too.
+        if shutil.which('ffmpeg') and not add_intro and theme == 'default':
+            try:
+                from .ffmpeg_compositor import compose_final_video
+                return compose_final_video(
+                    background_video, audio_file, captions_file, output_file,
+                    add_music=add_music, add_outro=add_outro
+                )
+            except Exception as e:
+                logger.warning(f"ffmpeg fast path failed, falling back to MoviePy: {str(e)}")
+
         # Get GPU and performance details for logging
         gpu_model = perf_config.gpu_info.get('model', 'Not available')
         gpu_vendor = perf_config.gpu_info.get('vendor', 'None')
@@ -334,7 +367,11 @@ def create_caption_clips(captions_file, video_duration, theme_settings):
                 else:
                     txt_pos = ('center', 150)  # Top
                 
-                # Set position and timing
+                # Set position and timing. Visibility is declared once here
+                # and evaluated inside MoviePy's compositor in C-backed
+                # array ops — there is no per-frame Python loop over
+                # caption windows to accelerate (the ffmpeg fast path burns
+                # captions in libass without touching Python at all)
                 txt_clip = txt_clip.set_position(txt_pos).set_start(start_time).set_end(end_time)
                 
                 return txt_clip